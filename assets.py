@@ -0,0 +1,64 @@
+"""أصول ثابتة (صور توضيحية) تبنى مرة واحدة وتحفظ على القرص وفي الذاكرة
+
+لبناء الأصول مسبقاً أثناء النشر:
+    python assets.py
+"""
+import os
+import tempfile
+import threading
+
+ASSET_DIR = os.environ.get('CALC_ASSET_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '.cache', 'assets'
+)
+
+_memory = {}
+_lock = threading.Lock()
+
+def write_atomic(path, data):
+    """كتابة الملف دفعة واحدة عبر ملف مؤقت حتى لا يقرأ أحد ملفاً ناقصاً"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_asset(name, fmt, build, version):
+    """إرجاع بايتات الأصل من الذاكرة أو القرص، أو بناؤه بالدالة build وحفظه
+    
+    version يدخل في اسم الملف، ويغير عند تغيير طريقة الرسم.
+    """
+    key = (name, fmt, version)
+    data = _memory.get(key)
+    if data is not None:
+        return data
+    
+    with _lock:
+        data = _memory.get(key)
+        if data is not None:
+            return data
+        path = os.path.join(ASSET_DIR, f'{name}-{version}.{fmt}')
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = build()
+            try:
+                write_atomic(path, data)
+            except OSError:
+                # القرص للقراءة فقط: يكفي التخزين في الذاكرة
+                pass
+        _memory[key] = data
+        return data
+
+if __name__ == '__main__':
+    import insrf
+    
+    for fmt in insrf.EXPLANATION_FORMATS:
+        data = insrf.get_explanation_image_bytes(fmt)
+        print(f'explanation.{fmt}: {len(data):,} bytes')
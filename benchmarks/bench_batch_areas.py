@@ -0,0 +1,85 @@
+"""قياس أداء الحساب الدفعي لمساحات الأراضي مقارنة بالحساب لكل أرض على حدة
+
+الاستخدام:
+    python benchmarks/bench_batch_areas.py --sizes 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.area import METHOD_NAMES, pack_parcels
+from insrf import LandAreaCalculator
+
+
+def make_parcels(n_parcels, min_points=3, max_points=12, seed=0):
+    """توليد أراضٍ عشوائية بنقاط طولية متزايدة"""
+    rng = np.random.default_rng(seed)
+    parcels = []
+    for count in rng.integers(min_points, max_points + 1, size=n_parcels):
+        lengths = np.cumsum(rng.uniform(1.0, 20.0, size=count)) - 1.0
+        widths = rng.uniform(5.0, 30.0, size=count)
+        parcels.append((lengths.tolist(), widths.tolist()))
+    return parcels
+
+
+def run_loop(parcels, integration):
+    """المسار الحالي: كائن LandAreaCalculator لكل أرض"""
+    results = {method: np.empty(len(parcels)) for method in METHOD_NAMES}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for i, (lengths, widths) in enumerate(parcels):
+            areas = LandAreaCalculator(lengths, widths, integration).calculate_all_methods()
+            for method in METHOD_NAMES:
+                results[method][i] = areas[method]
+    return results
+
+
+def run_batch(lengths, widths, offsets):
+    """المسار الدفعي: تمريرة NumPy واحدة لكل الأراضي"""
+    return LandAreaCalculator.calculate_batch(lengths, widths, offsets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--loop-limit', type=int, default=2000,
+                        help='أقصى عدد أراضٍ يقاس عليه المسار الحالي ثم يستقرأ الزمن (0 = الكل)')
+    parser.add_argument('--integration', default='auto', choices=['auto', 'exact', 'quad'],
+                        help='محرك التكامل في المسار الحالي')
+    args = parser.parse_args()
+
+    # طريقة التكامل الدفعية دقيقة، أما quad فقد يخطئ عند نقاط الانكسار، لذا يعرض فرقها منفصلاً
+    exact_methods = [method for method in METHOD_NAMES if method != 'طريقة التكامل']
+    print(f"{'الأراضي':>10} {'الحالي (ث)':>12} {'الدفعي (ث)':>12} {'التسريع':>10} "
+          f"{'أقصى فرق':>12} {'فرق التكامل':>12}")
+    for size in args.sizes:
+        parcels = make_parcels(size)
+        lengths, widths, offsets = pack_parcels(parcels)
+
+        start = time.perf_counter()
+        batch = run_batch(lengths, widths, offsets)
+        batch_time = time.perf_counter() - start
+
+        loop_count = min(size, args.loop_limit) if args.loop_limit else size
+        start = time.perf_counter()
+        loop = run_loop(parcels[:loop_count], args.integration)
+        loop_time = (time.perf_counter() - start) * size / loop_count
+
+        max_diff = max(
+            np.max(np.abs(loop[method] - batch[method][:loop_count]))
+            for method in exact_methods
+        )
+        quad_diff = np.max(np.abs(loop['طريقة التكامل'] - batch['طريقة التكامل'][:loop_count]))
+        print(f"{size:>10} {loop_time:>12.3f} {batch_time:>12.4f} "
+              f"{loop_time / batch_time:>9.0f}x {max_diff:>12.2e} {quad_diff:>12.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""اختبار حمل لـ main_app بعدة جلسات متزامنة دون متصفح أو خدمة خارجية
+
+كل مستخدم محاكى جلسة AppTest مستقلة في خيط خاص، تمر بالتنقل في الشريط
+الجانبي وأزرار حاسبة الجملون وحساب المساحة وسحب منزلقات المنشور. لكل
+عدد جلسات يقاس زمن كل إعادة تشغيل (p50/p95/p99)، وعدد إعادات التشغيل
+في الثانية، واستهلاك المعالج، وذاكرة العملية (RSS) الكلية ولكل جلسة.
+
+الاستخدام:
+    python benchmarks/bench_load.py --sessions 1 2 4 8 --iterations 2
+    python benchmarks/bench_load.py --sessions 4 --json load.json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import warnings
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from figure_pool import rss_bytes
+from main_app import PAGES
+
+APP_PATH = os.path.join(ROOT, 'main_app.py')
+HOME = "🏠 الصفحة الرئيسية"
+
+# اسم الوحدة -> خيار الصفحة في قائمة التنقل
+PAGE_OPTIONS = {module_name: label for label, (_, module_name, _, _) in PAGES.items()}
+
+TAN_BUTTONS = ('calc_hyp', 'calc_raft', 'calc_ang', 'calc_kamer')
+INSRF_BUTTONS = ('calc_area', 'plot_land', 'explain_methods')
+
+
+class ResourceSampler(threading.Thread):
+    """خيط يسجل أقصى RSS كل interval ثانية حتى يوقف"""
+
+    def __init__(self, interval=0.1):
+        super().__init__(name='load-sampler', daemon=True)
+        self.interval = interval
+        self.peak = rss_bytes()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class SimulatedUser:
+    """جلسة واحدة تنفذ السيناريو وتسجل زمن كل إعادة تشغيل"""
+
+    def __init__(self, seed, timeout):
+        self.random = random.Random(seed)
+        self.timeout = timeout
+        self.latencies = []
+        self.errors = 0
+        self.app = None
+
+    def step(self, name, action):
+        start = time.perf_counter()
+        action().run()
+        self.latencies.append((name, time.perf_counter() - start))
+        self.errors += len(self.app.exception) + len(self.app.error)
+
+    def open(self):
+        self.app = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        self.step('home', lambda: self.app)
+
+    def go(self, module_name):
+        radio = self.app.sidebar.radio[0]
+        self.step(f'nav.{module_name}', lambda: radio.set_value(PAGE_OPTIONS[module_name]))
+
+    def tan(self):
+        self.go('tan')
+        for key in TAN_BUTTONS:
+            self.step(f'tan.{key}', lambda: self.app.button(key=key).click())
+
+    def insrf(self):
+        self.go('insrf')
+        for key in INSRF_BUTTONS:
+            self.step(f'insrf.{key}', lambda: self.app.button(key=key).click())
+
+    def dimshnal(self, drags):
+        self.go('dimshnal')
+        for _ in range(drags):
+            # قيم مختلفة لكل مستخدم حتى لا تكون كل الرسوم من الذاكرة المشتركة
+            index = self.random.randrange(3)
+            slider = self.app.sidebar.slider[index]
+            value = round(self.random.uniform(slider.min, slider.max), 1)
+            self.step('dimshnal.slider', lambda: slider.set_value(value))
+
+    def run(self, iterations, drags, barrier):
+        barrier.wait()
+        self.open()
+        for _ in range(iterations):
+            self.tan()
+            self.insrf()
+            self.dimshnal(drags)
+            self.step('nav.home', lambda: self.app.sidebar.radio[0].set_value(HOME))
+
+
+def run_load(sessions, iterations, drags, timeout, seed=0):
+    """تشغيل sessions مستخدماً معاً وإرجاع ملخص الزمن والمعالج والذاكرة"""
+    users = [SimulatedUser(seed + i, timeout) for i in range(sessions)]
+    barrier = threading.Barrier(sessions + 1)
+    threads = [threading.Thread(target=user.run, args=(iterations, drags, barrier), name=f'user-{i}')
+               for i, user in enumerate(users)]
+
+    rss_before = rss_bytes()
+    sampler = ResourceSampler()
+    sampler.start()
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    cpu_start, wall_start = os.times(), time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+    cpu_end = os.times()
+    sampler.stop()
+
+    latencies = np.array([seconds for user in users for _, seconds in user.latencies])
+    by_step = {}
+    for user in users:
+        for name, seconds in user.latencies:
+            by_step.setdefault(name, []).append(seconds)
+
+    cpu = (cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system)
+    peak_rss = sampler.peak
+    return {
+        'sessions': sessions,
+        'reruns': int(latencies.size),
+        'wall_seconds': wall,
+        'reruns_per_second': latencies.size / wall,
+        'p50': float(np.percentile(latencies, 50)),
+        'p95': float(np.percentile(latencies, 95)),
+        'p99': float(np.percentile(latencies, 99)),
+        'max': float(latencies.max()),
+        'cpu_percent': 100 * cpu / wall,
+        'peak_rss_bytes': peak_rss,
+        'rss_per_session_bytes': (peak_rss - rss_before) / sessions,
+        'errors': sum(user.errors for user in users),
+        'steps': {name: {'count': len(values), 'p50': float(np.percentile(values, 50)),
+                         'p95': float(np.percentile(values, 95))}
+                  for name, values in sorted(by_step.items())},
+    }
+
+
+def print_report(result, by_step=False):
+    mb = 1024 * 1024
+    print(f"{result['sessions']:>8} {result['reruns']:>8} {result['reruns_per_second']:>9.2f} "
+          f"{result['p50'] * 1000:>9.0f} {result['p95'] * 1000:>9.0f} {result['p99'] * 1000:>9.0f} "
+          f"{result['cpu_percent']:>7.0f}% {result['peak_rss_bytes'] / mb:>9.0f} "
+          f"{result['rss_per_session_bytes'] / mb:>9.1f} {result['errors']:>7}", flush=True)
+    if by_step:
+        for name, step in result['steps'].items():
+            print(f"{'':>8} {name:<28} {step['count']:>6} p50 {step['p50'] * 1000:>7.0f} ms "
+                  f"p95 {step['p95'] * 1000:>7.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='أعداد الجلسات المتزامنة التي تقاس')
+    parser.add_argument('--iterations', type=int, default=1, help='عدد مرات السيناريو لكل مستخدم')
+    parser.add_argument('--drags', type=int, default=5, help='عدد سحبات منزلقات المنشور في كل مرة')
+    parser.add_argument('--timeout', type=float, default=120, help='أقصى زمن لإعادة تشغيل واحدة')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-warmup', action='store_true',
+                        help='عدم تشغيل جلسة تحمية قبل القياس (تحميل الوحدات والذاكرة المشتركة)')
+    parser.add_argument('--by-step', action='store_true', help='عرض الزمن لكل خطوة من السيناريو')
+    parser.add_argument('--json', help='حفظ النتائج في ملف JSON لتتبع التراجع')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    logging.disable(logging.WARNING)
+
+    print(f"{'الجلسات':>8} {'الإعادات':>8} {'إعادة/ث':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'المعالج':>8} {'RSS MB':>9} {'MB/جلسة':>9} {'أخطاء':>7}")
+    if not args.no_warmup:
+        # جلسة أولى غير مقاسة حتى لا يحسب استيراد الوحدات على أول عدد جلسات
+        run_load(1, 1, args.drags, args.timeout, args.seed)
+    results = []
+    for sessions in args.sessions:
+        result = run_load(sessions, args.iterations, args.drags, args.timeout, args.seed)
+        print_report(result, args.by_step)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'cpus': os.cpu_count(), 'results': results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"حفظت النتائج في {args.json}")
+    return 1 if any(result['errors'] for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""مقارنة حجم بيانات Plotly وزمن بنائها للمنشور الثلاثي قبل التجميع وبعده
+
+يقاس زمن بناء الرسم وتسلسله إلى JSON (ما يرسله st.plotly_chart للمتصفح)
+وحجم النص الناتج. زمن الرسم في المتصفح لا يقاس هنا.
+
+الاستخدام:
+    python benchmarks/bench_plotly_prism.py --repeat 50
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dimshnal import SlopeAnalysis3D
+
+
+def legacy_figure(base, height, depth, structure_color='#1A535C', hypotenuse_color='#FF6B35'):
+    """الطريقة السابقة: خمس شبكات Mesh3d وتسع حواف منفصلة"""
+    vertices = np.array([
+        [0, 0, 0], [base, 0, 0], [base / 2, height, 0],
+        [0, 0, depth], [base, 0, depth], [base / 2, height, depth],
+    ])
+    faces = [[0, 1, 2], [3, 4, 5], [0, 1, 4, 3], [1, 2, 5, 4], [2, 0, 3, 5]]
+    fig = go.Figure()
+    for i, face in enumerate(faces):
+        fig.add_trace(go.Mesh3d(
+            x=vertices[face, 0], y=vertices[face, 1], z=vertices[face, 2],
+            color=structure_color, opacity=0.8, name=f'وجه {i+1}'
+        ))
+    edges = [[0, 1], [1, 2], [2, 0], [3, 4], [4, 5], [5, 3], [0, 3], [1, 4], [2, 5]]
+    for edge in edges:
+        fig.add_trace(go.Scatter3d(
+            x=vertices[edge, 0], y=vertices[edge, 1], z=vertices[edge, 2],
+            mode='lines', line=dict(color='black', width=4), showlegend=False
+        ))
+    fig.add_trace(go.Scatter3d(
+        x=[vertices[0, 0], vertices[2, 0]], y=[vertices[0, 1], vertices[2, 1]],
+        z=[vertices[0, 2], vertices[2, 2]], mode='lines',
+        line=dict(color=hypotenuse_color, width=6), name='الوتر'
+    ))
+    fig.update_layout(
+        title=f'الهيكل الثلاثي الأبعاد التفاعلي<br>القاعدة: {base}م, الارتفاع: {height}م, العمق: {depth}م',
+        scene=dict(xaxis_title='المحور X (الطول)', yaxis_title='المحور Y (الارتفاع)',
+                   zaxis_title='المحور Z (العمق)', aspectmode='data'),
+        width=800, height=600
+    )
+    return fig
+
+
+def current_figure(base, height, depth):
+    """الطريقة الحالية: شبكة واحدة وخط حواف واحد"""
+    analyzer = SlopeAnalysis3D()
+    analyzer.calculate_geometry(base, height, depth)
+    return analyzer.plot_plotly_3d()
+
+
+def measure(build, repeat):
+    """متوسط زمن البناء والتسلسل، وحجم JSON وعدد المسارات"""
+    start = time.perf_counter()
+    for n in range(repeat):
+        payload = build(10.0 + n * 0.1, 7.0, 12.0).to_json()
+    elapsed = (time.perf_counter() - start) / repeat
+    fig = build(10.0, 7.0, 12.0)
+    return elapsed, len(payload.encode()), len(fig.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'الطريقة':>10} {'المسارات':>9} {'JSON (بايت)':>12} {'بناء+تسلسل (ms)':>16}")
+    for name, build in (('السابقة', legacy_figure), ('الحالية', current_figure)):
+        elapsed, size, traces = measure(build, args.repeat)
+        print(f"{name:>10} {traces:>9} {size:>12,} {elapsed * 1000:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
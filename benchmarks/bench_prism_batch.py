@@ -0,0 +1,69 @@
+"""قياس أداء حساب المناشير دفعة واحدة مقارنة بكائن لكل منشور
+
+الاستخدام:
+    python benchmarks/bench_prism_batch.py --sizes 10000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.memo import clear_memo
+from calc_core.prism import PRISM_DTYPE, prism_batch_totals
+from dimshnal import SlopeAnalysis3D
+
+
+def make_prisms(n_prisms, seed=0):
+    """توليد جدول مناشير عشوائي بصيغة PRISM_DTYPE"""
+    rng = np.random.default_rng(seed)
+    prisms = np.empty(n_prisms, dtype=PRISM_DTYPE)
+    prisms['base'] = rng.uniform(1.0, 50.0, n_prisms)
+    prisms['height'] = rng.uniform(1.0, 20.0, n_prisms)
+    prisms['depth'] = rng.uniform(1.0, 80.0, n_prisms)
+    return prisms
+
+
+def per_object(prisms):
+    """الطريقة السابقة: كائن SlopeAnalysis3D لكل منشور"""
+    volume = 0.0
+    for base, height, depth in prisms.tolist():
+        analyzer = SlopeAnalysis3D()
+        volume += analyzer.calculate_geometry(base, height, depth)['volume']
+    return volume
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--loop-limit', type=int, default=100000,
+                        help='أكبر عدد مناشير يقاس لكل منشور على حدة، وما بعده يقدر خطياً')
+    args = parser.parse_args()
+
+    print(f"{'المناشير':>10} {'لكل منشور (s)':>14} {'دفعة (s)':>10} {'التسريع':>8}")
+    for size in args.sizes:
+        prisms = make_prisms(size)
+
+        sample = prisms[:min(size, args.loop_limit)]
+        clear_memo()
+        start = time.perf_counter()
+        loop_volume = per_object(sample)
+        loop_time = (time.perf_counter() - start) * size / len(sample)
+
+        start = time.perf_counter()
+        batch = SlopeAnalysis3D.calculate_batch(prisms)
+        totals = prism_batch_totals(batch)
+        batch_time = time.perf_counter() - start
+
+        if len(sample) == size:
+            assert np.isclose(loop_volume, totals['volume'])
+        estimate = '~' if len(sample) < size else ' '
+        print(f"{size:>10,} {estimate}{loop_time:>13.3f} {batch_time:>10.4f} {loop_time / batch_time:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""مقارنة زمن رسم المنشور الثابت بين mplot3d والإسقاط الثنائي الأبعاد السريع
+
+يقاس زمن بناء الرسم وحده ثم زمنه مع حفظه PNG (ما يعرض في الصفحة)
+وحجم الصورة الناتجة، دون ذاكرة التخزين المؤقت.
+
+الاستخدام:
+    python benchmarks/bench_prism_render.py --repeat 10
+"""
+import argparse
+import os
+import sys
+import time
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dimshnal import SlopeAnalysis3D
+from figure_cache import figure_to_png
+from figure_pool import FIGURE_POOL
+
+
+def measure(plot, repeat):
+    """متوسط زمن البناء وزمن البناء مع PNG وحجم الصورة"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        FIGURE_POOL.release(plot(2))
+    build = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        png = figure_to_png(plot(2))
+    total = (time.perf_counter() - start) / repeat
+    return build, total, len(png)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    analyzer = SlopeAnalysis3D()
+    analyzer.calculate_geometry(10.0, 7.0, 12.0)
+
+    print(f"{'الطريقة':>10} {'بناء (ms)':>10} {'بناء+PNG (ms)':>14} {'PNG (بايت)':>12}")
+    renderers = (
+        ('mplot3d', analyzer.plot_matplotlib_3d),
+        ('سريع', analyzer.plot_fast_3d),
+    )
+    for name, plot in renderers:
+        build, total, size = measure(plot, args.repeat)
+        print(f"{name:>10} {build * 1000:>10.1f} {total * 1000:>14.1f} {size:>12,}")
+
+
+if __name__ == '__main__':
+    main()
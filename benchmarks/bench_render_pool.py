@@ -0,0 +1,88 @@
+"""قياس إنتاجية الرسم واستجابة الخيوط الأخرى: داخل العملية مقابل عمال الرسم
+
+عدة خيوط (كجلسات متزامنة) ترسم مثلثات مختلفة معاً. يقاس عدد الصور في
+الثانية، وأطول تأخير يلاحظه خيط نبض يستيقظ كل 10 ms (أثر حجز قفل المفسر
+على باقي الجلسات).
+
+الاستخدام:
+    python benchmarks/bench_render_pool.py --images 32 --threads 8 --workers 1 2 4
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import warnings
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render_pool import RenderPool, render_local
+
+
+def triangle_spec(i):
+    base, height = 8.0 + i * 0.1, 2.0
+    return {'base': base, 'height': height, 'helf': base / 2, 'beem': (base * base / 4 + height * height) ** 0.5,
+            'angle': 26.0, 'title': f"رسم {i}", 'show_angles': True, 'top_angle': 128.0}
+
+
+class Heartbeat(threading.Thread):
+    """خيط يستيقظ كل interval ويسجل أطول تأخير عن موعده"""
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.max_delay = 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            start = time.perf_counter()
+            time.sleep(self.interval)
+            self.max_delay = max(self.max_delay, time.perf_counter() - start - self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run(render, images, threads):
+    """رسم images صورة موزعة على threads خيط، وإرجاع (صورة/ث، أطول تأخير)"""
+    specs = [triangle_spec(i) for i in range(images)]
+    heartbeat = Heartbeat()
+    heartbeat.start()
+    start = time.perf_counter()
+    workers = [threading.Thread(target=lambda part: [render('triangle', spec) for spec in part],
+                                args=(specs[t::threads],)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    heartbeat.stop()
+    return images / elapsed, heartbeat.max_delay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--images', type=int, default=32)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    print(f"{'الوضع':<16} {'صورة/ث':>10} {'أطول تأخير (ms)':>18}")
+    rate, delay = run(render_local, args.images, args.threads)
+    print(f"{'داخل العملية':<16} {rate:>10.2f} {delay * 1000:>18.0f}", flush=True)
+    for workers in args.workers:
+        pool = RenderPool(workers=workers, queue_size=args.threads, timeout=120)
+        # تحمية: بدء العمليات وتحميل matplotlib قبل القياس
+        for spec in [triangle_spec(-i - 1) for i in range(workers)]:
+            pool.render('triangle', spec)
+        rate, delay = run(pool.render, args.images, args.threads)
+        pool.shutdown()
+        print(f"{f'{workers} عامل':<16} {rate:>10.2f} {delay * 1000:>18.0f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""قياس حجم نتائج حاسبة الجملون في جلسة واحدة: مفاتيح متفرقة مقابل سجلات __slots__
+
+يبني حالة جلسة كاملة (التبويبات الأربعة) بالطريقتين ويقيس الذاكرة المحجوزة
+لكل جلسة بـ tracemalloc وحجم تسلسلها بـ pickle. منشور dimshnal يقاس أيضاً
+كقاموس مقابل PrismResult.
+
+الاستخدام:
+    python benchmarks/bench_session_footprint.py --sessions 1000
+"""
+import argparse
+import os
+import pickle
+import sys
+import tracemalloc
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.gable import calculate_angles, calculate_hypotenuse, calculate_kamer, calculate_rafter
+from calc_core.prism import calculate_prism_geometry
+
+
+def legacy_session(n):
+    """المفاتيح المتفرقة كما كانت تخزنها tan.py قبل السجلات"""
+    base, height = 40.0 + n * 0.01, 2.0
+    hyp = calculate_hypotenuse(base, height)
+    raft = calculate_rafter(base, height * 100)
+    ang = calculate_angles(base, height)
+    kamer = calculate_kamer(base, height)
+    return {
+        'hypotenuse': hyp['beem'], 'angle_calc': hyp['angle'], 'helf_calc': hyp['helf'],
+        'base_hyp_value': base, 'height_hyp_value': height,
+        'rafter': raft['beem'], 'rafter_angle': raft['angle'],
+        'width_raft_value': base, 'height_raft_m_value': raft['height_m'], 'helf_raft_value': raft['helf'],
+        'angle': ang['angle'], 'top_angle': ang['top_angle'], 'helf_ang': ang['helf'],
+        'base_ang_value': base, 'height_ang_value': height,
+        'kamer_width': base, 'kamer_height': height, 'kamer_beem': kamer['beem'],
+        'kamer_angle': kamer['angle'], 'kamer_helf': kamer['helf'],
+        'geometry_data': calculate_prism_geometry(base, height, 12.0).as_dict(),
+    }
+
+
+def record_session(n):
+    """سجل واحد لكل تبويب كما تخزنه tan.py الآن"""
+    base, height = 40.0 + n * 0.01, 2.0
+    return {
+        'hyp_result': calculate_hypotenuse(base, height),
+        'raft_result': calculate_rafter(base, height * 100),
+        'ang_result': calculate_angles(base, height),
+        'kamer_result': calculate_kamer(base, height),
+        'geometry_data': calculate_prism_geometry(base, height, 12.0),
+    }
+
+
+def measure(build, sessions):
+    """متوسط الذاكرة المحجوزة وحجم pickle لكل جلسة"""
+    # تسخين ذاكرة الحسابات حتى لا تدخل في القياس
+    for n in range(sessions):
+        build(n)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    states = [build(n) for n in range(sessions)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    pickled = sum(len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)) for state in states)
+    return allocated / sessions, pickled / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'الطريقة':>10} {'ذاكرة/جلسة (بايت)':>18} {'pickle/جلسة (بايت)':>19}")
+    rows = []
+    for name, build in (('مفاتيح', legacy_session), ('سجلات', record_session)):
+        allocated, pickled = measure(build, args.sessions)
+        rows.append((allocated, pickled))
+        print(f"{name:>10} {allocated:>18,.0f} {pickled:>19,.0f}")
+    (old_mem, old_pickle), (new_mem, new_pickle) = rows
+    print(f"التوفير: ذاكرة {1 - new_mem / old_mem:.0%}، pickle {1 - new_pickle / old_pickle:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""قياس زمن استيراد كل صفحة بارداً (في عملية جديدة) ودافئاً (من ذاكرة الوحدات)
+
+الاستخدام:
+    python benchmarks/bench_startup.py --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ['streamlit', 'calc_core', 'insrf', 'tan', 'dimshnal']
+
+# يقاس زمن الاستيراد داخل عملية Python جديدة حتى لا تؤثر الوحدات المحملة مسبقاً
+_PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+cold = time.perf_counter() - start
+start = time.perf_counter()
+import {module}
+warm = time.perf_counter() - start
+print(cold, warm)
+"""
+
+
+def measure(module, repeat):
+    """أفضل زمن بارد ودافئ لاستيراد الوحدة عبر عدة عمليات"""
+    colds, warms = [], []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, '-c', _PROBE.format(root=ROOT, module=module)],
+            cwd=ROOT, stderr=subprocess.DEVNULL,
+        )
+        cold, warm = map(float, output.split())
+        colds.append(cold)
+        warms.append(warm)
+    return min(colds), min(warms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('modules', nargs='*', default=PAGES)
+    args = parser.parse_args()
+
+    print(f"{'الوحدة':>12} {'بارد (ms)':>12} {'دافئ (µs)':>12}")
+    for module in args.modules:
+        cold, warm = measure(module, args.repeat)
+        print(f"{module:>12} {cold * 1000:>12.1f} {warm * 1e6:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+"""مجموعة قياس أداء موحدة لجميع مسارات الحساب والرسم دون Streamlit
+
+لكل حالة يقاس الزمن (أقل زمن من عدة تكرارات) وأقصى ذاكرة محجوزة أثناء
+التنفيذ (tracemalloc) وحجم المخرج بالبايت (صورة PNG أو JSON أو عدد
+النتائج). النتائج تحفظ في ملف JSON مرجعي، وتقارن التشغيلات اللاحقة به
+فيخرج البرنامج برمز 1 إذا تجاوز أي مقياس العتبة المحددة.
+
+الاستخدام:
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --threshold 0.25
+    python benchmarks/bench_suite.py --sizes small medium --filter area
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+from calc_core.memo import clear_memo
+from dimshnal import SlopeAnalysis3D
+from figure_cache import figure_to_png
+from insrf import LandAreaCalculator, _render_explanation, render_land_svg
+from tan import create_clear_triangle_figure, render_triangle_svg
+
+SIZES = ('small', 'medium', 'huge')
+
+# عدد نقاط الأرض، وعدد المناشير المحسوبة كائناً كائناً، لكل حجم.
+# رسم الأرض يضيف تسمية نصية لكل نقطة فكلفته أعلى بكثير من الحساب
+LAND_POINTS = {'small': 10, 'medium': 10_000, 'huge': 1_000_000}
+LAND_PLOT_POINTS = {'small': 10, 'medium': 100, 'huge': 1_000}
+PRISM_COUNTS = {'small': 100, 'medium': 10_000, 'huge': 100_000}
+
+# أبعاد الرسوم ثابتة الكلفة: المثلث والمنشور لا تتغير كلفتهما مع القيم
+TRIANGLE_DIMENSIONS = {'small': (4.0, 1.0), 'medium': (40.0, 2.0), 'huge': (4000.0, 200.0)}
+PRISM_DIMENSIONS = {'small': (1.0, 1.0, 1.0), 'medium': (10.0, 7.0, 12.0), 'huge': (50.0, 30.0, 30.0)}
+
+
+def make_land(n_points, seed=0):
+    """نقاط أرض عشوائية بأطوال متزايدة"""
+    rng = np.random.default_rng(seed)
+    lengths = np.cumsum(rng.uniform(0.5, 2.0, n_points)) - 0.5
+    widths = rng.uniform(5.0, 30.0, n_points)
+    return lengths.tolist(), widths.tolist()
+
+
+def payload_size(result):
+    """حجم المخرج: طول البايتات أو النص، أو عدد العناصر"""
+    if isinstance(result, (bytes, str)):
+        return len(result)
+    if isinstance(result, dict):
+        return len(result)
+    return 0
+
+
+def case_area_methods(size):
+    lengths, widths = make_land(LAND_POINTS[size])
+
+    def run():
+        calculator = LandAreaCalculator(lengths, widths)
+        calculator.calculate_all_methods()
+        run.timings = calculator.timings
+        return calculator.areas
+    return run
+
+
+def case_plot_land(size):
+    lengths, widths = make_land(LAND_PLOT_POINTS[size])
+
+    def run():
+        return figure_to_png(LandAreaCalculator(lengths, widths).plot_land())
+    return run
+
+
+def case_plot_land_svg(size):
+    calculator = LandAreaCalculator(*make_land(LAND_PLOT_POINTS[size]))
+    calculator.calculate_all_methods()
+
+    def run():
+        return render_land_svg(calculator)
+    return run
+
+
+def case_explanation_image(size):
+    def run():
+        return _render_explanation('png')
+    return run
+
+
+def case_triangle_figure(size):
+    base, height = TRIANGLE_DIMENSIONS[size]
+    helf = base / 2
+    beem = float(np.hypot(helf, height))
+    angle = float(np.degrees(np.arctan(height / helf)))
+
+    def run():
+        fig = create_clear_triangle_figure(base, height, helf, beem, angle, "رسم توضيحي",
+                                           top_angle=180 - 2 * angle)
+        return figure_to_png(fig)
+    return run
+
+
+def case_triangle_svg(size):
+    base, height = TRIANGLE_DIMENSIONS[size]
+    helf = base / 2
+    beem = float(np.hypot(helf, height))
+    angle = float(np.degrees(np.arctan(height / helf)))
+
+    def run():
+        return render_triangle_svg(base, height, helf, beem, angle, "رسم توضيحي", top_angle=180 - 2 * angle)
+    return run
+
+
+def case_calculate_geometry(size):
+    rng = np.random.default_rng(0)
+    prisms = rng.uniform(1.0, 50.0, (PRISM_COUNTS[size], 3)).tolist()
+
+    def run():
+        clear_memo()
+        analyzer = SlopeAnalysis3D()
+        for base, height, depth in prisms:
+            analyzer.calculate_geometry(base, height, depth)
+        return analyzer.geometry_data.as_dict()
+    return run
+
+
+def case_plot_matplotlib_3d(size):
+    analyzer = SlopeAnalysis3D()
+    analyzer.calculate_geometry(*PRISM_DIMENSIONS[size])
+
+    def run():
+        return figure_to_png(analyzer.plot_matplotlib_3d(3))
+    return run
+
+
+def case_plot_plotly_3d(size):
+    analyzer = SlopeAnalysis3D()
+    analyzer.calculate_geometry(*PRISM_DIMENSIONS[size])
+
+    def run():
+        return analyzer.plot_plotly_3d().to_json()
+    return run
+
+
+# اسم الحالة -> دالة تجهيز تعيد دالة التشغيل لحجم معين
+CASES = {
+    'area.calculate_all_methods': case_area_methods,
+    'insrf.plot_land': case_plot_land,
+    'insrf.plot_land_svg': case_plot_land_svg,
+    'insrf.explanation_image': case_explanation_image,
+    'tan.triangle_figure': case_triangle_figure,
+    'tan.triangle_svg': case_triangle_svg,
+    'dimshnal.calculate_geometry': case_calculate_geometry,
+    'dimshnal.plot_matplotlib_3d': case_plot_matplotlib_3d,
+    'dimshnal.plot_plotly_3d': case_plot_plotly_3d,
+}
+
+
+def measure(run, repeat):
+    """أقل زمن ووسيطه من repeat تكرار، ثم تشغيل منفصل تحت tracemalloc للذاكرة"""
+    times = []
+    method_seconds = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+        # أقل زمن لكل طريقة من التكرارات المقاسة (لا من تشغيل tracemalloc الأبطأ)
+        for method, seconds in (getattr(run, 'timings', None) or {}).items():
+            method_seconds[method] = min(seconds, method_seconds.get(method, seconds))
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    record = {
+        'seconds': min(times),
+        'median_seconds': statistics.median(times),
+        'peak_bytes': peak,
+        'payload_bytes': payload_size(result),
+    }
+    # أزمنة طرق المساحة كل على حدة
+    if method_seconds:
+        record['method_seconds'] = method_seconds
+    return record
+
+
+def run_suite(sizes, name_filter=None, repeat=3):
+    results = {}
+    for name, setup in CASES.items():
+        if name_filter and name_filter not in name:
+            continue
+        for size in sizes:
+            run = setup(size)
+            # الحجم الكبير يقاس مرة واحدة لأن زمنه طويل بما يكفي للثبات
+            record = measure(run, 1 if size == 'huge' else repeat)
+            results[f'{name}[{size}]'] = record
+            print(f"{name + '[' + size + ']':<42} {record['seconds'] * 1000:>10.2f} ms "
+                  f"{record['peak_bytes'] / 1024:>10.0f} KB {record['payload_bytes']:>10,} B", flush=True)
+    return results
+
+
+def environment():
+    import plotly
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'plotly': plotly.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(results, baseline, threshold, min_seconds):
+    """مقارنة بالمرجع وإرجاع قائمة التراجعات
+
+    الزمن يعد تراجعاً إذا زاد بأكثر من العتبة وبأكثر من min_seconds معاً،
+    حتى لا تفشل الحالات السريعة جداً بسبب التذبذب. زمن كل طريقة مساحة يقارن
+    بالقاعدة نفسها، فلا يختفي تراجع طريقة واحدة في المجموع.
+    """
+    regressions = []
+    for case, record in results.items():
+        old = baseline.get(case)
+        if old is None:
+            continue
+        times = [('seconds', old['seconds'], record['seconds'])]
+        old_methods = old.get('method_seconds', {})
+        times += [(f'method_seconds.{method}', old_methods[method], seconds)
+                  for method, seconds in record.get('method_seconds', {}).items() if method in old_methods]
+        for metric, old_time, new_time in times:
+            if new_time > old_time * (1 + threshold) and new_time - old_time > min_seconds:
+                regressions.append((case, metric, old_time, new_time))
+        for metric in ('peak_bytes', 'payload_bytes'):
+            if old[metric] and record[metric] > old[metric] * (1 + threshold):
+                regressions.append((case, metric, old[metric], record[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=SIZES, default=list(SIZES))
+    parser.add_argument('--filter', help='قياس الحالات التي يحتوي اسمها هذا النص فقط')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help='حفظ النتائج كملف مرجعي')
+    parser.add_argument('--baseline', help='ملف مرجعي للمقارنة')
+    parser.add_argument('--threshold', type=float, default=0.25, help='نسبة التراجع المسموحة (0.25 = 25%%)')
+    parser.add_argument('--min-seconds', type=float, default=0.002,
+                        help='أقل زيادة مطلقة في الزمن تعد تراجعاً')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    print(f"{'الحالة':<42} {'الزمن':>13} {'الذاكرة':>13} {'المخرج':>12}")
+    results = run_suite(args.sizes, args.filter, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"حفظت النتائج في {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold, args.min_seconds)
+        if baseline.get('environment', {}).get('machine') != platform.machine():
+            print("تنبيه: الملف المرجعي من جهاز مختلف")
+        for case, metric, old, new in regressions:
+            print(f"تراجع: {case} {metric} {old:.6g} -> {new:.6g} (+{(new / old - 1):.0%})")
+        if regressions:
+            return 1
+        print(f"لا تراجع فوق {args.threshold:.0%} مقارنة بـ {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
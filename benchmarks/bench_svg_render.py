@@ -0,0 +1,63 @@
+"""مقارنة رسم SVG المباشر برسم PNG عبر matplotlib للمثلث وشكل الأرض
+
+لكل رسم وحجم يقاس أقل زمن للصيغتين وحجم المخرج الذي يرسل للمتصفح (SVG
+يضمن في الصفحة كـ base64)، ونسبة التسريع. ويقاس أيضاً زمن استيراد كاتب
+SVG مقابل واجهات matplotlib في عملية جديدة، وهو ما يدفعه عامل أو سكربت
+لا يحتاج إلا SVG.
+
+الاستخدام:
+    python benchmarks/bench_svg_render.py
+    python benchmarks/bench_svg_render.py --sizes small medium huge --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(ROOT)
+
+from bench_suite import CASES, SIZES, measure
+
+# اسم الرسم -> (حالة PNG، حالة SVG) من مجموعة القياس
+PAIRS = {
+    'triangle': ('tan.triangle_figure', 'tan.triangle_svg'),
+    'land': ('insrf.plot_land', 'insrf.plot_land_svg'),
+}
+
+IMPORT_SCRIPT = "import time; t = time.perf_counter(); import {}; print(time.perf_counter() - t)"
+
+
+def import_seconds(module_name):
+    """زمن استيراد الوحدة في مفسر جديد"""
+    output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT.format(module_name)], cwd=ROOT)
+    return float(output.decode().split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=SIZES, default=['small', 'medium'],
+                        help='رسم الأرض الكبير بـ matplotlib يأخذ عدة ثوان لكل تكرار')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    print(f"{'الرسم':<20} {'PNG ms':>10} {'SVG ms':>10} {'التسريع':>9} {'PNG بايت':>11} {'SVG base64':>11}")
+    for name, (png_case, svg_case) in PAIRS.items():
+        for size in args.sizes:
+            png = measure(CASES[png_case](size), args.repeat)
+            svg = measure(CASES[svg_case](size), args.repeat)
+            print(f"{f'{name}[{size}]':<20} {png['seconds'] * 1000:>10.1f} {svg['seconds'] * 1000:>10.2f} "
+                  f"{png['seconds'] / svg['seconds']:>8.0f}x "
+                  f"{png['payload_bytes']:>11,} {svg['payload_bytes'] * 4 // 3:>11,}", flush=True)
+
+    print()
+    for module_name in ('calc_core.svg', 'drawing_backends'):
+        print(f"استيراد {module_name}: {import_seconds(module_name) * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""الحسابات الهندسية دون واجهة Streamlit
+
+يمكن استيرادها من السكربتات ومهام الدفعات مباشرة، أو تشغيلها من سطر الأوامر:
+    python -m calc_core jobs.json
+"""
+from calc_core.area import (
+    LandAreaCalculator,
+    METHOD_NAMES,
+    INTEGRATION_BACKENDS,
+    INTERPOLATIONS,
+    StreamingAreaAccumulator,
+    calculate_land_areas,
+    iter_survey_chunks,
+    land_drawing,
+    pack_parcels,
+    simpson_area,
+    stream_survey_areas,
+)
+from calc_core.gable import (
+    calculate_angles,
+    calculate_hypotenuse,
+    calculate_kamer,
+    calculate_rafter,
+    gable_sweep,
+    sweep_table,
+    triangle_drawing,
+)
+from calc_core.drawing import (
+    Arc,
+    Area,
+    Callout,
+    Drawing,
+    Label,
+    Markers,
+    Path,
+    diff_drawings,
+    drawing_fingerprint,
+)
+from calc_core.memo import clear_memo, memo_stats, memoize
+from calc_core.records import (
+    AnglesResult,
+    HypotenuseResult,
+    KamerResult,
+    PrismResult,
+    RafterResult,
+    ResultRecord,
+)
+from calc_core.tracing import (
+    disable_tracing,
+    enable_tracing,
+    prometheus_text,
+    start_metrics_server,
+    trace,
+    trace_stats,
+    traced,
+)
+from calc_core.prism import (
+    PRISM_DTYPE,
+    calculate_prism_batch,
+    calculate_prism_geometry,
+    prism_batch_totals,
+    prism_drawing,
+)
+from calc_core.svg import to_svg
@@ -0,0 +1,426 @@
+import numpy as np
+import io
+import os
+import contextlib
+import itertools
+import time
+
+from calc_core.drawing import Area, Drawing, Label, Path
+from calc_core.memo import memoize
+from calc_core.tracing import traced
+
+# np.trapz أزيلت في الإصدارات الحديثة من NumPy لصالح np.trapezoid
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+METHOD_NAMES = ('طريقة شبه المنحرف', 'طريقة سمبسون', 'طريقة التكامل', 'طريقة التقسيم')
+
+# طرق التكامل: exact مجموع قطع دقيق، quad تكامل تكيفي للاستيفاءات الناعمة، auto يختار تلقائياً
+INTEGRATION_BACKENDS = ('auto', 'exact', 'quad')
+INTERPOLATIONS = ('linear', 'cubic', 'pchip')
+
+class LandAreaCalculator:
+    def __init__(self, lengths, widths, integration='auto', interpolation='linear'):
+        if integration not in INTEGRATION_BACKENDS:
+            raise ValueError(f"طريقة تكامل غير معروفة: {integration}")
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"نوع استيفاء غير معروف: {interpolation}")
+        self.lengths = lengths
+        self.widths = widths
+        self.integration = integration
+        self.interpolation = interpolation
+        self.areas = {}
+        self.timings = {}
+    
+    @traced('area.calculate_all_methods')
+    def calculate_all_methods(self):
+        """حساب المساحة بجميع الطرق"""
+        # طريقة شبه المنحرف
+        start = time.perf_counter()
+        self.areas['طريقة شبه المنحرف'] = _trapezoid(self.widths, self.lengths)
+        self.timings['طريقة شبه المنحرف'] = time.perf_counter() - start
+        
+        # طريقة سمبسون
+        start = time.perf_counter()
+        self.areas['طريقة سمبسون'] = simpson_area(self.lengths, self.widths)
+        self.timings['طريقة سمبسون'] = time.perf_counter() - start
+        
+        # طريقة التكامل العددي
+        start = time.perf_counter()
+        self.areas['طريقة التكامل'] = self.integrate()
+        self.timings['طريقة التكامل'] = time.perf_counter() - start
+        
+        # طريقة التقسيم إلى أجزاء
+        start = time.perf_counter()
+        total_area = 0
+        for i in range(len(self.lengths) - 1):
+            avg_width = (self.widths[i] + self.widths[i + 1]) / 2
+            segment_length = self.lengths[i + 1] - self.lengths[i]
+            total_area += avg_width * segment_length
+        self.areas['طريقة التقسيم'] = total_area
+        self.timings['طريقة التقسيم'] = time.perf_counter() - start
+        
+        return self.areas
+    
+    @traced('area.integrate')
+    def integrate(self):
+        """تكامل دالة العرض على محور الطول حسب طريقة التكامل ونوع الاستيفاء"""
+        backend = self.integration
+        if backend == 'auto':
+            backend = 'exact' if self.interpolation == 'linear' else 'quad'
+        if backend == 'exact' and self.interpolation != 'linear':
+            raise ValueError("التكامل الدقيق متاح للاستيفاء الخطي فقط")
+        
+        x = np.asarray(self.lengths, dtype=float)
+        y = np.asarray(self.widths, dtype=float)
+        order = np.argsort(x, kind='stable')
+        x, y = x[order], y[order]
+        
+        if backend == 'exact':
+            # الاستيفاء الخطي متعدد القطع تكامله مجموع أشباه المنحرفات تماماً
+            return float(np.sum(0.5 * (y[:-1] + y[1:]) * np.diff(x)))
+        
+        # SciPy تستورد عند الحاجة فقط حتى يبقى الاستيراد سريعاً
+        from scipy.integrate import quad
+        from scipy.interpolate import CubicSpline, PchipInterpolator
+        
+        if self.interpolation == 'cubic':
+            width_function = CubicSpline(x, y)
+        elif self.interpolation == 'pchip':
+            width_function = PchipInterpolator(x, y)
+        else:
+            def width_function(l):
+                return np.interp(l, x, y)
+        
+        # تمرير نقاط القياس لـ quad حتى لا يتعثر عند نقاط الانكسار
+        integral_area, error = quad(width_function, x[0], x[-1],
+                                    points=x[1:-1], limit=max(50, 2 * len(x)))
+        return integral_area
+    
+    @staticmethod
+    def calculate_batch(lengths, widths, offsets):
+        """حساب مساحات عدة أراضٍ دفعة واحدة بجميع الطرق
+        
+        lengths و widths مصفوفتان مسطحتان لنقاط جميع الأراضي، و offsets
+        إزاحات بداية كل أرض (طولها عدد الأراضي + 1) بحيث تكون نقاط الأرض i
+        هي lengths[offsets[i]:offsets[i + 1]].
+        تعيد قاموساً يربط اسم كل طريقة بمصفوفة المساحات لكل الأراضي.
+        """
+        x = np.asarray(lengths, dtype=float)
+        y = np.asarray(widths, dtype=float)
+        offsets = np.asarray(offsets, dtype=np.intp)
+        
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError("يجب أن يتساوى عدد النقاط الطولية مع عدد العروض")
+        if offsets.ndim != 1 or len(offsets) < 2 or offsets[0] != 0 or offsets[-1] != len(x):
+            raise ValueError("الإزاحات يجب أن تبدأ بصفر وتنتهي بعدد النقاط")
+        counts = np.diff(offsets)
+        if np.any(counts < 2):
+            raise ValueError("يجب إدخال نقطتين على الأقل لكل أرض")
+        
+        n_parcels = len(counts)
+        parcel = np.repeat(np.arange(n_parcels), counts)
+        
+        # مساحات أشباه المنحرفات لكل قطعة، مع إلغاء القطع الواصلة بين أرضين
+        dx = np.diff(x)
+        same = parcel[1:] == parcel[:-1]
+        segments = np.where(same, 0.5 * (y[:-1] + y[1:]) * dx, 0.0)
+        trapezoid = np.bincount(parcel[:-1], weights=segments, minlength=n_parcels)
+        
+        # طريقة التكامل: تكامل دقيق للاستيفاء الخطي بعد ترتيب النقاط داخل كل أرض
+        if np.all(dx[same] >= 0):
+            integral = trapezoid.copy()
+        else:
+            order = np.lexsort((x, parcel))
+            xs, ys = x[order], y[order]
+            sorted_segments = np.where(same, 0.5 * (ys[:-1] + ys[1:]) * np.diff(xs), 0.0)
+            integral = np.bincount(parcel[:-1], weights=sorted_segments, minlength=n_parcels)
+        
+        return {
+            'طريقة شبه المنحرف': trapezoid,
+            'طريقة سمبسون': _batch_simpson(x, y, offsets, counts, parcel),
+            'طريقة التكامل': integral,
+            'طريقة التقسيم': trapezoid.copy(),
+        }
+
+@memoize()
+def calculate_land_areas(lengths, widths, integration='auto', interpolation='linear'):
+    """مساحات أرض واحدة بجميع الطرق، محفوظة للمدخلات المتكررة"""
+    return LandAreaCalculator(lengths, widths, integration, interpolation).calculate_all_methods()
+
+def pack_parcels(parcels):
+    """تحويل قائمة أراضٍ [(الأطوال، العروض), ...] إلى مصفوفات مسطحة وإزاحات"""
+    counts = [len(parcel_lengths) for parcel_lengths, _ in parcels]
+    offsets = np.zeros(len(parcels) + 1, dtype=np.intp)
+    np.cumsum(counts, out=offsets[1:])
+    if len(parcels) == 0:
+        return np.empty(0), np.empty(0), offsets
+    lengths = np.concatenate([np.asarray(l, dtype=float) for l, _ in parcels])
+    widths = np.concatenate([np.asarray(w, dtype=float) for _, w in parcels])
+    return lengths, widths, offsets
+
+def simpson_area(lengths, widths):
+    """طريقة سمبسون لأرض واحدة مطابقة لنتيجة scipy.integrate.simpson"""
+    x = np.asarray(lengths, dtype=float)
+    y = np.asarray(widths, dtype=float)
+    return float(_batch_simpson(x, y, np.array([0, len(x)]), np.array([len(x)]),
+                                np.zeros(len(x), dtype=np.intp))[0])
+
+def _safe_divide(num, den):
+    """قسمة تعيد صفراً عند القسمة على صفر (كما في scipy.integrate.simpson)"""
+    return np.divide(num, den, out=np.zeros_like(num, dtype=float), where=den != 0)
+
+def _batch_simpson(x, y, offsets, counts, parcel):
+    """طريقة سمبسون لعدة أراضٍ مطابقة لنتيجة scipy.integrate.simpson لكل أرض"""
+    n_parcels = len(counts)
+    result = np.zeros(n_parcels)
+    local = np.arange(len(x)) - offsets[parcel]
+    
+    # آخر نقطة تنتهي عندها أزواج سمبسون: N-1 للعدد الفردي و N-2 للزوجي
+    limit = (counts - 1 - (counts % 2 == 0))[parcel]
+    starts = np.flatnonzero((local % 2 == 0) & (local + 2 <= limit))
+    if len(starts):
+        pairs = _simpson_pairs(x, y, starts)
+        result += np.bincount(parcel[starts], weights=pairs, minlength=n_parcels)
+    
+    last = offsets[1:] - 1
+    
+    # أرض بنقطتين فقط: شبه منحرف واحد
+    two = np.flatnonzero(counts == 2)
+    if len(two):
+        e = last[two]
+        result[two] += 0.5 * (x[e] - x[e - 1]) * (y[e] + y[e - 1])
+    
+    # عدد نقاط زوجي: تصحيح الفترة الأخيرة (Cartwright)
+    even = np.flatnonzero((counts % 2 == 0) & (counts > 2))
+    if len(even):
+        e = last[even]
+        result[even] += _simpson_last_interval(x[e - 2], x[e - 1], x[e], y[e - 2], y[e - 1], y[e])
+    
+    return result
+
+def _simpson_pairs(x, y, starts):
+    """مساحة كل زوج فترات لسمبسون مع تباعد غير منتظم، يبدأ كل زوج عند starts"""
+    h0 = x[starts + 1] - x[starts]
+    h1 = x[starts + 2] - x[starts + 1]
+    hsum = h0 + h1
+    h0_h1 = _safe_divide(h0, h1)
+    return hsum / 6.0 * (
+        y[starts] * (2.0 - _safe_divide(np.ones_like(h0_h1), h0_h1))
+        + y[starts + 1] * hsum * _safe_divide(hsum, h0 * h1)
+        + y[starts + 2] * (2.0 - h0_h1)
+    )
+
+def _simpson_last_interval(x0, x1, x2, y0, y1, y2):
+    """تصحيح Cartwright للفترة الأخيرة عند عدد نقاط زوجي"""
+    h0 = np.asarray(x1 - x0, dtype=float)
+    h1 = np.asarray(x2 - x1, dtype=float)
+    alpha = _safe_divide(2 * h1 ** 2 + 3 * h0 * h1, 6 * (h1 + h0))
+    beta = _safe_divide(h1 ** 2 + 3.0 * h0 * h1, 6 * h0)
+    eta = _safe_divide(h1 ** 3, 6 * h0 * (h0 + h1))
+    return alpha * y2 + beta * y1 - eta * y0
+
+class StreamingAreaAccumulator:
+    """تجميع المساحات تدريجياً من دفعات متتالية من النقاط بذاكرة ثابتة
+    
+    تمرر النقاط بترتيبها في ملف المسح عبر update، ثم تعيد result المساحات
+    بطرق شبه المنحرف وسمبسون والتقسيم مطابقة للحساب على الملف كاملاً.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.min_length = np.inf
+        self.max_length = -np.inf
+        self._trapezoid = 0.0
+        self._simpson = 0.0
+        # النقاط غير المستهلكة بعد آخر زوج سمبسون (نقطة أو نقطتان)
+        self._tail_x = np.empty(0)
+        self._tail_y = np.empty(0)
+        # آخر ثلاث نقاط لتصحيح الفترة الأخيرة
+        self._last_x = np.empty(0)
+        self._last_y = np.empty(0)
+    
+    def update(self, lengths, widths):
+        """إضافة دفعة جديدة من النقاط"""
+        x = np.asarray(lengths, dtype=float).ravel()
+        y = np.asarray(widths, dtype=float).ravel()
+        if x.shape != y.shape:
+            raise ValueError("يجب أن يتساوى عدد النقاط الطولية مع عدد العروض")
+        if len(x) == 0:
+            return self
+        
+        self.count += len(x)
+        self.min_length = min(self.min_length, float(x.min()))
+        self.max_length = max(self.max_length, float(x.max()))
+        
+        # آخر ثلاث نقاط في الملف حتى الآن
+        self._last_x = np.concatenate((self._last_x, x[-3:]))[-3:]
+        self._last_y = np.concatenate((self._last_y, y[-3:]))[-3:]
+        
+        # وصل الدفعة بالنقاط المتبقية من الدفعة السابقة
+        n_tail = len(self._tail_x)
+        x = np.concatenate((self._tail_x, x))
+        y = np.concatenate((self._tail_y, y))
+        
+        # قطع شبه المنحرف الجديدة فقط (قطع الذيل حسبت في الدفعة السابقة)
+        k = max(n_tail - 1, 0)
+        self._trapezoid += float(np.sum(0.5 * (y[k:-1] + y[k + 1:]) * np.diff(x[k:])))
+        
+        # أزواج سمبسون المكتملة، ويبقى الباقي ذيلاً للدفعة التالية
+        n_pairs = (len(x) - 1) // 2
+        if n_pairs:
+            self._simpson += float(np.sum(_simpson_pairs(x, y, np.arange(0, 2 * n_pairs, 2))))
+        self._tail_x = x[2 * n_pairs:].copy()
+        self._tail_y = y[2 * n_pairs:].copy()
+        return self
+    
+    def result(self):
+        """المساحات المجمعة حتى الآن بطرق شبه المنحرف وسمبسون والتقسيم"""
+        simpson_area = self._simpson
+        if self.count == 2:
+            simpson_area = self._trapezoid
+        elif self.count > 2 and self.count % 2 == 0:
+            simpson_area += float(_simpson_last_interval(*self._last_x, *self._last_y))
+        return {
+            'طريقة شبه المنحرف': self._trapezoid,
+            'طريقة سمبسون': simpson_area,
+            'طريقة التقسيم': self._trapezoid,
+        }
+
+SURVEY_FORMATS = {
+    '.csv': 'csv', '.txt': 'csv',
+    '.npy': 'npy',
+    '.bin': 'raw', '.dat': 'raw', '.f64': 'raw',
+}
+
+def iter_survey_chunks(source, chunk_size=1_000_000, fmt=None, dtype='<f8'):
+    """قراءة أزواج (المسافة، العرض) من ملف مسح على دفعات
+    
+    source مسار ملف أو كائن ملف مفتوح (مثل الملفات المرفوعة في Streamlit).
+    الصيغ: csv بعمودين، npy بمصفوفة (N, 2)، و raw أزواج متتالية بالنوع dtype.
+    تعيد في كل دفعة مصفوفتي الأطوال والعروض دون تحميل الملف كاملاً.
+    """
+    if fmt is None:
+        name = getattr(source, 'name', source)
+        fmt = SURVEY_FORMATS.get(os.path.splitext(str(name))[1].lower())
+        if fmt is None:
+            raise ValueError(f"صيغة ملف غير مدعومة: {name}")
+    
+    if fmt == 'csv':
+        yield from _iter_csv_chunks(source, chunk_size)
+    elif fmt == 'npy':
+        yield from _iter_npy_chunks(source, chunk_size)
+    elif fmt == 'raw':
+        yield from _iter_raw_chunks(source, chunk_size, np.dtype(dtype))
+    else:
+        raise ValueError(f"صيغة ملف غير مدعومة: {fmt}")
+
+def _open_source(source, mode):
+    """فتح المصدر إن كان مساراً، أو استخدامه كما هو إن كان ملفاً مفتوحاً"""
+    if hasattr(source, 'read'):
+        return contextlib.nullcontext(source)
+    return open(source, mode)
+
+def _iter_csv_chunks(source, chunk_size):
+    """قراءة ملف CSV بعمودين على دفعات مع تجاوز سطر العناوين إن وجد"""
+    with _open_source(source, 'rb') as raw:
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        try:
+            first = True
+            while True:
+                lines = list(itertools.islice(text, chunk_size))
+                if not lines:
+                    break
+                if first:
+                    first = False
+                    try:
+                        float(lines[0].split(',')[0])
+                    except ValueError:
+                        lines = lines[1:]
+                if lines:
+                    data = np.loadtxt(lines, delimiter=',', usecols=(0, 1), ndmin=2)
+                    yield data[:, 0], data[:, 1]
+        finally:
+            # عدم إغلاق الملف الأصلي عند إغلاق الغلاف النصي
+            text.detach()
+
+def _iter_npy_chunks(source, chunk_size):
+    """قراءة مصفوفة npy بشكل (N, 2) على دفعات"""
+    if not hasattr(source, 'read'):
+        array = np.load(source, mmap_mode='r')
+        _check_pairs_shape(array.shape)
+        for start in range(0, len(array), chunk_size):
+            chunk = np.asarray(array[start:start + chunk_size], dtype=float)
+            yield chunk[:, 0], chunk[:, 1]
+        return
+    
+    major, minor = np.lib.format.read_magic(source)
+    if (major, minor) == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(source)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(source)
+    _check_pairs_shape(shape)
+    if fortran_order:
+        raise ValueError("ترتيب Fortran غير مدعوم في القراءة المتدفقة")
+    yield from _iter_raw_chunks(source, chunk_size, dtype)
+
+def _iter_raw_chunks(source, chunk_size, dtype):
+    """قراءة أزواج متتالية من القيم الثنائية على دفعات"""
+    if not hasattr(source, 'read'):
+        # np.memmap لا يقبل ملفاً فارغاً: لا دفعات
+        if os.path.getsize(source) == 0:
+            return
+        array = np.memmap(source, dtype=dtype, mode='r')
+        if len(array) % 2:
+            raise ValueError("عدد القيم في الملف الثنائي يجب أن يكون زوجياً")
+        array = array.reshape(-1, 2)
+        for start in range(0, len(array), chunk_size):
+            chunk = np.asarray(array[start:start + chunk_size], dtype=float)
+            yield chunk[:, 0], chunk[:, 1]
+        return
+    
+    pair_bytes = 2 * dtype.itemsize
+    while True:
+        buffer = source.read(chunk_size * pair_bytes)
+        if not buffer:
+            break
+        if len(buffer) % pair_bytes:
+            raise ValueError("الملف الثنائي ينتهي بزوج غير مكتمل")
+        chunk = np.frombuffer(buffer, dtype=dtype).astype(float).reshape(-1, 2)
+        yield chunk[:, 0], chunk[:, 1]
+
+def _check_pairs_shape(shape):
+    if len(shape) != 2 or shape[1] != 2:
+        raise ValueError("يجب أن تكون المصفوفة بشكل (عدد النقاط، 2)")
+
+@traced('area.stream_survey')
+def stream_survey_areas(source, chunk_size=1_000_000, fmt=None, dtype='<f8'):
+    """حساب مساحة ملف مسح كبير بالتدفق دون تحميله في الذاكرة"""
+    accumulator = StreamingAreaAccumulator()
+    for lengths, widths in iter_survey_chunks(source, chunk_size, fmt, dtype):
+        accumulator.update(lengths, widths)
+    return accumulator
+
+def land_drawing(lengths, widths, areas):
+    """وصف رسم شكل الأرض: الحدود والمساحة المظللة وتسميات النقاط ونتائج الطرق"""
+    points = tuple(zip(map(float, lengths), map(float, widths)))
+    boundary = ((points[0][0], 0.0),) + points + ((points[-1][0], 0.0),)
+    items = [
+        Path(points, 'blue', width=3, label='حدود الأرض', marker_size=8),
+        Area(boundary, 'green', alpha=0.3, edge_color='green', edge_width=1.0, label='المساحة'),
+    ]
+    items += [Label((x, y), f'({x_text}m, {y_text}m)', size=10, bold=True, offset=(5.0, 5.0))
+              for (x, y), x_text, y_text in zip(points, lengths, widths)]
+
+    info_text = "نتائج حساب المساحة:\n\n"
+    for method, area in areas.items() if hasattr(areas, 'items') else areas:
+        info_text += f"{method}: {area:.2f} م²\n"
+    items.append(Label((0.02, 0.98), info_text, size=12, bold=True, valign='top', background='wheat',
+                       background_alpha=0.8, padding=0.3, coords='axes'))
+
+    return Drawing(
+        tuple(items),
+        title='حساب مساحة الأرض ذات الانحراف',
+        size=(12.0, 8.0),
+        xlabel='الطول (متر)', ylabel='العرض (متر)',
+        legend='best', title_size=16, label_size=12,
+    )
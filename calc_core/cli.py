@@ -0,0 +1,131 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from calc_core.area import LandAreaCalculator, calculate_land_areas, pack_parcels, stream_survey_areas
+from calc_core.gable import calculate_angles, calculate_hypotenuse, calculate_kamer, calculate_rafter
+from calc_core.prism import calculate_prism_geometry
+
+# نوع المهمة -> (الدالة، أسماء المدخلات)
+JOB_TYPES = {
+    'hypotenuse': (calculate_hypotenuse, ('base', 'height')),
+    'rafter': (calculate_rafter, ('width', 'height_cm')),
+    'angles': (calculate_angles, ('base', 'height')),
+    'kamer': (calculate_kamer, ('width', 'height')),
+    'prism': (calculate_prism_geometry, ('base', 'height', 'depth')),
+}
+
+def load_jobs(path):
+    """قراءة المهام من ملف JSON أو JSONL أو CSV"""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if ext == '.csv':
+            # الخلايا الفارغة تعني أن المدخل غير مستخدم في هذا النوع من المهام
+            return [{k: v for k, v in row.items() if v not in (None, '')} for row in csv.DictReader(f)]
+        if ext == '.jsonl':
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('jobs', [data])
+    return data
+
+def _parse_values(value):
+    """تحويل قائمة قيم من JSON أو نص مفصول بفاصلة منقوطة أو مسافات"""
+    if isinstance(value, str):
+        value = value.replace(';', ' ').replace(',', ' ').split()
+    return [float(v) for v in value]
+
+def run_jobs(jobs):
+    """تنفيذ المهام وإرجاع نتيجة لكل مهمة بنفس الترتيب
+    
+    مهام المساحة ذات الاستيفاء الخطي تجمع وتحسب دفعة واحدة.
+    """
+    results = [None] * len(jobs)
+    batch_indices, batch_parcels = [], []
+    
+    for i, job in enumerate(jobs):
+        job_type = job.get('type')
+        try:
+            if job_type == 'area':
+                integration = job.get('integration', 'auto')
+                interpolation = job.get('interpolation', 'linear')
+                if 'file' in job:
+                    accumulator = stream_survey_areas(job['file'], fmt=job.get('format'))
+                    result = dict(accumulator.result(), count=accumulator.count)
+                else:
+                    lengths = _parse_values(job['lengths'])
+                    widths = _parse_values(job['widths'])
+                    if len(lengths) != len(widths):
+                        raise ValueError("يجب أن يتساوى عدد النقاط الطولية مع عدد العروض")
+                    if len(lengths) < 2:
+                        raise ValueError("يجب إدخال نقطتين على الأقل")
+                    if integration in ('auto', 'exact') and interpolation == 'linear':
+                        batch_indices.append(i)
+                        batch_parcels.append((lengths, widths))
+                        continue
+                    result = calculate_land_areas(lengths, widths, integration, interpolation)
+            elif job_type in JOB_TYPES:
+                function, names = JOB_TYPES[job_type]
+                result = function(*(float(job[name]) for name in names))
+            else:
+                raise ValueError(f"نوع مهمة غير معروف: {job_type}")
+            results[i] = {'job': i, 'type': job_type, 'result': _to_builtin(result)}
+        except (KeyError, ValueError, TypeError, OSError) as e:
+            message = f"مدخل مفقود: {e}" if isinstance(e, KeyError) else str(e)
+            results[i] = {'job': i, 'type': job_type, 'error': message}
+    
+    if batch_parcels:
+        areas = LandAreaCalculator.calculate_batch(*pack_parcels(batch_parcels))
+        for row, i in enumerate(batch_indices):
+            result = {method: float(values[row]) for method, values in areas.items()}
+            results[i] = {'job': i, 'type': 'area', 'result': result}
+    
+    return results
+
+def _to_builtin(result):
+    """تحويل قيم NumPy إلى أنواع Python القابلة للتسلسل"""
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in result.items()}
+
+def write_results(results, output, fmt):
+    """كتابة النتائج بصيغة JSONL أو CSV"""
+    if fmt == 'csv':
+        fields = ['job', 'type', 'error']
+        for record in results:
+            for key in record.get('result', {}):
+                if key not in fields:
+                    fields.append(key)
+        writer = csv.DictWriter(output, fieldnames=fields)
+        writer.writeheader()
+        for record in results:
+            writer.writerow({'job': record['job'], 'type': record['type'],
+                             'error': record.get('error', ''), **record.get('result', {})})
+    else:
+        for record in results:
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m calc_core',
+        description='تنفيذ مهام الحسابات الهندسية من ملفات JSON/JSONL/CSV دون واجهة رسومية',
+    )
+    parser.add_argument('job_files', nargs='+', help='ملفات المهام')
+    parser.add_argument('-o', '--output', help='ملف النتائج (الافتراضي: المخرج القياسي)')
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], default='jsonl', help='صيغة النتائج')
+    args = parser.parse_args(argv)
+    
+    jobs = []
+    for path in args.job_files:
+        jobs.extend(load_jobs(path))
+    results = run_jobs(jobs)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as output:
+            write_results(results, output, args.format)
+    else:
+        write_results(results, sys.stdout, args.format)
+    
+    return 1 if any('error' in record for record in results) else 0
@@ -0,0 +1,123 @@
+"""وصف تصريحي للرسوم مستقل عن مكتبة الرسم
+
+طبقة الحساب تنتج Drawing من عناصر أولية (خطوط، نقاط، مساحات، نصوص،
+تعليقات بأسهم، أقواس)، وتحوله الواجهات الخلفية في drawing_backends إلى
+matplotlib أو Plotly، و calc_core.svg إلى نص SVG مباشرة. العناصر سجلات مدمجة من calc_core.records
+تتسلسل كصف قيم، فيسهل إرسال الوصف إلى عمال الرسم، ومقارنته، واستخدام
+بصمته مفتاحاً للذاكرة المؤقتة. الإحداثيات صفوف أعداد عشرية، ثنائية أو
+ثلاثية الأبعاد حسب Drawing.dims.
+"""
+import hashlib
+
+import numpy as np
+
+from calc_core.records import ResultRecord
+
+
+def as_points(points):
+    """تحويل مصفوفة أو قائمة نقاط إلى صف صفوف أعداد عشرية"""
+    return tuple(map(tuple, np.asarray(points, dtype=float).reshape(len(points), -1).tolist()))
+
+
+def as_point(point):
+    return tuple(float(value) for value in point)
+
+
+class Path(ResultRecord):
+    """خط متصل عبر النقاط (style: 'solid' أو 'dashed')، مع دوائر على النقاط إذا حدد marker_size"""
+    __slots__ = ('points', 'color', 'width', 'style', 'alpha', 'label', 'marker_size')
+    _defaults = {'width': 1.0, 'style': 'solid', 'alpha': 1.0, 'label': None, 'marker_size': 0.0}
+
+
+class Markers(ResultRecord):
+    """نقاط دائرية بقطر size بالنقطة، وحافة edge_color (None = لون النقطة)"""
+    __slots__ = ('points', 'color', 'size', 'edge_color', 'edge_width')
+    _defaults = {'size': 6.0, 'edge_color': None, 'edge_width': 0.0}
+
+
+class Area(ResultRecord):
+    """مضلع مملوء، أو وجه مستو في الرسم الثلاثي الأبعاد"""
+    __slots__ = ('points', 'fill', 'alpha', 'edge_color', 'edge_width', 'label')
+    _defaults = {'alpha': 1.0, 'edge_color': None, 'edge_width': 0.0, 'label': None}
+
+
+class Label(ResultRecord):
+    """نص في موضع بيانات، أو بنسبة من المحاور إذا كان coords='axes'
+
+    offset إزاحة بالنقاط عن الموضع، و background لون إطار مستدير خلف النص.
+    """
+    __slots__ = ('position', 'text', 'size', 'color', 'bold', 'align', 'valign',
+                 'background', 'background_alpha', 'padding', 'offset', 'coords')
+    _defaults = {'size': 10.0, 'color': 'black', 'bold': False, 'align': 'left', 'valign': 'baseline',
+                 'background': None, 'background_alpha': 1.0, 'padding': 0.3, 'offset': (0.0, 0.0),
+                 'coords': 'data'}
+
+
+class Callout(ResultRecord):
+    """نص في position مع سهم إلى target (arrow: '->' أو '<->')"""
+    __slots__ = ('target', 'position', 'text', 'color', 'size', 'arrow', 'arrow_width',
+                 'background_alpha', 'padding')
+    _defaults = {'size': 14.0, 'arrow': '->', 'arrow_width': 2.0, 'background_alpha': 0.8, 'padding': 0.4}
+
+
+class Arc(ResultRecord):
+    """قوس دائري ثنائي الأبعاد من الزاوية start إلى end بالدرجات"""
+    __slots__ = ('center', 'radius', 'start', 'end', 'color', 'width', 'alpha')
+    _defaults = {'width': 1.0, 'alpha': 1.0}
+
+
+class Drawing(ResultRecord):
+    """رسم كامل: العناصر (elements) بترتيب رسمها وإعدادات المحاور
+
+    size بالبوصة، والحدود None تعني حسابها من العناصر. legend يكون None أو
+    'best' أو 'below' (أسفل الرسم في ثلاثة أعمدة).
+    """
+    __slots__ = ('elements', 'title', 'size', 'dims', 'xlabel', 'ylabel', 'zlabel',
+                 'xlim', 'ylim', 'zlim', 'equal', 'grid', 'grid_style', 'background',
+                 'legend', 'title_size', 'title_pad', 'label_size', 'label_bold', 'label_pad')
+    _defaults = {'title': '', 'size': (10.0, 8.0), 'dims': 2, 'xlabel': '', 'ylabel': '', 'zlabel': '',
+                 'xlim': None, 'ylim': None, 'zlim': None, 'equal': False, 'grid': True,
+                 'grid_style': 'solid', 'background': '#ffffff', 'legend': None,
+                 'title_size': 14.0, 'title_pad': 6.0, 'label_size': 12.0, 'label_bold': False,
+                 'label_pad': None}
+
+
+PRIMITIVES = (Path, Markers, Area, Label, Callout, Arc)
+
+
+def drawing_fingerprint(drawing):
+    """بصمة SHA-256 ثابتة للرسم، تصلح مفتاحاً للذاكرة المؤقتة بين العمليات"""
+    return hashlib.sha256(repr(drawing).encode()).hexdigest()
+
+
+def diff_drawings(old, new):
+    """العناصر المتغيرة بين رسمين: قائمة (الموضع، القديم، الجديد)
+
+    العنصر المضاف أو المحذوف يظهر مع None في الجهة الأخرى.
+    """
+    changes = []
+    for index in range(max(len(old.elements), len(new.elements))):
+        before = old.elements[index] if index < len(old.elements) else None
+        after = new.elements[index] if index < len(new.elements) else None
+        if before != after:
+            changes.append((index, before, after))
+    return changes
+
+
+def drawing_bounds(drawing):
+    """حدود كل محور من جميع نقاط العناصر: ((أدنى، أقصى)، ...)"""
+    coords = []
+    for item in drawing.elements:
+        if isinstance(item, (Path, Markers, Area)):
+            coords.extend(item.points)
+        elif isinstance(item, Label) and item.coords == 'data':
+            coords.append(item.position)
+        elif isinstance(item, Callout):
+            coords.extend((item.target, item.position))
+        elif isinstance(item, Arc):
+            x, y = item.center
+            coords.extend(((x - item.radius, y - item.radius), (x + item.radius, y + item.radius)))
+    if not coords:
+        return ((0.0, 1.0),) * drawing.dims
+    array = np.asarray(coords, dtype=float)[:, :drawing.dims]
+    return tuple(zip(array.min(axis=0).tolist(), array.max(axis=0).tolist()))
@@ -0,0 +1,180 @@
+import math
+
+import numpy as np
+
+from calc_core.drawing import Arc, Callout, Drawing, Label, Markers, Path
+from calc_core.memo import memoize
+from calc_core.records import AnglesResult, HypotenuseResult, KamerResult, RafterResult
+from calc_core.tracing import traced
+
+def _check_positive(*values):
+    """التحقق من أن جميع القيم أكبر من الصفر"""
+    if not all(value > 0 for value in values):
+        raise ValueError("يجب أن تكون القيم أكبر من الصفر")
+
+@memoize()
+def calculate_hypotenuse(base, height):
+    """حساب الوتر بنظرية فيثاغورس (تبويب حساب الوتر)"""
+    _check_positive(base, height)
+    helf = base / 2
+    beem = math.sqrt(helf**2 + height**2)
+    angle = math.degrees(math.atan(height / helf))
+    return HypotenuseResult(base=base, height=height, helf=helf, beem=beem, angle=angle)
+
+@memoize()
+def calculate_rafter(width, height_cm):
+    """حساب الشتلة من عرض الجملون بالمتر وارتفاعه بالسنتيمتر"""
+    _check_positive(width, height_cm)
+    height_m = height_cm / 100
+    helf = width / 2
+    beem = math.sqrt(helf**2 + height_m**2)
+    angle = math.degrees(math.atan(height_m / helf))
+    return RafterResult(
+        width=width, height_cm=height_cm, height_m=height_m,
+        helf=helf, beem=beem, total_length=beem * 2,
+        angle=angle, slope_percent=height_m / helf * 100,
+    )
+
+@memoize()
+def calculate_angles(base, height):
+    """حساب زاوية القاعدة وزاوية القمة وزاوية قص الرأس"""
+    _check_positive(base, height)
+    helf = base / 2
+    angle = math.degrees(math.atan(height / helf))
+    top_angle = 180 - (2 * angle)
+    return AnglesResult(
+        base=base, height=height, helf=helf,
+        angle=angle, top_angle=top_angle, head_cut_angle=top_angle / 2,
+    )
+
+@memoize()
+def calculate_kamer(width, height):
+    """حساب طول الكمر وزاويته ومساحة السطح"""
+    _check_positive(width, height)
+    helf = width / 2
+    beem = math.sqrt(helf**2 + height**2)
+    angle = math.degrees(math.atan(height / helf))
+    return KamerResult(
+        width=width, height=height, helf=helf, beem=beem,
+        total_length=beem * 2, angle=angle, surface_area=width * beem,
+    )
+
+SWEEP_COLUMNS = (
+    'width', 'height', 'helf', 'beem', 'total_length',
+    'angle', 'top_angle', 'slope_percent', 'surface_area',
+)
+
+@traced('gable.sweep')
+def gable_sweep(widths, heights, height_unit='m'):
+    """حساب الجملون لكل تركيبة عرض × ارتفاع دفعة واحدة بالبث في NumPy
+    
+    تعاد قاموساً من مصفوفات ثنائية الأبعاد بشكل (len(widths), len(heights)).
+    الارتفاع في النتائج بالمتر دائماً، و height_unit='cm' يحوله من السنتيمتر.
+    """
+    widths = np.asarray(widths, dtype=float).reshape(-1, 1)
+    heights = np.asarray(heights, dtype=float).reshape(1, -1)
+    if height_unit == 'cm':
+        heights = heights / 100
+    elif height_unit != 'm':
+        raise ValueError(f"وحدة ارتفاع غير معروفة: {height_unit}")
+    if not (np.all(widths > 0) and np.all(heights > 0)):
+        raise ValueError("يجب أن تكون القيم أكبر من الصفر")
+    
+    helf = widths / 2
+    beem = np.hypot(helf, heights)
+    angle = np.degrees(np.arctan(heights / helf))
+    shape = (widths.shape[0], heights.shape[1])
+    return {
+        'width': np.broadcast_to(widths, shape),
+        'height': np.broadcast_to(heights, shape),
+        'helf': np.broadcast_to(helf, shape),
+        'beem': beem,
+        'total_length': beem * 2,
+        'angle': angle,
+        'top_angle': 180 - 2 * angle,
+        'slope_percent': heights / helf * 100,
+        'surface_area': widths * beem,
+    }
+
+def sweep_table(sweep, sort_by='beem', descending=False, limit=None):
+    """تسطيح نتائج المسح إلى أعمدة مرتبة حسب sort_by، مع الاكتفاء بأول limit صف"""
+    if sort_by not in SWEEP_COLUMNS:
+        raise ValueError(f"عمود غير معروف: {sort_by}")
+    key = sweep[sort_by].ravel()
+    if descending:
+        key = -key
+    if limit is not None and limit < key.size:
+        # اختيار أفضل limit صف أولاً ثم ترتيبها فقط بدلاً من ترتيب الشبكة كاملة
+        order = np.argpartition(key, limit - 1)[:limit]
+        order = order[np.argsort(key[order], kind='stable')]
+    else:
+        order = np.argsort(key, kind='stable')
+    return {name: sweep[name].ravel()[order] for name in SWEEP_COLUMNS}
+
+# ألوان رسم المثلث
+TRIANGLE_COLORS = {
+    'base': '#2E8B57',      # أخضر للقاعدة
+    'left': '#FF6B6B',      # أحمر للجانب الأيسر
+    'right': '#4ECDC4',     # أزرق للجانب الأيمن
+    'height': '#FFD166',    # أصفر للارتفاع
+    'angle': '#6A0572',     # بنفسجي للزوايا
+    'text': '#1A535C',      # أزرق داكن للنصوص
+}
+
+def triangle_drawing(base, height, helf, beem, angle, title, show_angles=True, top_angle=0):
+    """وصف رسم المثلث: الأضلاع والارتفاع والقياسات وأقواس الزوايا"""
+    colors = TRIANGLE_COLORS
+    items = [
+        Path(((-helf, 0.0), (helf, 0.0)), colors['base'], width=6, label=f'القاعدة: {base}m'),
+        Path(((-helf, 0.0), (0.0, height)), colors['left'], width=6, label=f'الوتر الأيسر: {beem:.3f}m'),
+        Path(((0.0, height), (helf, 0.0)), colors['right'], width=6, label=f'الوتر الأيمن: {beem:.3f}m'),
+        # خط الارتفاع العمودي
+        Path(((0.0, 0.0), (0.0, height)), colors['height'], width=3, style='dashed', alpha=0.7,
+             label=f'الارتفاع: {height}m'),
+    ]
+
+    # النقاط الرئيسية
+    points = ((-helf, 0.0), (0.0, height), (helf, 0.0))
+    items.append(Markers(points, 'black', size=12, edge_color='white', edge_width=2))
+    for i, (x, y) in enumerate(points):
+        items.append(Label((x, y - height * 0.1), f'P{i + 1}', size=14, align='center',
+                           background='white', background_alpha=0.9))
+
+    # القياسات مع خلفيات واضحة
+    items += [
+        Callout((0.0, -height * 0.15), (0.0, -height * 0.25), f'{base}m', colors['base'],
+                size=16, arrow='<->', padding=0.5),
+        Callout((helf * 0.1, height / 2), (helf * 0.3, height / 2), f'{height}m', colors['height'],
+                size=16, arrow='<->', padding=0.5),
+        Callout((-helf / 2, height / 3), (-helf, height / 2), f'{beem:.3f}m', colors['left']),
+        Callout((helf / 2, height / 3), (helf, height / 2), f'{beem:.3f}m', colors['right']),
+    ]
+
+    if show_angles:
+        angle_radius = min(helf, height) * 0.2
+        angle_text = dict(size=16, color=colors['angle'], bold=True, background='white',
+                          background_alpha=0.9, padding=0.5)
+        items += [
+            Arc((-helf, 0.0), angle_radius, 0.0, angle, colors['angle'], width=3),
+            Label((-helf + angle_radius * 1.5, angle_radius * 0.8), f'{angle:.1f}°', **angle_text),
+            Arc((helf, 0.0), angle_radius, 180 - angle, 180.0, colors['angle'], width=3),
+            Label((helf - angle_radius * 1.5, angle_radius * 0.8), f'{angle:.1f}°', **angle_text),
+        ]
+        # زاوية القمة إذا كانت موجودة
+        if top_angle > 0:
+            items += [
+                Arc((0.0, height), angle_radius, 180 - angle, 180 + angle, 'purple', width=3),
+                Label((0.0, height + angle_radius * 1.5), f'{top_angle:.1f}°', size=16, color='purple',
+                      bold=True, align='center', background='lavender', background_alpha=0.9, padding=0.5),
+            ]
+
+    margin = max(helf, height) * 0.3
+    return Drawing(
+        tuple(items),
+        title=f'🎯 {title}\n(القاعدة: {base}m, الارتفاع: {height}m)',
+        size=(14.0, 10.0),
+        xlabel='المسافة الأفقية (متر)', ylabel='المسافة الرأسية (متر)',
+        xlim=(-helf - margin, helf + margin), ylim=(-height * 0.4, height + margin),
+        equal=True, grid_style='dashed', background='#f8f9fa', legend='below',
+        title_size=18, title_pad=20, label_size=14, label_bold=True,
+    )
@@ -0,0 +1,164 @@
+import copy
+import functools
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# جميع الدوال المحفوظة نتائجها، لعرض إحصاءاتها
+_REGISTRY = {}
+
+# الأرقام العشرية تقرب لهذا العدد من المنازل قبل استخدامها مفتاحاً، فالمدخلات
+# التي تختلف بأقل من 1e-9 تشترك في نتيجة واحدة
+KEY_DECIMALS = 9
+
+# حد البايتات التقريبي لكل دالة محفوظة (المفاتيح والنتائج معاً)
+MEMO_MAX_BYTES = int(float(os.environ.get('CALC_MEMO_MB', '64')) * 1024 * 1024)
+# المدخلات الأكبر من هذا العدد من القيم تحسب دون حفظ: مفتاحها مكلف ونادراً ما يتكرر
+MEMO_MAX_INPUT_ITEMS = 10_000
+
+def estimate_size(value):
+    """تقدير حجم القيمة بالبايت: الطول للبايتات، nbytes لمصفوفات NumPy، وإلا حجم pickle"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+def input_items(value):
+    """عدد القيم في المدخل: طول القوائم والمصفوفات والقواميس، و 1 لغيرها"""
+    if isinstance(value, np.ndarray):
+        return value.size
+    if isinstance(value, (list, tuple, dict)):
+        return len(value)
+    return 1
+
+def normalize_key(value):
+    """تحويل المدخلات إلى مفتاح ثابت: أرقام مقربة وقوائم ومصفوفات كصفوف
+    
+    الأرقام تقرب إلى KEY_DECIMALS منزلة، فـ 0.1 + 0.2 و 0.3 مفتاح واحد، وكذلك
+    أي رقمين يختلفان بأقل من 1e-9. القيم المنطقية تحفظ مع نوعها لأن
+    True == 1.0 في بايثون.
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return (bool, bool(value))
+    if isinstance(value, (str, type(None))):
+        return value
+    if isinstance(value, (int, float, np.number)):
+        return round(float(value), KEY_DECIMALS) + 0.0
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(normalize_key(v) for v in value)
+    return value
+
+class MemoCache:
+    """ذاكرة نتائج مشتركة للعملية مع مدة صلاحية وحد أقصى لعدد العناصر وللبايتات"""
+    
+    def __init__(self, maxsize=4096, ttl=3600.0, max_bytes=MEMO_MAX_BYTES):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.bypassed = 0
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """إرجاع (True، القيمة) إن وجدت وصالحة، وإلا (False، None)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                expires, value, size = item
+                if expires >= time.monotonic():
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._items[key]
+                self._bytes -= size
+                self.expired += 1
+            self.misses += 1
+            return False, None
+    
+    def put(self, key, value):
+        size = estimate_size((key, value))
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if size > self.max_bytes:
+                # نتيجة أكبر من الحد كله: لا تحفظ
+                self.bypassed += 1
+                return
+            self._items[key] = (time.monotonic() + self.ttl, value, size)
+            self._bytes += size
+            while len(self._items) > self.maxsize or self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._items.popitem(last=False)
+                self._bytes -= evicted
+    
+    def skip(self):
+        """تسجيل استدعاء حسب دون المرور بالذاكرة"""
+        with self._lock:
+            self.bypassed += 1
+    
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._items), 'maxsize': self.maxsize, 'ttl': self.ttl,
+                'bytes': self._bytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'expired': self.expired,
+                'bypassed': self.bypassed,
+            }
+
+def memoize(maxsize=4096, ttl=3600.0, max_bytes=MEMO_MAX_BYTES, max_input_items=MEMO_MAX_INPUT_ITEMS):
+    """حفظ نتائج دالة نقية بمفتاح من مدخلاتها بعد توحيدها
+    
+    الذاكرة مشتركة بين جميع الجلسات، فتعاد نسخة عميقة من النتيجة المخزنة حتى
+    لا يصل تعديل مستدع (ولو في قاموس أو سجل داخلها) إلى مستخدم آخر. المفتاح من
+    المدخلات بعد تقريب أرقامها (normalize_key)، فالمدخلات التي تختلف بأقل من
+    1e-9 تعطي النتيجة نفسها. المدخلات التي تتجاوز max_input_items قيمة (مثل ملفات المسح الكبيرة) تحسب
+    مباشرة دون مفتاح ولا حفظ.
+    """
+    def decorator(function):
+        cache = MemoCache(maxsize, ttl, max_bytes)
+        
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if sum(map(input_items, (*args, *kwargs.values()))) > max_input_items:
+                cache.skip()
+                return function(*args, **kwargs)
+            key = (normalize_key(args), normalize_key(kwargs))
+            found, value = cache.get(key)
+            if not found:
+                value = function(*args, **kwargs)
+                cache.put(key, value)
+            return copy.deepcopy(value)
+        
+        wrapper.cache = cache
+        _REGISTRY[f'{function.__module__}.{function.__qualname__}'] = cache
+        return wrapper
+    return decorator
+
+def memo_stats():
+    """إحصاءات جميع الدوال المحفوظة نتائجها"""
+    return {name: cache.stats() for name, cache in _REGISTRY.items()}
+
+def clear_memo():
+    """مسح جميع النتائج المحفوظة"""
+    for cache in _REGISTRY.values():
+        cache.clear()
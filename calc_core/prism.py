@@ -0,0 +1,196 @@
+from math import sqrt, atan, degrees
+
+import numpy as np
+
+from calc_core.drawing import Area, Drawing, Label, Path
+from calc_core.memo import memoize
+from calc_core.records import PrismResult
+from calc_core.tracing import traced
+
+# أوجه المنشور الثلاثي بأرقام رؤوسه (مثلثان ثم ثلاثة مستطيلات)
+PRISM_FACES = (
+    (0, 1, 2),     # وجه أمامي
+    (3, 4, 5),     # وجه خلفي
+    (0, 1, 4, 3),  # قاعدة
+    (1, 2, 5, 4),  # وجه أيمن
+    (2, 0, 3, 5),  # وجه أيسر
+)
+
+# حواف المنشور
+PRISM_EDGES = (
+    (0, 1), (1, 2), (2, 0),  # أمامي
+    (3, 4), (4, 5), (5, 3),  # خلفي
+    (0, 3), (1, 4), (2, 5),  # وصلات
+)
+
+@memoize()
+def calculate_prism_geometry(base, height, depth):
+    """حساب الأبعاد الهندسية الأساسية للمنشور الثلاثي"""
+    hypotenuse = sqrt(base ** 2 + height ** 2)
+    space_diagonal = sqrt(base ** 2 + height ** 2 + depth ** 2)
+    angle_base = degrees(atan(height / base))
+    angle_top = 90 - angle_base
+    volume = 0.5 * base * height * depth
+    
+    return PrismResult(
+        base=base, height=height, depth=depth,
+        hypotenuse=hypotenuse, space_diagonal=space_diagonal,
+        angle_base=angle_base, angle_top=angle_top,
+        volume=volume
+    )
+
+# صيغة المدخلات المهيكلة لدفعات المناشير
+PRISM_DTYPE = np.dtype([('base', 'f8'), ('height', 'f8'), ('depth', 'f8')])
+
+@traced('prism.batch')
+def calculate_prism_batch(base, height=None, depth=None):
+    """حساب أبعاد عدة مناشير دفعة واحدة بنفس معادلات calculate_prism_geometry
+    
+    تقبل ثلاث مصفوفات (أو قيماً قابلة للبث) للقاعدة والارتفاع والعمق، أو
+    مدخلاً واحداً بأعمدة base و height و depth: مصفوفة مهيكلة بصيغة
+    PRISM_DTYPE أو قاموس أعمدة. تعيد قاموساً بنفس مفاتيح النتيجة المفردة
+    قيمه مصفوفات، بحيث يطابق الصف i نتيجة المنشور i (حقول PrismResult).
+    """
+    if (height is None) != (depth is None):
+        raise ValueError("يجب إعطاء الارتفاع والعمق معاً، أو تركهما معاً وتمرير مدخل بأعمدة")
+    if height is None:
+        columns = base
+        base, height, depth = (columns[name] for name in PRISM_DTYPE.names)
+    base, height, depth = np.broadcast_arrays(
+        *(np.asarray(values, dtype=float) for values in (base, height, depth))
+    )
+    if not (np.all(base > 0) and np.all(height > 0) and np.all(depth > 0)):
+        raise ValueError("يجب أن تكون القيم أكبر من الصفر")
+    
+    hypotenuse = np.hypot(base, height)
+    angle_base = np.degrees(np.arctan(height / base))
+    return {
+        'base': base, 'height': height, 'depth': depth,
+        'hypotenuse': hypotenuse,
+        'space_diagonal': np.sqrt(base ** 2 + height ** 2 + depth ** 2),
+        'angle_base': angle_base, 'angle_top': 90 - angle_base,
+        'volume': 0.5 * base * height * depth,
+    }
+
+def prism_batch_totals(batch):
+    """إجماليات الدفعة: عدد المناشير وطول الأوتار ومساحة وجه الوتر (الوتر × العمق) والحجم"""
+    return {
+        'count': int(batch['volume'].size),
+        'hypotenuse': float(batch['hypotenuse'].sum()),
+        'hypotenuse_face_area': float((batch['hypotenuse'] * batch['depth']).sum()),
+        'volume': float(batch['volume'].sum()),
+    }
+
+def prism_vertices(base, height, depth):
+    """رؤوس المنشور الثلاثي الستة"""
+    return np.array([
+        [0, 0, 0],                  # 0
+        [base, 0, 0],               # 1
+        [base / 2, height, 0],      # 2
+        [0, 0, depth],              # 3
+        [base, 0, depth],           # 4
+        [base / 2, height, depth],  # 5
+    ], dtype=float)
+
+def triangulate_faces(faces=PRISM_FACES):
+    """تقسيم الأوجه المضلعة إلى مثلثات (مروحة من الرأس الأول) وإرجاع مؤشرات i, j, k"""
+    triangles = [(face[0], face[n], face[n + 1]) for face in faces for n in range(1, len(face) - 1)]
+    i, j, k = (list(column) for column in zip(*triangles))
+    return i, j, k
+
+def edge_polyline(vertices, edges=PRISM_EDGES):
+    """إحداثيات جميع الحواف في خط واحد تفصل بين أجزائه None"""
+    xs, ys, zs = [], [], []
+    for start, end in edges:
+        for axis, values in zip(vertices[[start, end]].T, (xs, ys, zs)):
+            values.extend(axis.tolist())
+            values.append(None)
+    return xs, ys, zs
+
+def view_matrix(elev=30.0, azim=-60.0):
+    """مصفوفة إسقاط عمودي: دوران حول المحور الرأسي Y بزاوية azim ثم ميل بزاوية elev
+    
+    الصف الأول والثاني إحداثيات الشاشة الأفقية والرأسية، والثالث العمق
+    (القيم الأكبر أقرب للناظر).
+    """
+    az = np.radians(azim)
+    el = np.radians(elev)
+    right = np.array([np.cos(az), 0.0, -np.sin(az)])
+    toward = np.array([np.sin(az), 0.0, np.cos(az)])
+    up = np.array([0.0, 1.0, 0.0])
+    return np.array([
+        right,
+        np.cos(el) * up - np.sin(el) * toward,
+        np.sin(el) * up + np.cos(el) * toward,
+    ])
+
+def project_points(points, elev=30.0, azim=-60.0):
+    """إسقاط مجموعة نقاط ثلاثية الأبعاد دفعة واحدة وإرجاع (الإحداثيات الثنائية، العمق)"""
+    projected = np.asarray(points, dtype=float) @ view_matrix(elev, azim).T
+    return projected[..., :2], projected[..., 2]
+
+# ألوان عناصر رسم المنشور الافتراضية
+PRISM_COLORS = {
+    'ground_color': '#2E8B57',
+    'hypotenuse_color': '#FF6B35',
+    'angle_color': '#FFD166',
+    'base_color': '#4ECDC4',
+    'height_color': '#6A0572',
+    'structure_color': '#1A535C',
+}
+
+def prism_drawing(geometry, colors=None, line_thickness=2):
+    """وصف الرسم الثلاثي الأبعاد للمنشور: الأرضية والأوجه والوتر وقوس الزاوية والتسميات"""
+    colors = {**PRISM_COLORS, **(colors or {})}
+    base, height, depth = geometry['base'], geometry['height'], geometry['depth']
+    hypotenuse, angle_base = geometry['hypotenuse'], geometry['angle_base']
+    vertices = prism_vertices(base, height, depth)
+
+    ground_y = -height * 0.1
+    items = [Area(((-base * 0.2, ground_y, -depth * 0.2), (base * 1.2, ground_y, -depth * 0.2),
+                   (base * 1.2, ground_y, depth * 1.2), (-base * 0.2, ground_y, depth * 1.2)),
+                  colors['ground_color'], alpha=0.6)]
+
+    # الأوجه: القاعدة بلونها والباقي بلون الهيكل
+    face_colors = [colors['structure_color'], colors['structure_color'], colors['base_color'],
+                   colors['structure_color'], colors['structure_color']]
+    items += [Area(tuple(map(tuple, vertices[list(face)].tolist())), color, alpha=0.9,
+                   edge_color='black', edge_width=line_thickness)
+              for face, color in zip(PRISM_FACES, face_colors)]
+
+    # الوتر الأمامي والخلفي
+    items += [Path(tuple(map(tuple, vertices[[start, end]].tolist())), colors['hypotenuse_color'],
+                   width=line_thickness + 1)
+              for start, end in ((0, 2), (3, 5))]
+
+    # قوس الزاوية ونصها
+    theta = np.linspace(0, np.radians(angle_base), 30)
+    arc_radius = min(base, height) * 0.3
+    arc = np.column_stack([arc_radius * np.cos(theta), arc_radius * np.sin(theta), np.zeros_like(theta)])
+    items.append(Path(tuple(map(tuple, arc.tolist())), colors['angle_color'], width=3, alpha=0.8))
+    items.append(Label((arc_radius * 0.7, arc_radius * 0.3, 0.0), f'θ = {angle_base:.1f}°', size=11,
+                       color=colors['angle_color'], bold=True, background='yellow', background_alpha=0.7))
+
+    # تسميات الرؤوس والأبعاد
+    items += [Label(tuple(point), f'P{i + 1}', size=10, color='darkred', bold=True)
+              for i, point in enumerate(vertices.tolist())]
+    dimension_texts = (
+        ((base / 2, -height * 0.15, -depth * 0.1), f'القاعدة: {base:.1f}م', colors['base_color']),
+        ((-base * 0.2, height / 2, -depth * 0.1), f'الارتفاع: {height:.1f}م', colors['height_color']),
+        ((base * 1.1, height / 2, depth / 2), f'العمق: {depth:.1f}م', 'blue'),
+        ((base / 4, height / 3, 0.0), f'الوتر: {hypotenuse:.2f}م', colors['hypotenuse_color']),
+    )
+    items += [Label(position, text, size=11, color=color, bold=True, background='white', background_alpha=0.8)
+              for position, text, color in dimension_texts]
+
+    margin = max(base, height, depth) * 0.3
+    return Drawing(
+        tuple(items),
+        title=f"""الهيكل الثلاثي الأبعاد
+القاعدة: {base}م, الارتفاع: {height}م, العمق: {depth}م
+الوتر: {hypotenuse:.3f}م, الزاوية: {angle_base:.2f}°""",
+        size=(12.0, 10.0), dims=3,
+        xlabel='المحور X (الطول)', ylabel='المحور Y (الارتفاع)', zlabel='المحور Z (العمق)',
+        xlim=(-margin, base + margin), ylim=(-margin, height + margin), zlim=(-margin, depth + margin),
+        title_size=14, title_pad=25, label_size=12, label_bold=True, label_pad=15,
+    )
@@ -0,0 +1,98 @@
+"""سجلات نتائج مدمجة بـ __slots__ بدلاً من القواميس
+
+كل سجل يحجز مكاناً ثابتاً لحقوله دون قاموس داخلي، ويتسلسل بـ pickle كصف
+قيم فقط دون أسماء الحقول. القراءة بالصيغتين record.beem و record['beem']
+مدعومة، مع keys و items و get و as_dict، فيبقى متوافقاً مع الشيفرة التي
+كانت تتعامل مع النتائج كقواميس.
+"""
+
+
+class ResultRecord:
+    """أساس سجلات النتائج: الحقول تحددها __slots__ في كل صنف فرعي"""
+    __slots__ = ()
+    # القيم الافتراضية للحقول الاختيارية في الصنف الفرعي
+    _defaults = {}
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} يقبل {len(self.__slots__)} قيمة على الأكثر")
+        values = dict(zip(self.__slots__, args))
+        for name, value in kwargs.items():
+            if name not in self.__slots__:
+                raise TypeError(f"حقل غير معروف في {type(self).__name__}: {name}")
+            values[name] = value
+        missing = [name for name in self.__slots__ if name not in values and name not in self._defaults]
+        if missing:
+            raise TypeError(f"حقول ناقصة في {type(self).__name__}: {', '.join(missing)}")
+        for name in self.__slots__:
+            setattr(self, name, values[name] if name in values else self._defaults[name])
+
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __contains__(self, name):
+        return name in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def __hash__(self):
+        return hash((type(self), self.values()))
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        # التسلسل كصف قيم فقط، فأسماء الحقول معروفة من الصنف
+        return type(self), self.values()
+
+    def get(self, name, default=None):
+        return getattr(self, name) if name in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def items(self):
+        return tuple((name, getattr(self, name)) for name in self.__slots__)
+
+    def as_dict(self):
+        return dict(self.items())
+
+
+class HypotenuseResult(ResultRecord):
+    """نتيجة حساب الوتر"""
+    __slots__ = ('base', 'height', 'helf', 'beem', 'angle')
+
+
+class RafterResult(ResultRecord):
+    """نتيجة حساب الشتلة (الارتفاع مدخل بالسنتيمتر)"""
+    __slots__ = ('width', 'height_cm', 'height_m', 'helf', 'beem', 'total_length', 'angle', 'slope_percent')
+
+
+class AnglesResult(ResultRecord):
+    """نتيجة حساب الزوايا"""
+    __slots__ = ('base', 'height', 'helf', 'angle', 'top_angle', 'head_cut_angle')
+
+
+class KamerResult(ResultRecord):
+    """نتيجة حساب الكمر"""
+    __slots__ = ('width', 'height', 'helf', 'beem', 'total_length', 'angle', 'surface_area')
+
+
+class PrismResult(ResultRecord):
+    """نتيجة حساب أبعاد المنشور الثلاثي"""
+    __slots__ = ('base', 'height', 'depth', 'hypotenuse', 'space_diagonal', 'angle_base', 'angle_top', 'volume')
@@ -0,0 +1,292 @@
+"""كتابة وصف الرسم (calc_core.drawing) نص SVG مباشرة دون matplotlib
+
+الناتج نص متجهي صغير يعرض في المتصفح كما هو، ويُبنى بضم نصوص فقط، فيأخذ
+أقل من ملي ثانية مقابل مئات الملي ثانية لرسم PNG بـ matplotlib. الألوان
+تمرر كما هي (أسماء CSS أو #RRGGBB)، والسطر الذي يبدأ بحرف عربي يكتب من
+اليمين لليسار.
+"""
+import math
+from xml.sax.saxutils import escape
+
+from calc_core.drawing import Arc, Area, Callout, Label, Markers, Path, drawing_bounds
+from calc_core.prism import project_points
+from calc_core.tracing import traced
+
+# عدد البكسلات لكل بوصة، والهوامش حول منطقة الرسم
+SVG_DPI = 72
+SVG_MARGINS = (70, 60, 70, 60)  # يسار، يمين، أعلى، أسفل
+# هامش الحدود المحسوبة من العناصر، كنسبة من مداها (كما في matplotlib)
+SVG_AUTO_MARGIN = 0.05
+
+# صيغ عرض الرسوم ثنائية الأبعاد في الصفحات: SVG يكتب مباشرة من الوصف، و PNG بـ matplotlib
+RENDER_FORMATS = {'svg': "⚡ SVG (سريع)", 'png': "🖼️ PNG (matplotlib)"}
+
+_ANCHORS = {'left': 'start', 'center': 'middle', 'right': 'end'}
+
+
+def _color(color):
+    return escape(str(color), {'"': '&quot;'})
+
+
+def _is_rtl(text):
+    """هل أول حرف قوي الاتجاه في النص عربي أو عبري"""
+    for char in text:
+        if '\u0590' <= char <= '\u08ff':
+            return True
+        if char.isalpha():
+            return False
+    return False
+
+
+def _nice_ticks(low, high, count=6):
+    """قيم تدريج مقربة بين low و high"""
+    span = high - low
+    if span <= 0:
+        return [low]
+    step = 10 ** math.floor(math.log10(span / count))
+    for factor in (1, 2, 2.5, 5, 10):
+        if span / (step * factor) <= count:
+            step *= factor
+            break
+    first = math.ceil(low / step) * step
+    return [first + n * step for n in range(int((high - first) / step) + 1)]
+
+
+def _padded(bounds, limit):
+    """الحدود المحددة في الرسم كما هي، والمحسوبة مع هامش"""
+    if limit is not None:
+        return limit
+    low, high = bounds
+    pad = (high - low) * SVG_AUTO_MARGIN or 0.5
+    return low - pad, high + pad
+
+
+class _Canvas:
+    """تحويل إحداثيات البيانات إلى بكسلات منطقة الرسم (المحور الرأسي معكوس)"""
+
+    def __init__(self, drawing, bounds):
+        self.width = drawing.size[0] * SVG_DPI
+        self.height = drawing.size[1] * SVG_DPI
+        left, right, top, bottom = SVG_MARGINS
+        (x0, x1), (y0, y1) = bounds
+        plot_w, plot_h = self.width - left - right, self.height - top - bottom
+        sx, sy = plot_w / ((x1 - x0) or 1), plot_h / ((y1 - y0) or 1)
+        if drawing.equal:
+            sx = sy = min(sx, sy)
+        self.sx, self.sy = sx, sy
+        # توسيط منطقة الرسم عند تساوي المقياس
+        self.ox = left + (plot_w - (x1 - x0) * sx) / 2 - x0 * sx
+        self.oy = top + (plot_h - (y1 - y0) * sy) / 2 + y1 * sy
+        self.plot = (left, top, plot_w, plot_h)
+
+    def point(self, x, y):
+        return self.ox + x * self.sx, self.oy - y * self.sy
+
+    def points(self, points):
+        ox, oy, sx, sy = self.ox, self.oy, self.sx, self.sy
+        return ' '.join(f'{ox + x * sx:.1f},{oy - y * sy:.1f}' for x, y in points)
+
+
+def _text(x, y, text, size, color='black', bold=False, anchor='start', baseline='auto',
+          background=None, background_alpha=1.0, padding=0.3):
+    """نص بعدة أسطر، كل سطر عنصر text مستقل حتى لا تتداخل الأسطر عند إعادة ترتيب الاتجاه"""
+    if not text:
+        return ''
+    lines = text.split('\n')
+    step = size * 1.2
+    # موضع خط الأساس للسطر الأول
+    if baseline == 'middle':
+        first = y - (len(lines) - 1) * step / 2
+    else:
+        first = y
+    parts = []
+    if background is not None:
+        # عرض تقريبي للنص لرسم الإطار خلفه
+        width = max(len(line) for line in lines) * size * 0.6
+        height = len(lines) * step
+        pad = padding * size
+        left = x - {'start': 0, 'middle': width / 2, 'end': width}[anchor] - pad
+        top = {'hanging': y, 'middle': y - height / 2}.get(baseline, y - size) - pad
+        parts.append(f'<rect x="{left:.1f}" y="{top:.1f}" width="{width + 2 * pad:.1f}" '
+                     f'height="{height + 2 * pad:.1f}" rx="{pad:.1f}" fill="{_color(background)}" '
+                     f'fill-opacity="{background_alpha:g}"/>')
+    style = f' font-size="{size:g}" fill="{_color(color)}"'
+    if bold:
+        style += ' font-weight="bold"'
+    if baseline != 'auto':
+        style += f' dominant-baseline="{baseline}"'
+    for n, line in enumerate(lines):
+        line = escape(line)
+        if _is_rtl(line):
+            # تضمين من اليمين لليسار (RLE ... PDF) بدل direction="rtl" حتى لا تتغير المرساة
+            line = f'\u202b{line}\u202c'
+        parts.append(f'<text x="{x:.1f}" y="{first + n * step:.1f}"{style} text-anchor="{anchor}">{line}</text>')
+    return ''.join(parts)
+
+
+def _legend(drawing, right, top):
+    """مفتاح الرسم في الزاوية العليا اليمنى لمنطقة الرسم"""
+    entries = [item for item in drawing.elements if isinstance(item, (Path, Area)) and item.label]
+    if not entries:
+        return ''
+    width = max(len(item.label) for item in entries) * 7 + 40
+    parts = [f'<rect x="{right - width:.1f}" y="{top}" width="{width}" height="{len(entries) * 18 + 8}" '
+             f'fill="white" fill-opacity="0.9" stroke="#cccccc" rx="3"/>']
+    for n, item in enumerate(entries):
+        y = top + 14 + n * 18
+        x = right - width + 8
+        if isinstance(item, Path):
+            dash = ' stroke-dasharray="6,3"' if item.style == 'dashed' else ''
+            parts.append(f'<line x1="{x}" y1="{y}" x2="{x + 22}" y2="{y}" stroke="{_color(item.color)}" '
+                         f'stroke-width="{min(item.width, 4):g}"{dash}/>')
+            if item.marker_size:
+                parts.append(f'<circle cx="{x + 11}" cy="{y}" r="{min(item.marker_size, 8) / 2:g}" '
+                             f'fill="{_color(item.color)}"/>')
+        else:
+            edge = (f' stroke="{_color(item.edge_color)}" stroke-width="{item.edge_width:g}"'
+                    if item.edge_color else '')
+            parts.append(f'<rect x="{x}" y="{y - 5}" width="22" height="10" fill="{_color(item.fill)}" '
+                         f'fill-opacity="{item.alpha:g}"{edge}/>')
+        parts.append(_text(x + 28, y, item.label, 11, baseline='middle'))
+    return ''.join(parts)
+
+
+def _project(drawing, elev, azim):
+    """تحويل رسم ثلاثي الأبعاد إلى ثنائي بالإسقاط، مع ترتيب الأوجه حسب العمق"""
+    def flat(points):
+        projected, depth = project_points(points, elev, azim)
+        return tuple(map(tuple, projected.tolist())), float(depth.mean())
+
+    faces, others = [], []
+    for item in drawing.elements:
+        if isinstance(item, (Path, Markers, Area)):
+            points, depth = flat(item.points)
+            projected = type(item)(points, *item.values()[1:])
+            (faces if isinstance(item, Area) else others).append((depth, projected))
+        elif isinstance(item, Label):
+            points, _ = flat([item.position])
+            others.append((0.0, Label(points[0], *item.values()[1:])))
+        else:
+            others.append((0.0, item))
+    faces.sort(key=lambda entry: entry[0])
+    items = tuple(item for _, item in faces) + tuple(item for _, item in others)
+    # محاور الشاشة بعد الإسقاط بلا معنى، فلا تدريج ولا عناوين محاور
+    return type(drawing)(**{**drawing.as_dict(), 'elements': items, 'dims': 2, 'xlim': None, 'ylim': None,
+                            'zlim': None, 'equal': True, 'grid': False,
+                            'xlabel': '', 'ylabel': '', 'zlabel': ''})
+
+
+def _element(item, canvas):
+    """عنصر رسم واحد (غير Label) كنص SVG"""
+    if isinstance(item, Path):
+        dash = ' stroke-dasharray="8,5"' if item.style == 'dashed' else ''
+        out = (f'<polyline points="{canvas.points(item.points)}" fill="none" '
+               f'stroke="{_color(item.color)}" stroke-width="{item.width:g}" '
+               f'stroke-opacity="{item.alpha:g}" stroke-linecap="round" stroke-linejoin="round"{dash}/>')
+        if item.marker_size:
+            fill, r = _color(item.color), item.marker_size / 2
+            out += ''.join(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r:g}" fill="{fill}"/>'
+                           for x, y in (canvas.point(*point) for point in item.points))
+        return out
+    if isinstance(item, Markers):
+        fill, edge, r = _color(item.color), _color(item.edge_color or item.color), item.size / 2
+        return ''.join(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r:g}" fill="{fill}" '
+                       f'stroke="{edge}" stroke-width="{item.edge_width:g}"/>'
+                       for x, y in (canvas.point(*point) for point in item.points))
+    if isinstance(item, Area):
+        edge = (f'stroke="{_color(item.edge_color)}" stroke-width="{item.edge_width:g}" '
+                f'stroke-opacity="{item.alpha:g}"' if item.edge_color else 'stroke="none"')
+        return (f'<polygon points="{canvas.points(item.points)}" fill="{_color(item.fill)}" '
+                f'fill-opacity="{item.alpha:g}" {edge} stroke-linejoin="round"/>')
+    if isinstance(item, Arc):
+        (cx, cy), r = item.center, item.radius
+        start, end = math.radians(item.start), math.radians(item.end)
+        x1, y1 = canvas.point(cx + r * math.cos(start), cy + r * math.sin(start))
+        x2, y2 = canvas.point(cx + r * math.cos(end), cy + r * math.sin(end))
+        large = 1 if abs(item.end - item.start) > 180 else 0
+        # المحور الرأسي معكوس على الشاشة: الزاوية الموجبة مع عقارب الساعة
+        sweep = 0 if item.end >= item.start else 1
+        return (f'<path d="M{x1:.1f},{y1:.1f} A{r * canvas.sx:.1f},{r * canvas.sy:.1f} 0 {large} {sweep} '
+                f'{x2:.1f},{y2:.1f}" fill="none" stroke="{_color(item.color)}" '
+                f'stroke-width="{item.width:g}" stroke-opacity="{item.alpha:g}"/>')
+    if isinstance(item, Callout):
+        tx, ty = canvas.point(*item.target)
+        px, py = canvas.point(*item.position)
+        start = ' marker-start="url(#arrow)"' if item.arrow == '<->' else ''
+        return (f'<line x1="{px:.1f}" y1="{py:.1f}" x2="{tx:.1f}" y2="{ty:.1f}" '
+                f'stroke="{_color(item.color)}" stroke-width="{item.arrow_width:g}" '
+                f'marker-end="url(#arrow)"{start}/>'
+                + _text(px, py, item.text, item.size, bold=True, anchor='middle', baseline='middle',
+                        background=item.color, background_alpha=item.background_alpha, padding=item.padding))
+    return ''
+
+
+@traced('drawing.svg')
+def to_svg(drawing, elev=30.0, azim=-60.0):
+    """تحويل الوصف إلى نص SVG
+
+    الرسم الثلاثي الأبعاد يسقط أولاً على مستوى الشاشة بزاويتي elev و azim
+    وترسم أوجهه من الأبعد إلى الأقرب.
+    """
+    if drawing.dims == 3:
+        drawing = _project(drawing, elev, azim)
+    xbounds, ybounds = drawing_bounds(drawing)
+    bounds = (_padded(xbounds, drawing.xlim), _padded(ybounds, drawing.ylim))
+    canvas = _Canvas(drawing, bounds)
+    left, top, plot_w, plot_h = canvas.plot
+
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{canvas.width:.0f}" height="{canvas.height:.0f}" '
+           f'viewBox="0 0 {canvas.width:.0f} {canvas.height:.0f}" font-family="DejaVu Sans, Arial, sans-serif">',
+           '<defs><marker id="arrow" viewBox="0 0 10 10" refX="9" refY="5" markerWidth="6" markerHeight="6" '
+           'orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" fill="context-stroke"/></marker>'
+           f'<clipPath id="plot"><rect x="{left}" y="{top}" width="{plot_w:.1f}" height="{plot_h:.1f}"/>'
+           '</clipPath></defs>',
+           '<rect width="100%" height="100%" fill="white"/>',
+           f'<rect x="{left}" y="{top}" width="{plot_w:.1f}" height="{plot_h:.1f}" '
+           f'fill="{_color(drawing.background)}"/>']
+
+    if drawing.grid:
+        dash = ' stroke-dasharray="4,3"' if drawing.grid_style == 'dashed' else ''
+        (x0, x1), (y0, y1) = bounds
+        for tick in _nice_ticks(x0, x1):
+            x, _ = canvas.point(tick, 0)
+            if left <= x <= left + plot_w:
+                out.append(f'<line x1="{x:.1f}" y1="{top}" x2="{x:.1f}" y2="{top + plot_h:.1f}" '
+                           f'stroke="#b0b0b0" stroke-opacity="0.5"{dash}/>')
+                out.append(_text(x, top + plot_h + 14, f'{tick:g}', 10, anchor='middle'))
+        for tick in _nice_ticks(y0, y1):
+            _, y = canvas.point(0, tick)
+            if top <= y <= top + plot_h:
+                out.append(f'<line x1="{left}" y1="{y:.1f}" x2="{left + plot_w:.1f}" y2="{y:.1f}" '
+                           f'stroke="#b0b0b0" stroke-opacity="0.5"{dash}/>')
+                out.append(_text(left - 6, y, f'{tick:g}', 10, anchor='end', baseline='middle'))
+
+    out.append('<g clip-path="url(#plot)">')
+    out.extend(_element(item, canvas) for item in drawing.elements if not isinstance(item, Label))
+    out.append('</g>')
+
+    # النصوص فوق العناصر وخارج القص
+    for item in drawing.elements:
+        if isinstance(item, Label):
+            if item.coords == 'axes':
+                x, y = left + item.position[0] * plot_w, top + (1 - item.position[1]) * plot_h
+            else:
+                x, y = canvas.point(*item.position)
+            x, y = x + item.offset[0], y - item.offset[1]
+            out.append(_text(x, y, item.text, item.size, item.color, item.bold, _ANCHORS[item.align],
+                             'hanging' if item.valign == 'top' else 'auto',
+                             item.background, item.background_alpha, item.padding))
+
+    out.append(_text(canvas.width / 2, 8, drawing.title, drawing.title_size, bold=True,
+                     anchor='middle', baseline='hanging'))
+    out.append(_text(left + plot_w / 2, canvas.height - 12, drawing.xlabel, drawing.label_size,
+                     bold=drawing.label_bold, anchor='middle'))
+    if drawing.ylabel:
+        out.append(f'<g transform="translate(16,{top + plot_h / 2:.1f}) rotate(-90)">'
+                   + _text(0, 0, drawing.ylabel, drawing.label_size, bold=drawing.label_bold, anchor='middle',
+                           baseline='hanging') + '</g>')
+
+    if drawing.legend:
+        out.append(_legend(drawing, left + plot_w - 10, top + 10))
+    out.append('</svg>')
+    return ''.join(out)
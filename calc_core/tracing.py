@@ -0,0 +1,200 @@
+"""قياس زمن مراحل المسارات الساخنة كمدرجات تكرارية
+
+التفعيل بمتغير البيئة CALC_TRACING=1 (أو enable_tracing). عند الإيقاف
+يعيد trace سياقاً فارغاً مشتركاً وتستدعي الدوال المزخرفة مباشرة، فالكلفة
+تقتصر على فحص علم واحد. النتائج تصدر بصيغة Prometheus النصية عبر
+prometheus_text أو خادم /metrics (CALC_METRICS_PORT)، وكل قياس يضاف
+سطراً في ملف JSONL إذا حدد CALC_TRACE_FILE.
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+# حدود فئات المدرج بالثواني
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class StageHistogram:
+    """مدرج تكراري تراكمي لزمن مرحلة واحدة"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """تقدير الربيع q من حدود الفئات (الحد الأعلى للفئة التي يقع فيها)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+class _Tracer:
+    def __init__(self):
+        self.enabled = os.environ.get('CALC_TRACING', '').lower() in ('1', 'true', 'yes', 'on')
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.jsonl = None
+        path = os.environ.get('CALC_TRACE_FILE')
+        if path:
+            self.open_jsonl(path)
+
+    def open_jsonl(self, path):
+        with self.lock:
+            if self.jsonl is not None:
+                self.jsonl.close()
+            self.jsonl = open(path, 'a', encoding='utf-8', buffering=1)
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = StageHistogram()
+            histogram.observe(seconds)
+            if self.jsonl is not None:
+                self.jsonl.write(json.dumps({'ts': time.time(), 'stage': stage, 'seconds': seconds}) + '\n')
+
+_tracer = _Tracer()
+
+class _Span:
+    """سياق يقيس زمن مرحلة ويسجله عند الخروج"""
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _tracer.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+def trace(stage):
+    """سياق لقياس كتلة: with trace('stage'): ... (سياق فارغ عند الإيقاف)"""
+    return _Span(stage) if _tracer.enabled else _NOOP
+
+def traced(stage):
+    """مزخرف يقيس زمن كل استدعاء للدالة تحت اسم المرحلة stage"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _tracer.observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def tracing_enabled():
+    return _tracer.enabled
+
+def enable_tracing(jsonl_path=None):
+    """تفعيل القياس أثناء التشغيل، مع ملف JSONL اختياري"""
+    if jsonl_path:
+        _tracer.open_jsonl(jsonl_path)
+    _tracer.enabled = True
+
+def disable_tracing():
+    _tracer.enabled = False
+
+def reset_traces():
+    with _tracer.lock:
+        _tracer.histograms.clear()
+
+def trace_stats():
+    """ملخص كل مرحلة: العدد والمجموع والمتوسط والأقصى وتقدير p50 و p95"""
+    with _tracer.lock:
+        return {
+            stage: {
+                'count': h.count, 'total': h.total, 'mean': h.total / h.count, 'max': h.max,
+                'p50': h.quantile(0.5), 'p95': h.quantile(0.95),
+            }
+            for stage, h in sorted(_tracer.histograms.items())
+        }
+
+def prometheus_text(metric='calc_stage_seconds'):
+    """المدرجات بصيغة Prometheus النصية"""
+    lines = [f'# HELP {metric} Latency of instrumented stages in seconds.', f'# TYPE {metric} histogram']
+    with _tracer.lock:
+        for stage, h in sorted(_tracer.histograms.items()):
+            label = stage.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{stage="{label}",le="+Inf"}} {h.count}')
+            lines.append(f'{metric}_sum{{stage="{label}"}} {h.total}')
+            lines.append(f'{metric}_count{{stage="{label}"}} {h.count}')
+    return '\n'.join(lines) + '\n'
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(port=None, host='127.0.0.1'):
+    """تشغيل خادم HTTP صغير يعرض /metrics في خيط خلفي (مرة واحدة للعملية)
+
+    لا يبدأ عند الاستيراد: عمال الرسم يستوردون calc_core أيضاً ولا يجوز أن
+    يحجزوا المنفذ نفسه. main_app يستدعيه مرة واحدة إذا حدد CALC_METRICS_PORT.
+    """
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    port = int(port if port is not None else os.environ.get('CALC_METRICS_PORT', 0))
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        _server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=_server.serve_forever, name='calc-metrics', daemon=True).start()
+        return _server
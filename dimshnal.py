@@ -1,11 +1,29 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection, Line3DCollection
-from math import sqrt, atan, degrees, radians
 import plotly.graph_objects as go
 import plotly.express as px
 
+from calc_core.prism import (
+    calculate_prism_batch,
+    calculate_prism_geometry,
+    edge_polyline,
+    prism_drawing,
+    prism_vertices,
+    triangulate_faces,
+)
+from calc_core.tracing import trace, traced
+from drawing_backends import prism_fast_figure, to_matplotlib
+from figure_cache import FigureCache, shared_disk_cache
+from render_pool import render_png
+from session_budget import session_store, show_session_report
+
+# الحد الأقصى لحجم صور المنشور المخزنة في الذاكرة
+PRISM_CACHE_BYTES = 32 * 1024 * 1024
+
+# ألوان العناصر القابلة للتغيير، بالترتيب الذي تدخل به مفتاح الصورة
+COLOR_ATTRIBUTES = ('ground_color', 'hypotenuse_color', 'angle_color',
+                    'base_color', 'height_color', 'structure_color')
+
 class SlopeAnalysis3D:
     def __init__(self):
         # ألوان محددة للعناصر
@@ -21,117 +39,31 @@ class SlopeAnalysis3D:
         
     def calculate_geometry(self, base, height, depth):
         """حساب الأبعاد الهندسية الأساسية"""
-        hypotenuse = sqrt(base ** 2 + height ** 2)
-        space_diagonal = sqrt(base ** 2 + height ** 2 + depth ** 2)
-        angle_base = degrees(atan(height / base))
-        angle_top = 90 - angle_base
-        volume = 0.5 * base * height * depth
-        
-        self.geometry_data = {
-            'base': base, 'height': height, 'depth': depth,
-            'hypotenuse': hypotenuse, 'space_diagonal': space_diagonal,
-            'angle_base': angle_base, 'angle_top': angle_top,
-            'volume': volume
-        }
+        self.geometry_data = calculate_prism_geometry(base, height, depth)
         return self.geometry_data
     
+    @staticmethod
+    def calculate_batch(base, height=None, depth=None):
+        """حساب أبعاد عدة مناشير دفعة واحدة دون إنشاء كائن لكل منشور"""
+        return calculate_prism_batch(base, height, depth)
+    
+    @traced('dimshnal.plot_matplotlib_3d')
     def plot_matplotlib_3d(self, line_thickness=2):
         """رسم ثلاثي الأبعاد باستخدام matplotlib"""
         if not self.geometry_data:
             return None
-            
-        base = self.geometry_data['base']
-        height = self.geometry_data['height']
-        depth = self.geometry_data['depth']
-        hypotenuse = self.geometry_data['hypotenuse']
-        
-        fig = plt.figure(figsize=(12, 10))
-        ax = fig.add_subplot(111, projection='3d')
-        
-        # 🎨 رسم الأرضية الملونة
-        x_ground = np.linspace(-base * 0.2, base * 1.2, 10)
-        z_ground = np.linspace(-depth * 0.2, depth * 1.2, 10)
-        X, Z = np.meshgrid(x_ground, z_ground)
-        Y = np.zeros_like(X) - height * 0.1
-        
-        ax.plot_surface(X, Y, Z, color=self.ground_color, alpha=0.6, shade=True)
-        
-        # نقاط الهيكل الرئيسية
-        points = [
-            [0, 0, 0],           # P1 - الزاوية الأمامية اليسرى
-            [base, 0, 0],        # P2 - الزاوية الأمامية اليمنى  
-            [base / 2, height, 0], # P3 - القمة الأمامية
-            [0, 0, depth],       # P4 - الزاوية الخلفية اليسرى
-            [base, 0, depth],    # P5 - الزاوية الخلفية اليمنى
-            [base / 2, height, depth] # P6 - القمة الخلفية
-        ]
-        
-        # 🔺 تعريف أوجه المنشور الثلاثي
-        faces = [
-            [points[0], points[1], points[2]],  # الوجه الأمامي (مثلث)
-            [points[3], points[4], points[5]],  # الوجه الخلفي (مثلث)
-            [points[0], points[1], points[4], points[3]],  # القاعدة (مستطيل)
-            [points[1], points[2], points[5], points[4]],  # الوجه الأيمن
-            [points[2], points[0], points[3], points[5]]   # الوجه الأيسر
-        ]
-        
-        # 🎨 رسم الأسطح الرئيسية
-        poly3d = Poly3DCollection(
-            faces,
-            facecolors=[
-                self.structure_color,  # أمامي
-                self.structure_color,  # خلفي  
-                self.base_color,       # قاعدة
-                self.structure_color,  # يمين
-                self.structure_color   # يسار
-            ],
-            linewidths=line_thickness,
-            edgecolors='black',
-            alpha=0.9
-        )
-        ax.add_collection3d(poly3d)
-        
-        # 📏 رسم الوتر (الخط المائل)
-        hypotenuse_lines = [
-            [points[0], points[2]],  # وتر أمامي
-            [points[3], points[5]],  # وتر خلفي
-        ]
-        
-        hyp_collection = Line3DCollection(
-            hypotenuse_lines,
-            colors=[self.hypotenuse_color, self.hypotenuse_color],
-            linewidths=line_thickness + 1,
-            linestyles='-',
-            alpha=1.0
-        )
-        ax.add_collection3d(hyp_collection)
-        
-        # 📐 رسم الزوايا والقياسات
-        self._draw_angle_annotations(ax, base, height)
-        self._add_dimension_labels(ax, points, base, height, depth, hypotenuse)
-        
-        # ⚙️ إعداد المحاور والمظهر
-        margin = max(base, height, depth) * 0.3
-        ax.set_xlim([-margin, base + margin])
-        ax.set_ylim([-margin, height + margin])
-        ax.set_zlim([-margin, depth + margin])
-        
-        ax.set_xlabel('المحور X (الطول)', fontsize=12, labelpad=15, fontweight='bold')
-        ax.set_ylabel('المحور Y (الارتفاع)', fontsize=12, labelpad=15, fontweight='bold')
-        ax.set_zlabel('المحور Z (العمق)', fontsize=12, labelpad=15, fontweight='bold')
-        
-        ax.grid(True, alpha=0.3)
-        ax.set_facecolor('#ffffff')
-        
-        title = f"""الهيكل الثلاثي الأبعاد
-القاعدة: {base}م, الارتفاع: {height}م, العمق: {depth}م
-الوتر: {hypotenuse:.3f}م, الزاوية: {self.geometry_data['angle_base']:.2f}°"""
-        
-        ax.set_title(title, fontsize=14, pad=25, fontweight='bold')
-        
-        plt.tight_layout()
-        return fig
+        colors = {name: getattr(self, name) for name in COLOR_ATTRIBUTES}
+        return to_matplotlib(prism_drawing(self.geometry_data, colors, line_thickness))
+    
+    @traced('dimshnal.plot_fast_3d')
+    def plot_fast_3d(self, line_thickness=2, elev=30.0, azim=-60.0):
+        """رسم سريع ثابت: إسقاط رؤوس المنشور والأرضية مرة واحدة ورسمها كمضلعات ثنائية الأبعاد"""
+        if not self.geometry_data:
+            return None
+        colors = {name: getattr(self, name) for name in COLOR_ATTRIBUTES}
+        return prism_fast_figure(self.geometry_data, colors, line_thickness, elev, azim)
     
+    @traced('dimshnal.plot_plotly_3d')
     def plot_plotly_3d(self):
         """رسم ثلاثي الأبعاد تفاعلي باستخدام Plotly"""
         if not self.geometry_data:
@@ -141,58 +73,30 @@ class SlopeAnalysis3D:
         height = self.geometry_data['height']
         depth = self.geometry_data['depth']
         
-        # تعريف نقاط المنشور الثلاثي
-        vertices = np.array([
-            [0, 0, 0],      # 0
-            [base, 0, 0],   # 1  
-            [base/2, height, 0], # 2
-            [0, 0, depth],  # 3
-            [base, 0, depth], # 4
-            [base/2, height, depth] # 5
-        ])
-        
-        # تعريف الأوجه
-        faces = [
-            [0, 1, 2],  # وجه أمامي
-            [3, 4, 5],  # وجه خلفي
-            [0, 1, 4, 3],  # قاعدة
-            [1, 2, 5, 4],  # وجه أيمن
-            [2, 0, 3, 5]   # وجه أيسر
-        ]
+        # رؤوس المنشور الثلاثي
+        vertices = prism_vertices(base, height, depth)
+        i, j, k = triangulate_faces()
         
         fig = go.Figure()
         
-        # إضافة الأسطح
-        for i, face in enumerate(faces):
-            x = vertices[face, 0]
-            y = vertices[face, 1] 
-            z = vertices[face, 2]
-            
-            fig.add_trace(go.Mesh3d(
-                x=x, y=y, z=z,
-                color=self.structure_color,
-                opacity=0.8,
-                name=f'وجه {i+1}'
-            ))
-        
-        # إضافة الحواف
-        edges = [
-            [0, 1], [1, 2], [2, 0],  # أمامي
-            [3, 4], [4, 5], [5, 3],  # خلفي  
-            [0, 3], [1, 4], [2, 5]   # وصلات
-        ]
+        # جميع الأوجه في شبكة واحدة مقسمة إلى مثلثات
+        fig.add_trace(go.Mesh3d(
+            x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
+            i=i, j=j, k=k,
+            color=self.structure_color,
+            opacity=0.8,
+            flatshading=True,
+            name='الهيكل'
+        ))
         
-        for edge in edges:
-            x = vertices[edge, 0]
-            y = vertices[edge, 1]
-            z = vertices[edge, 2]
-            
-            fig.add_trace(go.Scatter3d(
-                x=x, y=y, z=z,
-                mode='lines',
-                line=dict(color='black', width=4),
-                showlegend=False
-            ))
+        # جميع الحواف في خط واحد
+        edge_x, edge_y, edge_z = edge_polyline(vertices)
+        fig.add_trace(go.Scatter3d(
+            x=edge_x, y=edge_y, z=edge_z,
+            mode='lines',
+            line=dict(color='black', width=4),
+            showlegend=False
+        ))
         
         # إضافة الوتر الملون
         fig.add_trace(go.Scatter3d(
@@ -205,7 +109,9 @@ class SlopeAnalysis3D:
         ))
         
         fig.update_layout(
-            title=f'الهيكل الثلاثي الأبعاد التفاعلي<br>القاعدة: {base}م, الارتفاع: {height}م, العمق: {depth}م',
+            title=self._plotly_title(),
+            # ثبات uirevision يحفظ زاوية الكاميرا والتكبير عند تحديث البيانات
+            uirevision='prism',
             scene=dict(
                 xaxis_title='المحور X (الطول)',
                 yaxis_title='المحور Y (الارتفاع)',
@@ -218,47 +124,118 @@ class SlopeAnalysis3D:
         
         return fig
     
-    def _draw_angle_annotations(self, ax, base, height):
-        """رسم الزوايا والقياسات التوضيحية"""
-        angle_base = self.geometry_data['angle_base']
-        
-        # رسم قوس الزاوية
-        theta = np.linspace(0, radians(angle_base), 30)
-        arc_radius = min(base, height) * 0.3
-        
-        x_arc = arc_radius * np.cos(theta)
-        y_arc = arc_radius * np.sin(theta) 
-        z_arc = np.zeros_like(x_arc)
+    def _plotly_title(self):
+        """عنوان رسم Plotly بالأبعاد الحالية"""
+        base = self.geometry_data['base']
+        height = self.geometry_data['height']
+        depth = self.geometry_data['depth']
+        return f'الهيكل الثلاثي الأبعاد التفاعلي<br>القاعدة: {base}م, الارتفاع: {height}م, العمق: {depth}م'
+
+@st.cache_resource
+def _prism_cache():
+    """ذاكرة صور المنشور المشتركة بين الجلسات، ومحفوظة على القرص"""
+    return FigureCache(max_bytes=PRISM_CACHE_BYTES, disk=shared_disk_cache(), namespace='prism3d')
+
+def render_prism_image(analyzer, line_thickness, fidelity='high'):
+    """صورة PNG لرسم matplotlib الثلاثي الأبعاد، ترسم فقط إذا لم تكن محفوظة
+    
+    fidelity='high' يستخدم mplot3d، و 'fast' يرسم الإسقاط الثنائي الأبعاد السريع.
+    """
+    if not analyzer.geometry_data:
+        return None
+    colors = tuple(getattr(analyzer, name) for name in COLOR_ATTRIBUTES)
+    key = (tuple(analyzer.geometry_data.items()), colors, line_thickness, fidelity)
+    kind = 'prism3d_fast' if fidelity == 'fast' else 'prism3d'
+    return _prism_cache().get_or_render(key, lambda: render_png(kind, {
+        'geometry': dict(analyzer.geometry_data), 'colors': dict(zip(COLOR_ATTRIBUTES, colors)),
+        'line_thickness': line_thickness,
+    }))
+
+@st.fragment
+def _plot_panel(analyzer, line_thickness):
+    """لوحة الرسم: تغيير نوع الرسم أو دقته يعيد تشغيلها وحدها دون النتائج والشرح"""
+    # اختيار نوع الرسم
+    plot_type = st.radio("اختر نوع الرسم:", ["Matplotlib (ثابت)", "Plotly (تفاعلي)"])
+    
+    if plot_type == "Matplotlib (ثابت)":
+        fidelity = st.radio("دقة الرسم:", ["high", "fast"], horizontal=True,
+                            format_func=lambda v: {'high': 'عالية (mplot3d)', 'fast': 'سريعة (إسقاط ثنائي الأبعاد)'}[v])
+        image = render_prism_image(analyzer, line_thickness, fidelity)
+        if image:
+            st.image(image, width="stretch")
+    else:
+        # المفتاح الثابت مع uirevision يحفظان زاوية الكاميرا عند تغيير الأبعاد
+        fig = analyzer.plot_plotly_3d()
+        if fig:
+            # يشمل تسلسل الرسم إلى JSON وإرساله للمتصفح
+            with trace('dimshnal.plotly_chart'):
+                st.plotly_chart(fig, use_container_width=True, key="prism_3d")
+
+@st.fragment
+def _results_panel(geometry_data):
+    """النتائج المحسوبة وتفسيرها، في جزء مستقل عن لوحة الرسم"""
+    # عرض النتائج في بطاقات
+    st.metric("📐 طول الوتر", f"{geometry_data['hypotenuse']:.3f} م")
+    st.metric("📏 القطر الفضائي", f"{geometry_data['space_diagonal']:.3f} م") 
+    st.metric("📊 الزاوية عند القاعدة", f"{geometry_data['angle_base']:.2f}°")
+    st.metric("📈 الزاوية عند القمة", f"{geometry_data['angle_top']:.2f}°")
+    st.metric("🧮 الحجم", f"{geometry_data['volume']:.3f} م³")
+    
+    st.markdown("---")
+    st.markdown("### 📝 تفسير النتائج:")
+    
+    explanations = [
+        f"**الوتر ({geometry_data['hypotenuse']:.3f} م)**: هو الضلع المائل في المثلث، يحسب باستخدام نظرية فيثاغورس: √(القاعدة² + الارتفاع²)",
+        f"**القطر الفضائي ({geometry_data['space_diagonal']:.3f} م)**: هو أطول مسافة داخل المنشور، يحسب: √(القاعدة² + الارتفاع² + العمق²)", 
+        f"**الزاوية ({geometry_data['angle_base']:.2f}°)**: تحسب باستخدام الدالة المثلثية: tan⁻¹(الارتفاع/القاعدة)",
+        f"**الحجم ({geometry_data['volume']:.3f} م³)**: يحسب بضرب مساحة المثلث في العمق: (½ × القاعدة × الارتفاع) × العمق"
+    ]
+    
+    for exp in explanations:
+        st.info(exp)
+
+@st.fragment
+def _explanation_panel():
+    """الشرح التفصيلي للحسابات، في جزء مستقل عن الرسم والنتائج"""
+    st.markdown("---")
+    st.markdown('<h2 class="section-header">📚 الشرح التفصيلي للحسابات</h2>', unsafe_allow_html=True)
+    
+    with st.expander("🔍 كيف تم حساب الأبعاد والزوايا؟", expanded=True):
+        st.markdown("""
+        ### 📐 الحسابات الهندسية المستخدمة:
         
-        ax.plot(x_arc, y_arc, z_arc, color=self.angle_color, 
-                linewidth=3, alpha=0.8)
+        **1. حساب الوتر (الضلع المائل):**
+        ```
+        الوتر = √(القاعدة² + الارتفاع²)
+        المثال: √(10² + 7²) = √(100 + 49) = √149 ≈ 12.206 م
+        ```
         
-        # نص الزاوية
-        ax.text(arc_radius * 0.7, arc_radius * 0.3, 0,
-                f'θ = {angle_base:.1f}°', fontsize=11, 
-                color=self.angle_color, fontweight='bold',
-                bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7))
-    
-    def _add_dimension_labels(self, ax, points, base, height, depth, hypotenuse):
-        """إضافة تسميات الأبعاد على الرسم"""
+        **2. حساب الزاوية عند القاعدة:**
+        ```
+        الزاوية = tan⁻¹(الارتفاع / القاعدة)  
+        المثال: tan⁻¹(7 / 10) = tan⁻¹(0.7) ≈ 35.0°
+        ```
         
-        # تسمية النقاط
-        labels = ['P1', 'P2', 'P3', 'P4', 'P5', 'P6']
-        for i, point in enumerate(points):
-            ax.text(point[0], point[1], point[2], labels[i],
-                   fontsize=10, color='darkred', fontweight='bold')
+        **3. حساب القطر الفضائي:**
+        ```
+        القطر_الفضائي = √(القاعدة² + الارتفاع² + العمق²)
+        المثال: √(10² + 7² + 12²) = √(100 + 49 + 144) = √293 ≈ 17.117 م
+        ```
         
-        # تسمية الأبعاد الرئيسية
-        dimension_texts = [
-            [base/2, -height*0.15, -depth*0.1, f'القاعدة: {base:.1f}م', self.base_color],
-            [-base*0.2, height/2, -depth*0.1, f'الارتفاع: {height:.1f}م', self.height_color],
-            [base*1.1, height/2, depth/2, f'العمق: {depth:.1f}م', 'blue'],
-            [base/4, height/3, 0, f'الوتر: {hypotenuse:.2f}م', self.hypotenuse_color]
-        ]
+        **4. حساب الحجم:**
+        ```
+        الحجم = (½ × القاعدة × الارتفاع) × العمق
+        المثال: (0.5 × 10 × 7) × 12 = 35 × 12 = 420 م³
+        ```
         
-        for x, y, z, text, color in dimension_texts:
-            ax.text(x, y, z, text, fontsize=11, color=color, fontweight='bold',
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
+        ### 🎨 تفسير الألوان في الرسم:
+        - **🟢 لون الأرض**: يظهر السطح الذي يرتكز عليه الهيكل
+        - **🔵 لون القاعدة**: يمثل الضلع الأفقي السفلي  
+        - **🟣 لون الارتفاع**: يمثل الضلع الرأسي
+        - **🟠 لون الوتر**: يمثل الضلع المائل (الوتر)
+        - **🟡 لون الزوايا**: يظهر قياسات الزوايا
+        - **🔶 لون الهيكل**: لون الأسطح الجانبية للمنشور
+        """)
 
 def main():
     st.set_page_config(
@@ -290,6 +267,7 @@ def main():
     
     # إنشاء كائن التحليل
     analyzer = SlopeAnalysis3D()
+    store = session_store()
     
     # 📐 الشريط الجانبي للإدخالات
     with st.sidebar:
@@ -329,82 +307,19 @@ def main():
         # حساب الهندسة
         geometry_data = analyzer.calculate_geometry(base, height, depth)
         
-        # اختيار نوع الرسم
-        plot_type = st.radio("اختر نوع الرسم:", ["Matplotlib (ثابت)", "Plotly (تفاعلي)"])
-        
-        if plot_type == "Matplotlib (ثابت)":
-            fig = analyzer.plot_matplotlib_3d(line_thickness)
-            if fig:
-                st.pyplot(fig)
-        else:
-            fig = analyzer.plot_plotly_3d() 
-            if fig:
-                st.plotly_chart(fig, use_container_width=True)
+        _plot_panel(analyzer, line_thickness)
     
     with col2:
         st.markdown('<h2 class="section-header">📊 النتائج المحسوبة</h2>', unsafe_allow_html=True)
         
         if geometry_data:
-            # عرض النتائج في بطاقات
-            st.metric("📐 طول الوتر", f"{geometry_data['hypotenuse']:.3f} م")
-            st.metric("📏 القطر الفضائي", f"{geometry_data['space_diagonal']:.3f} م") 
-            st.metric("📊 الزاوية عند القاعدة", f"{geometry_data['angle_base']:.2f}°")
-            st.metric("📈 الزاوية عند القمة", f"{geometry_data['angle_top']:.2f}°")
-            st.metric("🧮 الحجم", f"{geometry_data['volume']:.3f} م³")
-            
-            st.markdown("---")
-            st.markdown("### 📝 تفسير النتائج:")
-            
-            explanations = [
-                f"**الوتر ({geometry_data['hypotenuse']:.3f} م)**: هو الضلع المائل في المثلث، يحسب باستخدام نظرية فيثاغورس: √(القاعدة² + الارتفاع²)",
-                f"**القطر الفضائي ({geometry_data['space_diagonal']:.3f} م)**: هو أطول مسافة داخل المنشور، يحسب: √(القاعدة² + الارتفاع² + العمق²)", 
-                f"**الزاوية ({geometry_data['angle_base']:.2f}°)**: تحسب باستخدام الدالة المثلثية: tan⁻¹(الارتفاع/القاعدة)",
-                f"**الحجم ({geometry_data['volume']:.3f} م³)**: يحسب بضرب مساحة المثلث في العمق: (½ × القاعدة × الارتفاع) × العمق"
-            ]
-            
-            for exp in explanations:
-                st.info(exp)
+            _results_panel(geometry_data)
     
     # 📚 قسم الشرح التفصيلي
-    st.markdown("---")
-    st.markdown('<h2 class="section-header">📚 الشرح التفصيلي للحسابات</h2>', unsafe_allow_html=True)
+    _explanation_panel()
     
-    with st.expander("🔍 كيف تم حساب الأبعاد والزوايا؟", expanded=True):
-        st.markdown("""
-        ### 📐 الحسابات الهندسية المستخدمة:
-        
-        **1. حساب الوتر (الضلع المائل):**
-        ```
-        الوتر = √(القاعدة² + الارتفاع²)
-        المثال: √(10² + 7²) = √(100 + 49) = √149 ≈ 12.206 م
-        ```
-        
-        **2. حساب الزاوية عند القاعدة:**
-        ```
-        الزاوية = tan⁻¹(الارتفاع / القاعدة)  
-        المثال: tan⁻¹(7 / 10) = tan⁻¹(0.7) ≈ 35.0°
-        ```
-        
-        **3. حساب القطر الفضائي:**
-        ```
-        القطر_الفضائي = √(القاعدة² + الارتفاع² + العمق²)
-        المثال: √(10² + 7² + 12²) = √(100 + 49 + 144) = √293 ≈ 17.117 م
-        ```
-        
-        **4. حساب الحجم:**
-        ```
-        الحجم = (½ × القاعدة × الارتفاع) × العمق
-        المثال: (0.5 × 10 × 7) × 12 = 35 × 12 = 420 م³
-        ```
-        
-        ### 🎨 تفسير الألوان في الرسم:
-        - **🟢 لون الأرض**: يظهر السطح الذي يرتكز عليه الهيكل
-        - **🔵 لون القاعدة**: يمثل الضلع الأفقي السفلي  
-        - **🟣 لون الارتفاع**: يمثل الضلع الرأسي
-        - **🟠 لون الوتر**: يمثل الضلع المائل (الوتر)
-        - **🟡 لون الزوايا**: يظهر قياسات الزوايا
-        - **🔶 لون الهيكل**: لون الأسطح الجانبية للمنشور
-        """)
+    with st.sidebar:
+        show_session_report(store)
 
 if __name__ == "__main__":
     main()
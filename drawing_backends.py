@@ -0,0 +1,365 @@
+import math
+
+import numpy as np
+from matplotlib.colors import to_hex, to_rgba
+
+from calc_core.drawing import Arc, Area, Callout, Label, Markers, Path
+from calc_core.prism import PRISM_COLORS, PRISM_FACES, prism_vertices, project_points
+from calc_core.svg import to_svg
+from calc_core.tracing import traced
+from figure_cache import figure_to_png
+from figure_pool import FIGURE_POOL
+
+# عدد نقاط تقريب القوس في الواجهات التي لا تدعم الأقواس
+ARC_SEGMENTS = 30
+
+LINE_STYLES = {'solid': '-', 'dashed': '--'}
+
+def arc_points(arc, segments=ARC_SEGMENTS):
+    """نقاط القوس على محيط الدائرة"""
+    theta = np.linspace(math.radians(arc.start), math.radians(arc.end), segments)
+    return arc.center[0] + arc.radius * np.cos(theta), arc.center[1] + arc.radius * np.sin(theta)
+
+def _columns(points):
+    return tuple(zip(*points))
+
+# ---------------------------------------------------------------- matplotlib
+
+def _text_options(size, color, bold, background, background_alpha, padding):
+    options = {'fontsize': size, 'color': color}
+    if bold:
+        options['fontweight'] = 'bold'
+    if background is not None:
+        options['bbox'] = dict(boxstyle=f"round,pad={padding}", facecolor=background, alpha=background_alpha)
+    return options
+
+def _mpl_label(ax, label, three_d):
+    options = _text_options(label.size, label.color, label.bold, label.background,
+                            label.background_alpha, label.padding)
+    options.update(ha=label.align, va=label.valign)
+    if three_d:
+        ax.text(*label.position, label.text, **options)
+    elif label.coords == 'axes':
+        ax.text(*label.position, label.text, transform=ax.transAxes, **options)
+    elif any(label.offset):
+        ax.annotate(label.text, label.position, xytext=label.offset, textcoords='offset points', **options)
+    else:
+        ax.text(*label.position, label.text, **options)
+
+@traced('drawing.matplotlib')
+def to_matplotlib(drawing):
+    """تحويل الوصف إلى رسم matplotlib من مخزون الرسومات"""
+    three_d = drawing.dims == 3
+    if three_d:
+        # mplot3d يستورد للرسوم الثلاثية الأبعاد فقط (ويسجل إسقاط '3d')
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+    fig = FIGURE_POOL.acquire(drawing.size)
+    ax = fig.add_subplot(111, projection='3d') if three_d else fig.subplots()
+
+    # الأوجه الثلاثية الأبعاد ترسم معاً حتى يرتبها mplot3d حسب العمق
+    faces = []
+    for item in drawing.elements:
+        if isinstance(item, Path):
+            ax.plot(*_columns(item.points), color=item.color, linewidth=item.width,
+                    linestyle=LINE_STYLES[item.style], alpha=item.alpha, label=item.label,
+                    marker='o' if item.marker_size else None, markersize=item.marker_size)
+        elif isinstance(item, Markers):
+            ax.plot(*_columns(item.points), 'o', linestyle='none', color=item.color, markersize=item.size,
+                    markeredgecolor=item.edge_color or item.color, markeredgewidth=item.edge_width)
+        elif isinstance(item, Area) and three_d:
+            faces.append(item)
+        elif isinstance(item, Area):
+            ax.fill(*_columns(item.points), facecolor=item.fill, alpha=item.alpha,
+                    edgecolor=item.edge_color or 'none', linewidth=item.edge_width, label=item.label)
+        elif isinstance(item, Label):
+            _mpl_label(ax, item, three_d)
+        elif isinstance(item, Callout):
+            options = _text_options(item.size, 'black', True, item.color, item.background_alpha, item.padding)
+            ax.annotate(item.text, xy=item.target, xytext=item.position, textcoords='data', ha='center',
+                        arrowprops=dict(arrowstyle=item.arrow, color=item.color, lw=item.arrow_width),
+                        **options)
+        elif isinstance(item, Arc):
+            ax.plot(*arc_points(item), color=item.color, linewidth=item.width, alpha=item.alpha)
+    if faces:
+        ax.add_collection3d(Poly3DCollection(
+            [face.points for face in faces],
+            facecolors=[to_rgba(face.fill, face.alpha) for face in faces],
+            edgecolors=[face.edge_color or 'none' for face in faces],
+            linewidths=[face.edge_width for face in faces],
+        ))
+
+    if drawing.xlim:
+        ax.set_xlim(drawing.xlim)
+    if drawing.ylim:
+        ax.set_ylim(drawing.ylim)
+    if three_d and drawing.zlim:
+        ax.set_zlim(drawing.zlim)
+    if drawing.equal and not three_d:
+        ax.set_aspect('equal')
+    if drawing.grid:
+        ax.grid(True, alpha=0.3, linestyle=LINE_STYLES[drawing.grid_style])
+    ax.set_facecolor(drawing.background)
+
+    ax.set_title(drawing.title, fontsize=drawing.title_size, fontweight='bold', pad=drawing.title_pad)
+    label_options = {'fontsize': drawing.label_size}
+    if drawing.label_bold:
+        label_options['fontweight'] = 'bold'
+    if drawing.label_pad is not None:
+        label_options['labelpad'] = drawing.label_pad
+    ax.set_xlabel(drawing.xlabel, **label_options)
+    ax.set_ylabel(drawing.ylabel, **label_options)
+    if three_d:
+        ax.set_zlabel(drawing.zlabel, **label_options)
+
+    if drawing.legend == 'below':
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.1), ncol=3, fontsize=12, framealpha=0.9)
+    elif drawing.legend:
+        ax.legend()
+
+    fig.tight_layout()
+    return fig
+
+def drawing_png(drawing):
+    """صورة PNG للوصف عبر matplotlib (تستدعى أيضاً في عمال الرسم)"""
+    return figure_to_png(to_matplotlib(drawing))
+
+@traced('drawing.prism_fast')
+def prism_fast_figure(geometry, colors=None, line_thickness=2, elev=30.0, azim=-60.0):
+    """رسم سريع ثابت للمنشور: إسقاط رؤوسه والأرضية مرة واحدة ورسمها كمضلعات ثنائية الأبعاد"""
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.patches import Polygon
+
+    colors = {**PRISM_COLORS, **(colors or {})}
+    base = geometry['base']
+    height = geometry['height']
+    depth = geometry['depth']
+    hypotenuse = geometry['hypotenuse']
+
+    # جميع النقاط المطلوبة في مصفوفة واحدة: رؤوس المنشور ثم أركان الأرضية ثم قوس الزاوية
+    vertices = prism_vertices(base, height, depth)
+    ground = np.array([
+        [-base * 0.2, -height * 0.1, -depth * 0.2],
+        [base * 1.2, -height * 0.1, -depth * 0.2],
+        [base * 1.2, -height * 0.1, depth * 1.2],
+        [-base * 0.2, -height * 0.1, depth * 1.2],
+    ])
+    theta = np.linspace(0, math.radians(geometry['angle_base']), 30)
+    arc_radius = min(base, height) * 0.3
+    arc = np.column_stack([arc_radius * np.cos(theta), arc_radius * np.sin(theta), np.zeros_like(theta)])
+
+    points_2d, point_depth = project_points(np.vstack([vertices, ground, arc]), elev, azim)
+    vertices_2d, ground_2d, arc_2d = points_2d[:6], points_2d[6:10], points_2d[10:]
+    vertex_depth = point_depth[:6]
+
+    fig = FIGURE_POOL.acquire((12, 10))
+    ax = fig.subplots()
+
+    # 🎨 الأرضية أولاً ثم الأوجه من الأبعد إلى الأقرب
+    ax.add_patch(Polygon(ground_2d, closed=True, facecolor=colors['ground_color'], alpha=0.6, edgecolor='none'))
+
+    face_colors = [colors['structure_color'], colors['structure_color'], colors['base_color'],
+                   colors['structure_color'], colors['structure_color']]
+    order = np.argsort([vertex_depth[list(face)].mean() for face in PRISM_FACES])
+    ax.add_collection(PolyCollection(
+        [vertices_2d[list(PRISM_FACES[n])] for n in order],
+        facecolors=[face_colors[n] for n in order],
+        edgecolors='black', linewidths=line_thickness, alpha=0.9
+    ))
+
+    # 📏 الوتر الأمامي والخلفي
+    ax.add_collection(LineCollection(
+        [vertices_2d[[0, 2]], vertices_2d[[3, 5]]],
+        colors=colors['hypotenuse_color'], linewidths=line_thickness + 1
+    ))
+
+    # 📐 قوس الزاوية والتسميات في مواضعها المسقطة
+    ax.plot(arc_2d[:, 0], arc_2d[:, 1], color=colors['angle_color'], linewidth=3, alpha=0.8)
+    labels_3d = np.array([
+        [arc_radius * 0.7, arc_radius * 0.3, 0],
+        [base / 2, -height * 0.15, -depth * 0.1],
+        [-base * 0.2, height / 2, -depth * 0.1],
+        [base * 1.1, height / 2, depth / 2],
+        [base / 4, height / 3, 0],
+    ])
+    labels_2d, _ = project_points(labels_3d, elev, azim)
+    label_texts = [
+        (f'θ = {geometry["angle_base"]:.1f}°', colors['angle_color'], 'yellow'),
+        (f'القاعدة: {base:.1f}م', colors['base_color'], 'white'),
+        (f'الارتفاع: {height:.1f}م', colors['height_color'], 'white'),
+        (f'العمق: {depth:.1f}م', 'blue', 'white'),
+        (f'الوتر: {hypotenuse:.2f}م', colors['hypotenuse_color'], 'white'),
+    ]
+    for (x, y), (text, color, background) in zip(labels_2d, label_texts):
+        ax.text(x, y, text, fontsize=11, color=color, fontweight='bold',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor=background, alpha=0.8))
+    for i, (x, y) in enumerate(vertices_2d):
+        ax.text(x, y, f'P{i + 1}', fontsize=10, color='darkred', fontweight='bold')
+
+    # ⚙️ إعداد المحاور والمظهر
+    ax.set_aspect('equal')
+    ax.autoscale_view()
+    ax.axis('off')
+    ax.set_title(f"""الهيكل الثلاثي الأبعاد
+القاعدة: {base}م, الارتفاع: {height}م, العمق: {depth}م
+الوتر: {hypotenuse:.3f}م, الزاوية: {geometry['angle_base']:.2f}°""",
+                 fontsize=14, pad=25, fontweight='bold')
+
+    fig.tight_layout()
+    return fig
+
+def prism_fast_png(geometry, colors=None, line_thickness=2):
+    """صورة PNG للرسم السريع للمنشور (تستدعى أيضاً في عمال الرسم)"""
+    return figure_to_png(prism_fast_figure(geometry, colors, line_thickness))
+
+# ---------------------------------------------------------------- Plotly
+
+def _plotly_color(color, alpha=1.0):
+    r, g, b, a = to_rgba(color, alpha)
+    return f'rgba({r * 255:.0f},{g * 255:.0f},{b * 255:.0f},{a:.3g})'
+
+def _plotly_annotation(label, three_d):
+    annotation = dict(
+        text=label.text.replace('\n', '<br>'), showarrow=False,
+        font=dict(size=label.size * 1.2, color=to_hex(label.color)),
+        xanchor={'left': 'left', 'center': 'center', 'right': 'right'}[label.align],
+        yanchor='top' if label.valign == 'top' else 'bottom',
+    )
+    if label.background is not None:
+        annotation['bgcolor'] = _plotly_color(label.background, label.background_alpha)
+    if three_d:
+        annotation.update(x=label.position[0], y=label.position[1], z=label.position[2])
+    else:
+        annotation.update(x=label.position[0], y=label.position[1],
+                          xshift=label.offset[0] * 1.33, yshift=label.offset[1] * 1.33)
+        if label.coords == 'axes':
+            annotation.update(xref='paper', yref='paper')
+    return annotation
+
+@traced('drawing.plotly')
+def to_plotly(drawing):
+    """تحويل الوصف إلى رسم Plotly تفاعلي"""
+    import plotly.graph_objects as go
+
+    three_d = drawing.dims == 3
+    scatter = go.Scatter3d if three_d else go.Scatter
+    fig = go.Figure()
+    annotations = []
+    faces = []
+
+    for item in drawing.elements:
+        if isinstance(item, Path):
+            fig.add_trace(scatter(
+                **dict(zip('xyz', _columns(item.points))), opacity=item.alpha,
+                mode='lines+markers' if item.marker_size else 'lines',
+                marker=dict(color=item.color, size=item.marker_size),
+                line=dict(color=item.color, width=item.width * 1.33,
+                          dash='dash' if item.style == 'dashed' else 'solid'),
+                name=item.label, showlegend=item.label is not None,
+            ))
+        elif isinstance(item, Markers):
+            fig.add_trace(scatter(
+                **dict(zip('xyz', _columns(item.points))), mode='markers', showlegend=False,
+                marker=dict(color=item.color, size=item.size,
+                            line=dict(color=item.edge_color or item.color, width=item.edge_width)),
+            ))
+        elif isinstance(item, Area) and three_d:
+            faces.append(item)
+        elif isinstance(item, Area):
+            xs, ys = _columns(item.points)
+            fig.add_trace(go.Scatter(
+                x=xs + xs[:1], y=ys + ys[:1], mode='lines', fill='toself',
+                fillcolor=_plotly_color(item.fill, item.alpha),
+                line=dict(color=item.edge_color or 'rgba(0,0,0,0)', width=item.edge_width),
+                name=item.label, showlegend=item.label is not None,
+            ))
+        elif isinstance(item, Label):
+            annotations.append(_plotly_annotation(item, three_d))
+        elif isinstance(item, Callout):
+            annotations.append(dict(
+                x=item.target[0], y=item.target[1], ax=item.position[0], ay=item.position[1],
+                axref='x', ayref='y', text=item.text, showarrow=True, arrowhead=2, arrowwidth=item.arrow_width,
+                arrowcolor=item.color, arrowside='end+start' if item.arrow == '<->' else 'end',
+                bgcolor=_plotly_color(item.color, item.background_alpha), font=dict(size=item.size * 1.2),
+            ))
+        elif isinstance(item, Arc):
+            xs, ys = arc_points(item)
+            fig.add_trace(go.Scatter(x=xs, y=ys, mode='lines', opacity=item.alpha, showlegend=False,
+                                     line=dict(color=item.color, width=item.width * 1.33)))
+
+    if faces:
+        _plotly_faces(fig, faces)
+
+    layout = dict(
+        title=drawing.title.replace('\n', '<br>'),
+        width=int(drawing.size[0] * 60), height=int(drawing.size[1] * 60),
+        showlegend=bool(drawing.legend),
+    )
+    if drawing.legend == 'below':
+        layout['legend'] = dict(orientation='h', x=0.5, xanchor='center', y=-0.15)
+    if three_d:
+        layout['scene'] = dict(
+            xaxis=dict(title=drawing.xlabel, range=drawing.xlim),
+            yaxis=dict(title=drawing.ylabel, range=drawing.ylim),
+            zaxis=dict(title=drawing.zlabel, range=drawing.zlim),
+            aspectmode='data', annotations=annotations,
+        )
+    else:
+        layout.update(
+            xaxis=dict(title=drawing.xlabel, range=drawing.xlim, showgrid=drawing.grid),
+            yaxis=dict(title=drawing.ylabel, range=drawing.ylim, showgrid=drawing.grid,
+                       **({'scaleanchor': 'x', 'scaleratio': 1} if drawing.equal else {})),
+            plot_bgcolor=drawing.background, annotations=annotations,
+        )
+    fig.update_layout(**layout)
+    return fig
+
+def _plotly_faces(fig, faces):
+    """الأوجه كشبكة Mesh3d لكل درجة شفافية، وحوافها في خط واحد"""
+    import plotly.graph_objects as go
+
+    by_alpha = {}
+    for face in faces:
+        by_alpha.setdefault(face.alpha, []).append(face)
+    for alpha, group in by_alpha.items():
+        vertices, i, j, k, colors = [], [], [], [], []
+        for face in group:
+            start = len(vertices)
+            vertices.extend(face.points)
+            for n in range(1, len(face.points) - 1):
+                i.append(start)
+                j.append(start + n)
+                k.append(start + n + 1)
+                colors.append(to_hex(face.fill))
+        x, y, z = _columns(vertices)
+        fig.add_trace(go.Mesh3d(x=x, y=y, z=z, i=i, j=j, k=k, facecolor=colors, opacity=alpha,
+                                flatshading=True, showlegend=False))
+
+    edges = [face for face in faces if face.edge_color]
+    if edges:
+        xs, ys, zs = [], [], []
+        for face in edges:
+            for x, y, z in face.points + face.points[:1]:
+                xs.append(x)
+                ys.append(y)
+                zs.append(z)
+            xs.append(None)
+            ys.append(None)
+            zs.append(None)
+        fig.add_trace(go.Scatter3d(x=xs, y=ys, z=zs, mode='lines', showlegend=False,
+                                   line=dict(color=edges[0].edge_color, width=edges[0].edge_width * 1.33)))
+
+# اسم الواجهة -> دالة تعيد الناتج من الوصف
+BACKENDS = {
+    'matplotlib': to_matplotlib,
+    'png': drawing_png,
+    'plotly': to_plotly,
+    'svg': to_svg,
+}
+
+def render_drawing(drawing, backend='png'):
+    """تحويل الوصف بالواجهة المطلوبة"""
+    try:
+        function = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"واجهة رسم غير معروفة: {backend}") from None
+    return function(drawing)
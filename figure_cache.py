@@ -0,0 +1,205 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import matplotlib
+
+from assets import write_atomic
+from calc_core.memo import normalize_key
+from calc_core.tracing import trace
+from figure_pool import FIGURE_POOL
+
+RENDER_CACHE_DIR = os.environ.get('CALC_RENDER_CACHE_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '.cache', 'renders'
+)
+RENDER_CACHE_BYTES = 256 * 1024 * 1024
+# يرفع عند تغيير كود الرسم حتى لا تستخدم الصور المحفوظة القديمة على القرص
+RENDER_CACHE_VERSION = '2'
+
+# إعدادات matplotlib التي تغير شكل الصورة، تدخل في مفتاح الذاكرة الدائمة
+STYLE_PARAMS = (
+    'font.family', 'font.size', 'font.weight', 'axes.titlesize',
+    'axes.titleweight', 'axes.labelsize', 'figure.facecolor',
+)
+
+# إعدادات الحفظ نفسها التي يستخدمها st.pyplot
+PNG_SAVE_OPTIONS = {'format': 'png', 'dpi': 200, 'bbox_inches': 'tight'}
+
+def figure_to_png(fig, **options):
+    """تحويل الرسم إلى صورة PNG ثم إعادته إلى مخزون الرسومات"""
+    buf = io.BytesIO()
+    with FIGURE_POOL.closing(fig), trace('render.png_encode'):
+        fig.savefig(buf, **{**PNG_SAVE_OPTIONS, **options})
+    return buf.getvalue()
+
+def style_fingerprint():
+    """بصمة نمط الرسم الحالي: إصدار matplotlib وإعدادات الخطوط والألوان"""
+    return (matplotlib.__version__,) + tuple(str(matplotlib.rcParams[name]) for name in STYLE_PARAMS)
+
+class DiskRenderCache:
+    """ذاكرة دائمة للصور على القرص، عنوان كل ملف بصمة SHA-256 لمفتاحه
+    
+    تبقى الصور بعد إعادة تشغيل العملية. الكتابة ذرية، ووقت تعديل الملف
+    يحدث عند كل قراءة ليكون الحذف عند تجاوز الحجم للأقدم استخداماً.
+    """
+    
+    def __init__(self, directory=RENDER_CACHE_DIR, max_bytes=RENDER_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+    
+    def path_for(self, key, fmt='png'):
+        """مسار ملف الصورة للمفتاح وإصدار كود الرسم ونمط الرسم الحالي"""
+        # توحيد الأرقام حتى يعطي 40 و 40.0 و np.float64(40) الملف نفسه
+        fingerprint = (normalize_key(key), RENDER_CACHE_VERSION, style_fingerprint())
+        digest = hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], f'{digest}.{fmt}')
+    
+    def get(self, key, fmt='png'):
+        path = self.path_for(key, fmt)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+    
+    def put(self, key, data, fmt='png'):
+        path = self.path_for(key, fmt)
+        try:
+            # الكتابة فوق ملف موجود تستبدل حجمه ولا تضيف إليه
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        try:
+            write_atomic(path, data)
+        except OSError:
+            return
+        with self._lock:
+            self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+    
+    def _entries(self):
+        """جميع الملفات المخزنة: (المسار، الحجم، وقت آخر استخدام)"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith('.tmp-'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, info.st_size, info.st_mtime))
+        return entries
+    
+    def _evict(self):
+        """حذف الأقدم استخداماً حتى يعود الحجم إلى 90% من الحد"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
+    
+    def stats(self):
+        return {'bytes': self._total_bytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses}
+
+_shared_disk_cache = None
+_shared_disk_lock = threading.Lock()
+
+def shared_disk_cache():
+    """ذاكرة القرص المشتركة للعملية"""
+    global _shared_disk_cache
+    with _shared_disk_lock:
+        if _shared_disk_cache is None:
+            _shared_disk_cache = DiskRenderCache()
+        return _shared_disk_cache
+
+class FigureCache:
+    """ذاكرة مؤقتة LRU للصور المرسومة محدودة بإجمالي حجمها بالبايت
+    
+    المفتاح يصف الرسم بالكامل (الأبعاد والعنوان والخيارات)، والقيمة بايتات
+    الصورة. عند تجاوز الحد تحذف الصور الأقدم استخداماً أولاً. إذا أعطيت
+    ذاكرة قرص disk فإنها تستشار عند الإخفاق وتحفظ فيها كل صورة جديدة، مع
+    اسم namespace يميز نوع الرسم.
+    """
+    
+    def __init__(self, max_bytes=32 * 1024 * 1024, disk=None, namespace=''):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.namespace = namespace
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """إرجاع الصورة المخزنة أو None"""
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+    
+    def put(self, key, data):
+        """تخزين صورة وحذف الأقدم استخداماً حتى يعود الحجم تحت الحد"""
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old)
+            self._items[key] = data
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.total_bytes -= len(evicted)
+    
+    def get_or_render(self, key, render):
+        """إرجاع الصورة المخزنة، أو رسمها بالدالة render وتخزينها"""
+        data = self.get(key)
+        if data is None and self.disk is not None:
+            data = self.disk.get((self.namespace, key))
+            if data is not None:
+                self.put(key, data)
+        if data is None:
+            data = render()
+            self.put(key, data)
+            if self.disk is not None:
+                self.disk.put((self.namespace, key), data)
+        return data
+    
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+    
+    def stats(self):
+        """إحصاءات الذاكرة المؤقتة"""
+        with self._lock:
+            return {
+                'items': len(self._items), 'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses,
+            }
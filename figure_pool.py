@@ -0,0 +1,100 @@
+import contextlib
+import os
+import resource
+import sys
+import threading
+import weakref
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+def rss_bytes():
+    """الذاكرة المقيمة الحالية للعملية بالبايت"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        # بديل للأنظمة بدون /proc: أقصى ذاكرة مقيمة (بالكيلوبايت على Linux وبالبايت على macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+class FigurePool:
+    """إدارة دورة حياة رسومات matplotlib المشتركة بين الصفحات
+    
+    الرسومات تنشأ خارج pyplot فلا تتراكم في قائمة رسوماته بين إعادات
+    التشغيل، وتعاد بعد العرض عبر release لتمسح وتستخدم من جديد بنفس
+    المقاس، أو تترك لجامع القمامة إذا امتلأ المخزون. الرسومات المستخدمة
+    محفوظة بمراجع ضعيفة: رسم لم يعد (خطأ قبل release) يخرج من العدد عندما
+    يجمعه جامع القمامة، ولا يختلط برسم جديد يأخذ نفس id.
+    """
+    
+    def __init__(self, max_idle_per_size=2):
+        self.max_idle_per_size = max_idle_per_size
+        self.created = 0
+        self.reused = 0
+        self._idle = {}
+        self._in_use = weakref.WeakSet()
+        self._lock = threading.Lock()
+    
+    def acquire(self, figsize):
+        """الحصول على رسم فارغ بالمقاس المطلوب"""
+        figsize = tuple(figsize)
+        with self._lock:
+            idle = self._idle.get(figsize)
+            if idle:
+                fig = idle.pop()
+                self.reused += 1
+            else:
+                fig = None
+                self.created += 1
+        if fig is None:
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+        with self._lock:
+            self._in_use.add(fig)
+        return fig
+    
+    def release(self, fig):
+        """إعادة الرسم بعد عرضه، أو إغلاقه إن كان من pyplot"""
+        if fig is None:
+            return
+        if plt.fignum_exists(getattr(fig, 'number', None)):
+            plt.close(fig)
+            return
+        fig.clear()
+        figsize = tuple(fig.get_size_inches())
+        with self._lock:
+            if fig not in self._in_use:
+                return
+            self._in_use.discard(fig)
+            idle = self._idle.setdefault(figsize, [])
+            if len(idle) < self.max_idle_per_size:
+                idle.append(fig)
+    
+    @contextlib.contextmanager
+    def closing(self, fig):
+        """إعادة الرسم إلى المخزون عند الخروج حتى لو حدث خطأ أثناء العرض"""
+        try:
+            yield fig
+        finally:
+            self.release(fig)
+    
+    def live_count(self):
+        """عدد الرسومات الحية: المستخدمة من المخزون والمفتوحة في pyplot"""
+        with self._lock:
+            in_use = len(self._in_use)
+        return in_use + len(plt.get_fignums())
+    
+    def stats(self):
+        """مقاييس المخزون والذاكرة"""
+        with self._lock:
+            in_use = len(self._in_use)
+            idle = sum(len(figs) for figs in self._idle.values())
+        return {
+            'in_use': in_use, 'idle': idle, 'pyplot_open': len(plt.get_fignums()),
+            'created': self.created, 'reused': self.reused, 'rss_bytes': rss_bytes(),
+        }
+
+# مخزون واحد للعملية تستخدمه جميع الصفحات
+FIGURE_POOL = FigurePool()
@@ -1,75 +1,70 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import quad, simpson
+import matplotlib
 import io
 import base64
+from PIL import Image
 
-class LandAreaCalculator:
-    def __init__(self, lengths, widths):
-        self.lengths = lengths
-        self.widths = widths
-        self.areas = {}
-    
-    def calculate_all_methods(self):
-        """حساب المساحة بجميع الطرق"""
-        # طريقة شبه المنحرف
-        self.areas['طريقة شبه المنحرف'] = np.trapz(self.widths, self.lengths)
-        
-        # طريقة سمبسون
-        self.areas['طريقة سمبسون'] = simpson(self.widths, self.lengths)
-        
-        # طريقة التكامل العددي
-        def width_function(l):
-            return np.interp(l, self.lengths, self.widths)
-        
-        integral_area, error = quad(width_function, min(self.lengths), max(self.lengths))
-        self.areas['طريقة التكامل'] = integral_area
-        
-        # طريقة التقسيم إلى أجزاء
-        total_area = 0
-        for i in range(len(self.lengths) - 1):
-            avg_width = (self.widths[i] + self.widths[i + 1]) / 2
-            segment_length = self.lengths[i + 1] - self.lengths[i]
-            total_area += avg_width * segment_length
-        self.areas['طريقة التقسيم'] = total_area
-        
-        return self.areas
+from calc_core.area import (
+    LandAreaCalculator as BaseLandAreaCalculator,
+    INTEGRATION_BACKENDS,
+    INTERPOLATIONS,
+    land_drawing,
+    stream_survey_areas,
+)
+from calc_core.svg import RENDER_FORMATS, to_svg
+from calc_core.tracing import trace, traced
+from drawing_backends import to_matplotlib
+from figure_cache import FigureCache, shared_disk_cache
+from figure_pool import FIGURE_POOL
+from assets import load_asset
+from render_pool import render_png
+from rerun_stats import finish_rerun, show_rerun_report, start_rerun, triggered_by
+from session_budget import session_store, show_session_report
+
+# يرفع عند تغيير الصورة التوضيحية حتى لا تستخدم النسخة المحفوظة القديمة
+EXPLANATION_ASSET_VERSION = '1'
+EXPLANATION_FORMATS = ('png', 'svg', 'webp')
+
+# الحد الأقصى لحجم صور شكل الأرض المخزنة في الذاكرة
+LAND_CACHE_BYTES = 32 * 1024 * 1024
+
+class LandAreaCalculator(BaseLandAreaCalculator):
+    """حاسبة المساحات مع رسم شكل الأرض"""
     
+    @traced('insrf.plot_land')
     def plot_land(self):
         """رسم شكل الأرض"""
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # رسم الشكل
-        ax.plot(self.lengths, self.widths, 'b-', linewidth=3, label='حدود الأرض', marker='o', markersize=8)
-        ax.fill_between(self.lengths, self.widths, alpha=0.3, color='green', label='المساحة')
-        
-        # إضافة النقاط والتسميات
-        for i, (x, y) in enumerate(zip(self.lengths, self.widths)):
-            ax.annotate(f'({x}m, {y}m)', (x, y), xytext=(5, 5),
-                       textcoords='offset points', fontsize=10, fontweight='bold')
-        
-        ax.set_title('حساب مساحة الأرض ذات الانحراف', fontsize=16, fontweight='bold')
-        ax.set_xlabel('الطول (متر)', fontsize=12)
-        ax.set_ylabel('العرض (متر)', fontsize=12)
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-        
-        # إضافة معلومات المساحة
-        info_text = "نتائج حساب المساحة:\n\n"
-        for method, area in self.areas.items():
-            info_text += f"{method}: {area:.2f} م²\n"
-        
-        ax.text(0.02, 0.98, info_text, transform=ax.transAxes,
-                verticalalignment='top', fontsize=12, fontweight='bold',
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-        
-        plt.tight_layout()
-        return fig
+        return to_matplotlib(land_drawing(self.lengths, self.widths, self.areas))
 
-def get_explanation_image():
-    """إنشاء صورة توضيحية للشرح"""
-    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(15, 5))
+@st.cache_resource
+def _land_cache():
+    """ذاكرة صور شكل الأرض المشتركة بين الجلسات، ومحفوظة على القرص"""
+    return FigureCache(max_bytes=LAND_CACHE_BYTES, disk=shared_disk_cache(), namespace='land')
+
+def render_land_image(calculator):
+    """صورة PNG لشكل الأرض، ترسم فقط إذا لم تكن محفوظة"""
+    lengths, widths = tuple(calculator.lengths), tuple(calculator.widths)
+    areas = tuple(calculator.areas.items())
+    return _land_cache().get_or_render((lengths, widths, areas), lambda: render_png(
+        'land', {'lengths': list(lengths), 'widths': list(widths), 'areas': areas}
+    ))
+
+@traced('insrf.land_svg')
+def render_land_svg(calculator):
+    """نص SVG لشكل الأرض من وصف الرسم مباشرة، دون matplotlib ولا ذاكرة مؤقتة"""
+    return to_svg(land_drawing(calculator.lengths, calculator.widths, calculator.areas))
+
+def render_land(calculator, fmt='svg'):
+    """رسم شكل الأرض بالصيغة المختارة ('svg' أو 'png')، جاهزاً لـ st.image"""
+    if fmt == 'svg':
+        return render_land_svg(calculator)
+    return render_land_image(calculator)
+
+def _draw_explanation_figure():
+    """رسم الصورة التوضيحية لطرق الحساب"""
+    fig = FIGURE_POOL.acquire((15, 5))
+    ax1, ax2, ax3 = fig.subplots(1, 3)
     
     # الرسم الأول: طريقة شبه المنحرف
     x = [0, 5, 10]
@@ -95,164 +90,132 @@ def get_explanation_image():
     ax3.set_title('طريقة التقسيم', fontweight='bold')
     ax3.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    
-    # تحويل الرسم إلى صورة base64
+    fig.tight_layout()
+    return fig
+
+def _render_explanation(fmt):
+    """تحويل الصورة التوضيحية إلى بايتات بالصيغة المطلوبة"""
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode()
-    plt.close()
+    fig = _draw_explanation_figure()
+    with FIGURE_POOL.closing(fig):
+        fig.savefig(buf, format='svg' if fmt == 'svg' else 'png', dpi=150, bbox_inches='tight')
+    if fmt == 'webp':
+        # WebP بدون فقد أصغر بنحو الثلثين من PNG
+        webp = io.BytesIO()
+        Image.open(buf).save(webp, format='WEBP', lossless=True)
+        return webp.getvalue()
+    return buf.getvalue()
+
+def get_explanation_image_bytes(fmt='webp'):
+    """بايتات الصورة التوضيحية، ترسم مرة واحدة ثم تقرأ من الذاكرة أو القرص"""
+    if fmt not in EXPLANATION_FORMATS:
+        raise ValueError(f"صيغة غير مدعومة: {fmt}")
+    version = f'{EXPLANATION_ASSET_VERSION}-mpl{matplotlib.__version__}'
+    return load_asset('explanation', fmt, lambda: _render_explanation(fmt), version)
+
+def get_explanation_image():
+    """إنشاء صورة توضيحية للشرح بصيغة PNG مرمزة base64"""
+    return base64.b64encode(get_explanation_image_bytes('png')).decode()
+
+def _land_calculator(lengths_input, widths_input, integration, interpolation):
+    """حاسبة الأرض من حقول الإدخال بعد حساب مساحاتها، أو None مع رسالة الخطأ"""
+    try:
+        # تحويل البيانات المدخلة
+        with trace('insrf.parse'):
+            lengths = [float(x.strip()) for x in lengths_input.split(",")]
+            widths = [float(x.strip()) for x in widths_input.split(",")]
+        
+        if len(lengths) != len(widths):
+            st.error("❌ يجب أن يتساوى عدد النقاط الطولية مع عدد العروض")
+        elif len(lengths) < 2:
+            st.error("❌ يجب إدخال نقطتين على الأقل")
+        else:
+            calculator = LandAreaCalculator(lengths, widths, integration, interpolation)
+            calculator.calculate_all_methods()
+            return calculator
+    except Exception as e:
+        st.error(f"❌ حدث خطأ في البيانات: {str(e)}")
+    return None
+
+@st.fragment
+def _results_panel(calculator):
+    """نتائج حساب المساحة لكل طريقة ومتوسطها وزمن حسابها"""
+    areas = calculator.areas
+    st.markdown('<h2 class="section-header">📊 نتائج حساب المساحة</h2>', unsafe_allow_html=True)
+    
+    # عرض النتائج في بطاقات
+    cols = st.columns(2)
+    methods = list(areas.keys())
     
-    return img_str
+    for i, (col, method) in enumerate(zip(cols * 2, methods)):
+        with col:
+            area = areas[method]
+            st.metric(
+                label=f"**{method}**",
+                value=f"{area:.4f} م²",
+                delta=f"{(area - np.mean(list(areas.values()))):.4f}" if i > 0 else None
+            )
+    
+    # المتوسط
+    avg_area = np.mean(list(areas.values()))
+    st.success(f"**المساحة المتوسطة: {avg_area:.4f} متر مربع**")
+    
+    # زمن الحساب لكل طريقة
+    with st.expander("⏱️ زمن الحساب لكل طريقة"):
+        for method, seconds in calculator.timings.items():
+            st.write(f"**{method}:** {seconds * 1000:.3f} ms")
 
-def main():
-    st.set_page_config(
-        page_title="الحاسبة المتقدمة لمساحات الأراضي",
-        page_icon="🏞️",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
+@st.fragment
+def _plot_panel(calculator):
+    """رسم شكل الأرض: زر الرسم واختيار صيغته يعيدان تشغيل هذا الجزء وحده"""
+    rerun = start_rerun('insrf/plot')
     
-    # تخصيص التصميم
-    st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #2E8B57;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .section-header {
-        font-size: 1.5rem;
-        color: #1A535C;
-        border-bottom: 2px solid #4ECDC4;
-        padding-bottom: 0.5rem;
-        margin-top: 2rem;
-    }
-    .result-box {
-        background-color: #f8f9fa;
-        border: 2px solid #dee2e6;
-        border-radius: 10px;
-        padding: 20px;
-        margin: 10px 0;
-    }
-    .method-explanation {
-        background-color: #e8f5e8;
-        border-left: 5px solid #28a745;
-        padding: 15px;
-        margin: 10px 0;
-        border-radius: 5px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    with st.form("land_plot_form", border=False):
+        render_format = st.radio("صيغة الرسم:", list(RENDER_FORMATS), format_func=RENDER_FORMATS.get,
+                                 key="land_render_format", horizontal=True)
+        plot_btn = st.form_submit_button("📊 رسم الشكل", key="plot_land", use_container_width=True)
     
-    st.markdown('<h1 class="main-header">🏞️ الحاسبة المتقدمة لمساحات الأراضي</h1>', unsafe_allow_html=True)
+    if plot_btn:
+        st.markdown('<h2 class="section-header">🎨 رسم شكل الأرض</h2>', unsafe_allow_html=True)
+        st.image(render_land(calculator, render_format), width="stretch")
     
-    # الشريط الجانبي للإدخال
-    with st.sidebar:
-        st.markdown('<h2 class="section-header">📐 إدخال بيانات الأرض</h2>', unsafe_allow_html=True)
-        
-        st.info("""
-        **تعليمات الإدخال:**
-        - أدخل النقاط الطولية والعروض المقابلة
-        - استخدم الفاصلة لفصل القيم
-        - مثال: 0, 13, 15, 20
-        """)
-        
-        # إدخال النقاط الطولية
-        lengths_input = st.text_input("النقاط على محور الطول (متر):", "0, 13, 15, 20")
-        
-        # إدخال العروض
-        widths_input = st.text_input("العروض المقابلة (متر):", "10, 10, 9, 9")
-        
-        # زر الحساب
-        calculate_btn = st.button("🧮 حساب المساحة", type="primary", use_container_width=True)
-        
-        # زر الرسم
-        plot_btn = st.button("📊 رسم الشكل", use_container_width=True)
-        
-        # زر شرح الطرق
-        explain_btn = st.button("📚 شرح طرق الحساب", use_container_width=True)
+    finish_rerun(rerun, triggered_by(('plot_land',)))
+
+@st.fragment
+def _analysis_panel(areas):
+    """مخطط شريطي يقارن مساحات الطرق المختلفة"""
+    st.markdown('<h2 class="section-header">📈 تحليل النتائج</h2>', unsafe_allow_html=True)
     
-    # المنطقة الرئيسية
-    col1, col2 = st.columns([2, 1])
+    fig_bar = FIGURE_POOL.acquire((8, 6))
+    ax_bar = fig_bar.subplots()
+    methods = list(areas.keys())
+    values = list(areas.values())
     
-    with col1:
-        if calculate_btn or plot_btn:
-            try:
-                # تحويل البيانات المدخلة
-                lengths = [float(x.strip()) for x in lengths_input.split(",")]
-                widths = [float(x.strip()) for x in widths_input.split(",")]
-                
-                if len(lengths) != len(widths):
-                    st.error("❌ يجب أن يتساوى عدد النقاط الطولية مع عدد العروض")
-                elif len(lengths) < 2:
-                    st.error("❌ يجب إدخال نقطتين على الأقل")
-                else:
-                    # إنشاء الكائن والحساب
-                    calculator = LandAreaCalculator(lengths, widths)
-                    areas = calculator.calculate_all_methods()
-                    
-                    if calculate_btn:
-                        st.markdown('<h2 class="section-header">📊 نتائج حساب المساحة</h2>', unsafe_allow_html=True)
-                        
-                        # عرض النتائج في بطاقات
-                        cols = st.columns(2)
-                        methods = list(areas.keys())
-                        
-                        for i, (col, method) in enumerate(zip(cols * 2, methods)):
-                            with col:
-                                area = areas[method]
-                                st.metric(
-                                    label=f"**{method}**",
-                                    value=f"{area:.4f} م²",
-                                    delta=f"{(area - np.mean(list(areas.values()))):.4f}" if i > 0 else None
-                                )
-                        
-                        # المتوسط
-                        avg_area = np.mean(list(areas.values()))
-                        st.success(f"**المساحة المتوسطة: {avg_area:.4f} متر مربع**")
-                    
-                    if plot_btn:
-                        st.markdown('<h2 class="section-header">🎨 رسم شكل الأرض</h2>', unsafe_allow_html=True)
-                        fig = calculator.plot_land()
-                        st.pyplot(fig)
-                        
-            except Exception as e:
-                st.error(f"❌ حدث خطأ في البيانات: {str(e)}")
+    bars = ax_bar.bar(methods, values, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'])
+    ax_bar.set_title('مقارنة طرق حساب المساحة', fontweight='bold')
+    ax_bar.set_ylabel('المساحة (م²)')
+    ax_bar.tick_params(axis='x', rotation=45)
     
-    with col2:
-        if calculate_btn:
-            st.markdown('<h2 class="section-header">📈 تحليل النتائج</h2>', unsafe_allow_html=True)
-            
-            # مخطط شريطي للمقارنة
-            if 'areas' in locals():
-                fig_bar, ax_bar = plt.subplots(figsize=(8, 6))
-                methods = list(areas.keys())
-                values = list(areas.values())
-                
-                bars = ax_bar.bar(methods, values, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'])
-                ax_bar.set_title('مقارنة طرق حساب المساحة', fontweight='bold')
-                ax_bar.set_ylabel('المساحة (م²)')
-                ax_bar.tick_params(axis='x', rotation=45)
-                
-                # إضافة القيم على الأعمدة
-                for bar, value in zip(bars, values):
-                    ax_bar.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
-                               f'{value:.2f}', ha='center', va='bottom', fontweight='bold')
-                
-                plt.tight_layout()
-                st.pyplot(fig_bar)
+    # إضافة القيم على الأعمدة
+    for bar, value in zip(bars, values):
+        ax_bar.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
+                   f'{value:.2f}', ha='center', va='bottom', fontweight='bold')
+    
+    fig_bar.tight_layout()
+    with FIGURE_POOL.closing(fig_bar), trace('insrf.bar_chart_pyplot'):
+        st.pyplot(fig_bar)
+
+@st.fragment
+def _explanation_panel():
+    """شرح طرق الحساب: زر الشرح يعيد تشغيل هذا الجزء وحده دون النتائج والرسم"""
+    rerun = start_rerun('insrf/explain')
     
-    # قسم شرح طرق الحساب
-    if explain_btn:
+    if st.button("📚 شرح طرق الحساب", key="explain_methods"):
         st.markdown('<h2 class="section-header">📚 شرح مفصل لطرق حساب المساحة</h2>', unsafe_allow_html=True)
         
         # الصور التوضيحية
         st.markdown("### 🎨 رسم توضيحي للطرق المختلفة")
-        img_str = get_explanation_image()
-        st.markdown(f'<img src="data:image/png;base64,{img_str}" width="100%">', unsafe_allow_html=True)
+        st.image(get_explanation_image_bytes(), width="stretch")
         
         # شرح طريقة شبه المنحرف
         with st.expander("📐 طريقة شبه المنحرف (Trapezoidal Rule)", expanded=True):
@@ -349,55 +312,189 @@ def main():
             </div>
             """, unsafe_allow_html=True)
     
-    # قسم التقرير
-    if calculate_btn and 'areas' in locals():
-        st.markdown("---")
-        st.markdown('<h2 class="section-header">📋 تقرير مفصل</h2>', unsafe_allow_html=True)
+    finish_rerun(rerun, triggered_by(('explain_methods',)))
+
+@st.fragment
+def _report_panel(lengths, widths, areas):
+    """التقرير المفصل: زر التصدير يعيد تشغيل هذا الجزء وحده فيبقى التقرير ظاهراً"""
+    st.markdown("---")
+    st.markdown('<h2 class="section-header">📋 تقرير مفصل</h2>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("البيانات المدخلة")
+        st.write(f"**النقاط الطولية:** {lengths}")
+        st.write(f"**العروض المقابلة:** {widths}")
+        st.write(f"**عدد النقاط:** {len(lengths)}")
+        st.write(f"**أقصى طول:** {max(lengths)} متر")
+        st.write(f"**أدنى طول:** {min(lengths)} متر")
+    
+    with col2:
+        st.subheader("التحليل الإحصائي")
+        areas_list = list(areas.values())
+        st.write(f"**أعلى مساحة:** {max(areas_list):.4f} م²")
+        st.write(f"**أدنى مساحة:** {min(areas_list):.4f} م²")
+        st.write(f"**المتوسط:** {np.mean(areas_list):.4f} م²")
+        st.write(f"**الانحراف المعياري:** {np.std(areas_list):.4f} م²")
+        st.write(f"**نسبة الاختلاف:** {(max(areas_list)-min(areas_list))/np.mean(areas_list)*100:.2f}%")
+    
+    # زر تصدير التقرير
+    if st.button("💾 تصدير التقرير"):
+        report_text = f"""
+        تقرير حساب مساحة الأرض
+        {'='*50}
+        التاريخ: {st.session_state.get('current_time', 'غير محدد')}
         
-        col1, col2 = st.columns(2)
+        البيانات المدخلة:
+        - النقاط الطولية: {lengths}
+        - العروض: {widths}
         
-        with col1:
-            st.subheader("البيانات المدخلة")
-            st.write(f"**النقاط الطولية:** {lengths}")
-            st.write(f"**العروض المقابلة:** {widths}")
-            st.write(f"**عدد النقاط:** {len(lengths)}")
-            st.write(f"**أقصى طول:** {max(lengths)} متر")
-            st.write(f"**أدنى طول:** {min(lengths)} متر")
+        نتائج الحساب:
+        """
         
-        with col2:
-            st.subheader("التحليل الإحصائي")
-            areas_list = list(areas.values())
-            st.write(f"**أعلى مساحة:** {max(areas_list):.4f} م²")
-            st.write(f"**أدنى مساحة:** {min(areas_list):.4f} م²")
-            st.write(f"**المتوسط:** {np.mean(areas_list):.4f} م²")
-            st.write(f"**الانحراف المعياري:** {np.std(areas_list):.4f} م²")
-            st.write(f"**نسبة الاختلاف:** {(max(areas_list)-min(areas_list))/np.mean(areas_list)*100:.2f}%")
+        for method, area in areas.items():
+            report_text += f"- {method}: {area:.4f} م²\n"
         
-        # زر تصدير التقرير
-        if st.button("💾 تصدير التقرير"):
-            report_text = f"""
-            تقرير حساب مساحة الأرض
-            {'='*50}
-            التاريخ: {st.session_state.get('current_time', 'غير محدد')}
-            
-            البيانات المدخلة:
-            - النقاط الطولية: {lengths}
-            - العروض: {widths}
-            
-            نتائج الحساب:
-            """
+        report_text += f"\nالمساحة المتوسطة: {np.mean(list(areas.values())):.4f} م²"
+        
+        st.download_button(
+            label="📥 تحميل التقرير",
+            data=report_text,
+            file_name="تقرير_مساحة_الأرض.txt",
+            mime="text/plain"
+        )
+
+def main():
+    rerun = start_rerun('insrf')
+    st.set_page_config(
+        page_title="الحاسبة المتقدمة لمساحات الأراضي",
+        page_icon="🏞️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # تخصيص التصميم
+    st.markdown("""
+    <style>
+    .main-header {
+        font-size: 2.5rem;
+        color: #2E8B57;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .section-header {
+        font-size: 1.5rem;
+        color: #1A535C;
+        border-bottom: 2px solid #4ECDC4;
+        padding-bottom: 0.5rem;
+        margin-top: 2rem;
+    }
+    .result-box {
+        background-color: #f8f9fa;
+        border: 2px solid #dee2e6;
+        border-radius: 10px;
+        padding: 20px;
+        margin: 10px 0;
+    }
+    .method-explanation {
+        background-color: #e8f5e8;
+        border-left: 5px solid #28a745;
+        padding: 15px;
+        margin: 10px 0;
+        border-radius: 5px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('<h1 class="main-header">🏞️ الحاسبة المتقدمة لمساحات الأراضي</h1>', unsafe_allow_html=True)
+    
+    # الشريط الجانبي للإدخال
+    with st.sidebar:
+        st.markdown('<h2 class="section-header">📐 إدخال بيانات الأرض</h2>', unsafe_allow_html=True)
+        
+        st.info("""
+        **تعليمات الإدخال:**
+        - أدخل النقاط الطولية والعروض المقابلة
+        - استخدم الفاصلة لفصل القيم
+        - مثال: 0, 13, 15, 20
+        """)
+        
+        # الإدخالات داخل نموذج: تعديلها لا يعيد تشغيل الصفحة حتى يضغط أحد الأزرار
+        with st.form("land_form", border=False):
+            # إدخال النقاط الطولية
+            lengths_input = st.text_input("النقاط على محور الطول (متر):", "0, 13, 15, 20")
             
-            for method, area in areas.items():
-                report_text += f"- {method}: {area:.4f} م²\n"
+            # إدخال العروض
+            widths_input = st.text_input("العروض المقابلة (متر):", "10, 10, 9, 9")
             
-            report_text += f"\nالمساحة المتوسطة: {np.mean(list(areas.values())):.4f} م²"
+            # ملف مسح كبير يقرأ بالتدفق بدلاً من حقول النص
+            survey_file = st.file_uploader(
+                "أو ارفع ملف مسح كبير (CSV / NPY / BIN):",
+                type=['csv', 'txt', 'npy', 'bin', 'dat', 'f64'],
+                help="عمودان: المسافة على محور الطول ثم العرض. الملفات الثنائية أزواج float64 متتالية."
+            )
             
-            st.download_button(
-                label="📥 تحميل التقرير",
-                data=report_text,
-                file_name="تقرير_مساحة_الأرض.txt",
-                mime="text/plain"
+            # إعدادات طريقة التكامل
+            interpolation = st.selectbox(
+                "نوع الاستيفاء (طريقة التكامل):", INTERPOLATIONS,
+                format_func=lambda v: {'linear': 'خطي', 'cubic': 'تكعيبي', 'pchip': 'PCHIP'}[v]
+            )
+            integration = st.selectbox(
+                "محرك التكامل:", INTEGRATION_BACKENDS,
+                format_func=lambda v: {'auto': 'تلقائي', 'exact': 'دقيق (مجموع القطع)', 'quad': 'تكيفي (quad)'}[v]
             )
+            
+            # زر الحساب
+            calculate_btn = st.form_submit_button("🧮 حساب المساحة", type="primary", key="calc_area", use_container_width=True)
+    
+    # المنطقة الرئيسية
+    store = session_store()
+    col1, col2 = st.columns([2, 1])
+    calculator = None
+    
+    with col1:
+        if survey_file is not None and calculate_btn:
+            try:
+                # نتيجة الملف نفسه تحفظ في الجلسة فلا يعاد تدفقه عند كل ضغطة
+                survey_key = ('survey', survey_file.file_id)
+                accumulator = store.get(survey_key)
+                if accumulator is None:
+                    accumulator = store.put(survey_key, stream_survey_areas(survey_file))
+                if accumulator.count < 2:
+                    st.error("❌ يجب أن يحتوي الملف على نقطتين على الأقل")
+                else:
+                    st.markdown('<h2 class="section-header">📊 نتائج حساب المساحة من ملف المسح</h2>', unsafe_allow_html=True)
+                    stream_areas = accumulator.result()
+                    cols = st.columns(len(stream_areas))
+                    for col, (method, area) in zip(cols, stream_areas.items()):
+                        with col:
+                            st.metric(label=f"**{method}**", value=f"{area:.4f} م²")
+                    st.info(f"**عدد النقاط:** {accumulator.count:,} — "
+                            f"**من:** {accumulator.min_length} م **إلى:** {accumulator.max_length} م")
+            except Exception as e:
+                st.error(f"❌ حدث خطأ في قراءة الملف: {str(e)}")
+        
+        else:
+            calculator = _land_calculator(lengths_input, widths_input, integration, interpolation)
+            if calculator is not None:
+                if calculate_btn:
+                    _results_panel(calculator)
+                _plot_panel(calculator)
+    
+    with col2:
+        if calculate_btn and calculator is not None:
+            _analysis_panel(calculator.areas)
+    
+    _explanation_panel()
+    
+    # قسم التقرير
+    if calculate_btn and calculator is not None:
+        _report_panel(calculator.lengths, calculator.widths, calculator.areas)
+    
+    with st.sidebar:
+        show_session_report(store)
+        show_rerun_report(finish_rerun(rerun, triggered_by(('calc_area',))))
 
 if __name__ == "__main__":
     main()
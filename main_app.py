@@ -1,18 +1,121 @@
 import streamlit as st
+import importlib
 import sys
 import os
+import time
 
 # إضافة المسار الحالي للوحدات
 sys.path.append(os.path.dirname(__file__))
 
-# استيراد التطبيقات
-try:
-    from insrf import insrf_main
-    from tan import tan_main
-    from dimshnal import demasinal_main
-except ImportError as e:
-    st.error(f"خطأ في استيراد الملفات: {e}")
-    st.info("تأكد من وجود الملفات insrf.py و tan.py و dimshnal.py في نفس المجلد")
+# صفحات التطبيقات: الاختيار -> (العنوان، الوحدة، الدالة الرئيسية، الاسم المختصر)
+# تستورد كل وحدة عند أول اختيار لها فقط حتى لا تحمل SciPy و Plotly و mplot3d مع الصفحة الرئيسية
+PAGES = {
+    "🏞️ حساب مساحات الأراضي": ("🏞️ الحاسبة المتقدمة لمساحات الأراضي", "insrf", "insrf_main", "حساب المساحات"),
+    "📐 تحليل الزوايا والمنحدرات (tan)": ("📐 تطبيق تحليل الزوايا والمنحدرات", "tan", "tan_main", "tan"),
+    "📊 التحليل البُعدي (dimshnal)": ("📊 تطبيق التحليل البُعدي", "dimshnal", "demasinal_main", "dimshnal"),
+}
+
+@st.cache_resource
+def _import_stats():
+    """أزمنة استيراد الصفحات المشتركة بين جميع الجلسات"""
+    return {}
+
+@st.cache_resource(show_spinner=False)
+def _import_page(module_name, func_name):
+    """استيراد وحدة الصفحة مرة واحدة للعملية وتخزين دالتها الرئيسية"""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _import_stats().setdefault(module_name, {})['cold'] = time.perf_counter() - start
+    return getattr(module, func_name)
+
+@st.cache_resource(show_spinner=False)
+def _metrics_server():
+    """خادم /metrics للعملية، يبدأ مرة واحدة من التطبيق وليس من عمال الرسم"""
+    from calc_core.tracing import start_metrics_server
+    return start_metrics_server()
+
+def load_page(module_name, func_name):
+    """إرجاع الدالة الرئيسية للصفحة مع تسجيل زمن التحميل"""
+    start = time.perf_counter()
+    page_main = _import_page(module_name, func_name)
+    _import_stats().setdefault(module_name, {})['warm'] = time.perf_counter() - start
+    return page_main
+
+def show_startup_report():
+    """عرض زمن التحميل الأول (بارد) والمتكرر (دافئ) لكل صفحة"""
+    stats = _import_stats()
+    with st.expander("⏱️ زمن تحميل الصفحات"):
+        if not stats:
+            st.caption("لم تحمل أي صفحة بعد")
+        for module_name, times in stats.items():
+            line = f"**{module_name}:**"
+            if 'cold' in times:
+                line += f" بارد {times['cold'] * 1000:.1f} ms"
+            if 'warm' in times:
+                line += f" — دافئ {times['warm'] * 1000:.3f} ms"
+            st.write(line)
+
+def show_memory_report():
+    """عرض عدد رسومات matplotlib الحية والذاكرة المقيمة للعملية"""
+    # لا يستورد مخزون الرسومات هنا حتى لا تحمل matplotlib مع الصفحة الرئيسية
+    figure_pool = sys.modules.get('figure_pool')
+    if figure_pool is None:
+        return
+    stats = figure_pool.FIGURE_POOL.stats()
+    with st.expander("🧮 الرسومات والذاكرة"):
+        st.write(f"**الرسومات الحية:** {stats['in_use'] + stats['pyplot_open']}")
+        st.write(f"**رسومات جاهزة لإعادة الاستخدام:** {stats['idle']}")
+        st.write(f"**أنشئت / أعيد استخدامها:** {stats['created']} / {stats['reused']}")
+        st.write(f"**الذاكرة المقيمة (RSS):** {stats['rss_bytes'] / 1024 / 1024:.1f} MB")
+
+def show_memo_report():
+    """عرض إصابات وإخفاقات ذاكرة نتائج الحسابات المشتركة بين الجلسات"""
+    memo = sys.modules.get('calc_core.memo')
+    if memo is None:
+        return
+    with st.expander("♻️ ذاكرة نتائج الحسابات"):
+        for name, stats in memo.memo_stats().items():
+            if stats['hits'] or stats['misses']:
+                st.write(f"**{name.rsplit('.', 1)[-1]}:** {stats['size']} نتيجة "
+                         f"({stats['bytes'] / 1024:.0f} KB) — "
+                         f"إصابات {stats['hits']} / إخفاقات {stats['misses']}")
+
+def show_session_report():
+    """عرض ذاكرة نتائج جميع الجلسات المفتوحة في العملية"""
+    session_budget = sys.modules.get('session_budget')
+    if session_budget is None:
+        return
+    stats = session_budget.sessions_stats()
+    with st.expander("👥 ذاكرة الجلسات"):
+        st.write(f"**الجلسات:** {stats['sessions']}")
+        st.write(f"**النتائج المخزنة:** {stats['bytes'] / 1024:.1f} KB")
+        st.write(f"**عناصر حذفت لتجاوز الحد:** {stats['evictions']}")
+        st.caption(f"حد الجلسة {session_budget.SESSION_BUDGET_BYTES / 1024 / 1024:.0f} MB، "
+                   f"وتفرغ الجلسة بعد {session_budget.SESSION_IDLE_SECONDS / 60:.0f} دقيقة من الخمول")
+
+def show_rerun_report():
+    """عرض عدد إعادات تشغيل كل صفحة ومتوسط زمنها حسب الزر المسبب"""
+    rerun_stats = sys.modules.get('rerun_stats')
+    if rerun_stats is None:
+        return
+    with st.expander("🔄 إعادات التشغيل"):
+        for page, triggers in rerun_stats.rerun_totals().items():
+            st.write(f"**{page}:** " + "، ".join(
+                f"{trigger} {count} × {seconds / count * 1000:.0f} ms"
+                for trigger, (count, seconds) in triggers.items()
+            ))
+
+def show_trace_report():
+    """عرض أزمنة المراحل المقاسة وتصديرها بصيغة Prometheus عند تفعيل القياس"""
+    tracing = sys.modules.get('calc_core.tracing')
+    if tracing is None or not tracing.tracing_enabled():
+        return
+    with st.expander("📈 أزمنة المراحل"):
+        for stage, stats in tracing.trace_stats().items():
+            st.write(f"**{stage}:** {stats['count']} × {stats['mean'] * 1000:.1f} ms "
+                     f"(p95 ≤ {stats['p95'] * 1000:.1f} ms، أقصى {stats['max'] * 1000:.1f} ms)")
+        st.download_button("📥 تصدير (Prometheus)", tracing.prometheus_text(),
+                           file_name="metrics.txt", mime="text/plain")
 
 def show_homepage():
     """عرض الصفحة الرئيسية"""
@@ -75,6 +178,9 @@ def main():
         initial_sidebar_state="expanded"
     )
 
+    if os.environ.get('CALC_METRICS_PORT'):
+        _metrics_server()
+
     # تصميم الصفحة
     st.markdown("""
     <style>
@@ -109,12 +215,7 @@ def main():
         
         app_choice = st.radio(
             "اختر التطبيق:",
-            [
-                "🏠 الصفحة الرئيسية", 
-                "🏞️ حساب مساحات الأراضي", 
-                "📐 تحليل الزوايا والمنحدرات (tan)", 
-                "📊 التحليل البُعدي (dimshnal)"
-            ],
+            ["🏠 الصفحة الرئيسية", *PAGES],
             index=0
         )
 
@@ -123,26 +224,28 @@ def main():
         show_homepage()
 
     # تطبيقات أخرى
-    elif app_choice == "🏞️ حساب مساحات الأراضي":
-        st.markdown('<h1 class="main-header">🏞️ الحاسبة المتقدمة لمساحات الأراضي</h1>', unsafe_allow_html=True)
-        try:
-            insrf_main()
-        except Exception as e:
-            st.error(f"حدث خطأ في تحميل تطبيق حساب المساحات: {e}")
-
-    elif app_choice == "📐 تحليل الزوايا والمنحدرات (tan)":
-        st.markdown('<h1 class="main-header">📐 تطبيق تحليل الزوايا والمنحدرات</h1>', unsafe_allow_html=True)
+    else:
+        title, module_name, func_name, short_name = PAGES[app_choice]
+        st.markdown(f'<h1 class="main-header">{title}</h1>', unsafe_allow_html=True)
         try:
-            tan_main()
+            page_main = load_page(module_name, func_name)
+            # وحدة القياس حملت مع الصفحة (جميع الصفحات تستورد calc_core)
+            tracing = importlib.import_module('calc_core.tracing')
+            with tracing.trace(f'page.{module_name}'):
+                page_main()
+        except ImportError as e:
+            st.error(f"خطأ في استيراد الملفات: {e}")
+            st.info("تأكد من وجود الملفات insrf.py و tan.py و dimshnal.py في نفس المجلد")
         except Exception as e:
-            st.error(f"حدث خطأ في تحميل تطبيق tan: {e}")
+            st.error(f"حدث خطأ في تحميل تطبيق {short_name}: {e}")
 
-    elif app_choice == "📊 التحليل البُعدي (dimshnal)":
-        st.markdown('<h1 class="main-header">📊 تطبيق التحليل البُعدي</h1>', unsafe_allow_html=True)
-        try:
-            demasinal_main()
-        except Exception as e:
-            st.error(f"حدث خطأ في تحميل تطبيق dimshnal: {e}")
+    with st.sidebar:
+        show_startup_report()
+        show_memory_report()
+        show_memo_report()
+        show_session_report()
+        show_rerun_report()
+        show_trace_report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,194 @@
+import atexit
+import concurrent.futures
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+
+import matplotlib
+
+from calc_core.tracing import trace
+from figure_cache import STYLE_PARAMS
+
+logger = logging.getLogger(__name__)
+
+def _worker_count(value):
+    """عدد عمال الرسم من الإعداد: رقم، أو auto لعدد الأنوية، و 0 للرسم داخل العملية"""
+    if value.strip().lower() == 'auto':
+        return os.cpu_count() or 1
+    return max(int(value or 0), 0)
+
+# عمال الرسم معطلون افتراضياً: CALC_RENDER_WORKERS=auto أو عدد العمليات لتفعيلهم
+RENDER_WORKERS = _worker_count(os.environ.get('CALC_RENDER_WORKERS', '0'))
+# عدد الطلبات المنتظرة فوق عدد العمال قبل رفض طلب جديد
+RENDER_QUEUE_SIZE = int(os.environ.get('CALC_RENDER_QUEUE', str(2 * RENDER_WORKERS)))
+# أقصى انتظار لمكان في الطابور، ثم لنتيجة الرسم، بالثواني
+RENDER_TIMEOUT = float(os.environ.get('CALC_RENDER_TIMEOUT', '30'))
+
+# نوع الرسم -> 'الوحدة:الدالة' التي تعيد وصف رسم أو بايتات PNG من معاملات قابلة للتسلسل.
+# الوحدات خالية من Streamlit حتى لا يستورد العامل صفحات التطبيق
+RENDERERS = {
+    'triangle': 'calc_core.gable:triangle_drawing',
+    'land': 'calc_core.area:land_drawing',
+    'prism3d': 'calc_core.prism:prism_drawing',
+    'prism3d_fast': 'drawing_backends:prism_fast_png',
+    # أي وصف رسم من calc_core.drawing: {'drawing': Drawing}
+    'drawing': 'drawing_backends:drawing_png',
+}
+
+class RenderQueueFull(RuntimeError):
+    """الطابور ممتلئ ولم يفرغ مكان خلال المهلة"""
+
+class RenderTimeout(TimeoutError):
+    """لم ينته الرسم خلال المهلة"""
+
+def current_style():
+    """إعدادات matplotlib الحالية المؤثرة على الصورة، لتطبيقها في العامل"""
+    return {name: matplotlib.rcParams[name] for name in STYLE_PARAMS}
+
+def render_local(kind, spec, style=None):
+    """رسم الطلب داخل العملية الحالية (وهي أيضاً الدالة التي ينفذها العامل)"""
+    from drawing_backends import drawing_png
+
+    module_name, function_name = RENDERERS[kind].split(':')
+    function = getattr(importlib.import_module(module_name), function_name)
+    with matplotlib.rc_context(style or {}):
+        result = function(**spec)
+        return result if isinstance(result, bytes) else drawing_png(result)
+
+def _init_worker(modules):
+    """تحميل matplotlib ووحدات الرسم مرة واحدة عند بدء العامل"""
+    matplotlib.use('Agg')
+    for module_name in modules:
+        importlib.import_module(module_name)
+
+class RenderPool:
+    """عمليات منفصلة ترسم بـ matplotlib وتعيد بايتات PNG
+
+    الرسم يحجز قفل المفسر، فتنفيذه في عمليات منفصلة يترك خيوط الجلسات
+    الأخرى تعمل ويوزع الرسوم على الأنوية. الطلبات الجارية والمنتظرة
+    محدودة بـ workers + queue_size، والطلب الزائد ينتظر مكاناً حتى المهلة
+    ثم يرفض بـ RenderQueueFull. العمليات تبدأ بـ spawn لأن نسخ خادم متعدد
+    الخيوط بـ fork غير آمن.
+    """
+
+    def __init__(self, workers=RENDER_WORKERS, queue_size=RENDER_QUEUE_SIZE, timeout=RENDER_TIMEOUT):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failures = 0
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                modules = sorted({target.split(':')[0] for target in RENDERERS.values()})
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(modules,),
+                )
+            return self._executor
+
+    def render(self, kind, spec, timeout=None):
+        """رسم الطلب في عامل وإرجاع بايتات PNG"""
+        if kind not in RENDERERS:
+            raise ValueError(f"نوع رسم غير معروف: {kind}")
+        timeout = self.timeout if timeout is None else timeout
+        with trace('render.pool_queue'):
+            if not self._slots.acquire(timeout=timeout):
+                with self._lock:
+                    self.rejected += 1
+                raise RenderQueueFull(f"طابور الرسم ممتلئ ({self.workers + self.queue_size} طلب)")
+        try:
+            future = self._submit(kind, spec)
+        except BaseException:
+            self._slots.release()
+            raise
+        # المكان يحرر عند انتهاء العامل فعلاً، حتى لو انتهت مهلة المنتظر قبله
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self.submitted += 1
+
+        try:
+            with trace(f'render.pool.{kind}'):
+                data = future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise RenderTimeout(f"انتهت مهلة الرسم ({timeout:.0f} ث)") from None
+        except concurrent.futures.process.BrokenProcessPool:
+            # عامل توقف بشكل غير طبيعي: مجموعة جديدة عند الطلب التالي
+            self._reset()
+            with self._lock:
+                self.failures += 1
+            raise
+        with self._lock:
+            self.completed += 1
+        return data
+
+    def _submit(self, kind, spec):
+        """إرسال الطلب، مع إعادة بناء المجموعة مرة واحدة إذا وجدت معطلة"""
+        try:
+            return self._get_executor().submit(render_local, kind, spec, current_style())
+        except concurrent.futures.process.BrokenProcessPool:
+            # عامل توقف بين طلبين: المجموعة لا تقبل طلبات جديدة حتى تستبدل
+            self._reset()
+            with self._lock:
+                self.failures += 1
+            return self._get_executor().submit(render_local, kind, spec, current_style())
+
+    def _reset(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        self._reset()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers, 'queue_size': self.queue_size,
+                'submitted': self.submitted, 'completed': self.completed,
+                'rejected': self.rejected, 'timeouts': self.timeouts, 'failures': self.failures,
+            }
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+def shared_render_pool():
+    """مجموعة العمال المشتركة للعملية، أو None إذا كانت معطلة"""
+    global _shared_pool
+    if RENDER_WORKERS <= 0:
+        return None
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = RenderPool()
+            atexit.register(_shared_pool.shutdown)
+        return _shared_pool
+
+def render_png(kind, spec):
+    """بايتات PNG للطلب: في عمال الرسم إذا كانوا مفعلين، وإلا داخل العملية
+
+    إذا تعطلت مجموعة العمال يرسم الطلب داخل العملية بدل إظهار خطأ للمستخدم،
+    والطلب التالي يبدأ مجموعة جديدة.
+    """
+    pool = shared_render_pool()
+    if pool is None:
+        return render_local(kind, spec)
+    try:
+        return pool.render(kind, spec)
+    except concurrent.futures.process.BrokenProcessPool:
+        logger.warning("تعطلت مجموعة عمال الرسم، رسم %s داخل العملية", kind, exc_info=True)
+        return render_local(kind, spec)
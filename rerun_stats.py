@@ -0,0 +1,53 @@
+import threading
+import time
+
+import streamlit as st
+
+# مفتاح إحصاءات إعادة التشغيل داخل st.session_state
+STATS_KEY = '_rerun_stats'
+
+# الإجماليات على مستوى العملية: الصفحة -> {سبب إعادة التشغيل: [العدد، مجموع الثواني]}
+_totals = {}
+_lock = threading.Lock()
+
+def start_rerun(page):
+    """بداية قياس إعادة تشغيل الصفحة"""
+    return page, time.perf_counter()
+
+def triggered_by(keys):
+    """أول زر من keys ضغط في هذه الإعادة، أو 'other' لأي تفاعل آخر"""
+    for key in keys:
+        if st.session_state.get(key) is True:
+            return key
+    return 'other'
+
+def finish_rerun(token, trigger='other'):
+    """تسجيل زمن إعادة التشغيل للجلسة وللعملية وإرجاع إحصاءات الجلسة للصفحة"""
+    page, start = token
+    elapsed = time.perf_counter() - start
+
+    stats = st.session_state.setdefault(STATS_KEY, {}).setdefault(
+        page, {'reruns': 0, 'seconds': 0.0, 'last_seconds': 0.0, 'last_trigger': None}
+    )
+    stats['reruns'] += 1
+    stats['seconds'] += elapsed
+    stats['last_seconds'] = elapsed
+    stats['last_trigger'] = trigger
+
+    with _lock:
+        entry = _totals.setdefault(page, {}).setdefault(trigger, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+    return stats
+
+def rerun_totals():
+    """نسخة من إجماليات العملية: الصفحة -> السبب -> (العدد، مجموع الثواني)"""
+    with _lock:
+        return {page: {trigger: tuple(entry) for trigger, entry in triggers.items()}
+                for page, triggers in _totals.items()}
+
+def show_rerun_report(stats):
+    """سطر مختصر بعدد إعادات التشغيل في الجلسة وزمنها"""
+    st.caption(f"إعادات التشغيل: {stats['reruns']}، "
+               f"الأخيرة {stats['last_seconds'] * 1000:.0f} ms ({stats['last_trigger']})، "
+               f"المتوسط {stats['seconds'] / stats['reruns'] * 1000:.0f} ms")
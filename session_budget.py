@@ -0,0 +1,134 @@
+import collections
+import os
+import threading
+import time
+import weakref
+
+import streamlit as st
+
+from calc_core.memo import estimate_size
+
+# حد ذاكرة النتائج لكل جلسة، ومدة الخمول التي تفرغ بعدها جلسة لا تتفاعل
+SESSION_BUDGET_BYTES = int(float(os.environ.get('CALC_SESSION_BUDGET_MB', '8')) * 1024 * 1024)
+SESSION_IDLE_SECONDS = float(os.environ.get('CALC_SESSION_IDLE_SECONDS', '1800'))
+
+# مفتاح مخزن الجلسة داخل st.session_state
+STORE_KEY = '_session_store'
+
+# جميع مخازن الجلسات الحية في العملية (تختفي مع انتهاء جلساتها)
+_stores = weakref.WeakSet()
+_stores_lock = threading.Lock()
+
+class SessionStore:
+    """نتائج جلسة واحدة بترتيب الاستخدام الأحدث وحد أقصى للبايتات
+
+    عند تجاوز الحد تحذف أقدم القيم استخداماً، ولا تحذف القيمة التي أضيفت
+    للتو. المخزن مسجل على مستوى العملية، فتستطيع أي جلسة نشطة تفريغ
+    مخازن الجلسات الخاملة عبر sweep_idle حتى لو لم تعد تعمل.
+    """
+
+    def __init__(self, max_bytes=SESSION_BUDGET_BYTES):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.last_active = time.time()
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        with _stores_lock:
+            _stores.add(self)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, default=None):
+        """قراءة قيمة وتحديث ترتيب استخدامها"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        """تخزين قيمة ثم حذف الأقدم استخداماً حتى يعود الحجم تحت الحد"""
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def touch(self):
+        """تسجيل نشاط الجلسة"""
+        self.last_active = time.time()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'items': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'idle_seconds': time.time() - self.last_active,
+                'sizes': {key: size for key, (_, size) in self._entries.items()},
+            }
+
+def sweep_idle(max_idle=SESSION_IDLE_SECONDS):
+    """تفريغ مخازن الجلسات الخاملة أكثر من max_idle ثانية، وإرجاع البايتات المحررة"""
+    now = time.time()
+    with _stores_lock:
+        stores = list(_stores)
+    freed = 0
+    for store in stores:
+        if now - store.last_active > max_idle:
+            freed += store.stats()['bytes']
+            store.clear()
+    return freed
+
+def sessions_stats():
+    """إجمالي المخازن في العملية: عدد الجلسات والبايتات والحذف"""
+    with _stores_lock:
+        stores = list(_stores)
+    stats = [store.stats() for store in stores]
+    return {
+        'sessions': len(stats),
+        'bytes': sum(s['bytes'] for s in stats),
+        'evictions': sum(s['evictions'] for s in stats),
+    }
+
+def session_store(max_bytes=SESSION_BUDGET_BYTES):
+    """مخزن الجلسة الحالية، مع تسجيل نشاطها وتفريغ الجلسات الخاملة"""
+    store = st.session_state.get(STORE_KEY)
+    if store is None:
+        store = st.session_state[STORE_KEY] = SessionStore(max_bytes)
+    store.touch()
+    sweep_idle()
+    return store
+
+def show_session_report(store):
+    """سطر مختصر بذاكرة الجلسة الحالية"""
+    stats = store.stats()
+    st.caption(f"ذاكرة الجلسة: {stats['items']} عنصر، "
+               f"{stats['bytes'] / 1024:.1f} KB من {stats['max_bytes'] / 1024 / 1024:.0f} MB، "
+               f"حذف {stats['evictions']}")
@@ -1,476 +1,552 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import math
+import time
+import matplotlib
 import numpy as np
 
-def tan_main():
-    """الدالة الرئيسية لتطبيق حاسبة الجملون"""
-    
-    # إعداد صفحة Streamlit
-    st.set_page_config(page_title="حاسبة الجملون", page_icon="🏗️", layout="wide")
+from calc_core.gable import (
+    calculate_angles,
+    calculate_hypotenuse,
+    calculate_kamer,
+    calculate_rafter,
+    gable_sweep,
+    sweep_table,
+    triangle_drawing,
+)
+from calc_core.svg import RENDER_FORMATS, to_svg
+from calc_core.tracing import trace, traced
+from rerun_stats import finish_rerun, show_rerun_report, start_rerun, triggered_by
+from session_budget import session_store, show_session_report
 
-    # تحسين إعدادات matplotlib للأفضل وضوحاً
-    plt.rcParams['figure.figsize'] = [12, 9]
-    plt.rcParams['font.size'] = 12
-    plt.rcParams['font.weight'] = 'bold'
-    plt.rcParams['axes.titlesize'] = 16
-    plt.rcParams['axes.titleweight'] = 'bold'
-    plt.rcParams['axes.labelsize'] = 14
+# الحد الأقصى لحجم صور المثلثات المخزنة
+TRIANGLE_CACHE_BYTES = 32 * 1024 * 1024
 
-    # العنوان الرئيسي
-    st.title("🏗️ حاسبة الجملون - أنظمة متعددة")
+# أسماء أعمدة جدول المسح المعروضة
+SWEEP_LABELS = {
+    'width': 'العرض (م)',
+    'height': 'الارتفاع (م)',
+    'helf': 'نصف العرض (م)',
+    'beem': 'طول الشتلة (م)',
+    'total_length': 'الطول الكلي (م)',
+    'angle': 'زاوية القاعدة (°)',
+    'top_angle': 'زاوية القمة (°)',
+    'slope_percent': 'نسبة الانحدار (%)',
+    'surface_area': 'مساحة السطح (م²)',
+}
 
-    # إنشاء التبويبات
-    tab1, tab2, tab3, tab4 = st.tabs(["📐 حساب الوتر", "🏗️ حساب الشتلة", "📏 حساب الزوايا", "📊 حساب الكمر"])
-
-    # متغيرات لتخزين النتائج
-    if 'hypotenuse' not in st.session_state:
-        st.session_state.hypotenuse = 0
-    if 'rafter' not in st.session_state:
-        st.session_state.rafter = 0
-    if 'angle' not in st.session_state:
-        st.session_state.angle = 0
-    if 'top_angle' not in st.session_state:
-        st.session_state.top_angle = 0
-
-    def create_clear_triangle_figure(base, height, helf, beem, angle, title, show_angles=True):
-        """إنشاء رسم مثلث واضح ومفصل"""
-        fig, ax = plt.subplots(figsize=(14, 10))
-        
-        # ألوان واضحة ومتناسقة
-        colors = {
-            'base': '#2E8B57',      # أخضر للقاعدة
-            'left': '#FF6B6B',      # أحمر للجانب الأيسر
-            'right': '#4ECDC4',     # أزرق للجانب الأيمن
-            'height': '#FFD166',    # أصفر للارتفاع
-            'angle': '#6A0572',     # بنفسجي للزوايا
-            'text': '#1A535C'       # أزرق داكن للنصوص
-        }
-        
-        # رسم المثلث الرئيسي
-        ax.plot([-helf, helf], [0, 0], color=colors['base'], linewidth=6, label=f'القاعدة: {base}m')
-        ax.plot([-helf, 0], [0, height], color=colors['left'], linewidth=6, label=f'الوتر الأيسر: {beem:.3f}m')
-        ax.plot([0, helf], [height, 0], color=colors['right'], linewidth=6, label=f'الوتر الأيمن: {beem:.3f}m')
-        
-        # خط الارتفاع العمودي
-        ax.plot([0, 0], [0, height], '--', color=colors['height'], linewidth=3, alpha=0.7, label=f'الارتفاع: {height}m')
-        
-        # النقاط الرئيسية
-        points = [(-helf, 0), (0, height), (helf, 0)]
-        for i, (x, y) in enumerate(points):
-            ax.plot(x, y, 'ko', markersize=12, markeredgecolor='white', markeredgewidth=2)
-            ax.text(x, y - height*0.1, f'P{i+1}', fontsize=14, ha='center', 
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.9))
-        
-        # إضافة القياسات مع خلفيات واضحة
-        # قياس القاعدة
-        ax.annotate(f'{base}m', xy=(0, -height*0.15), xytext=(0, -height*0.25), 
-                    textcoords='data', ha='center', fontsize=16, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.5", facecolor=colors['base'], alpha=0.8),
-                    arrowprops=dict(arrowstyle="<->", color=colors['base'], lw=2))
-        
-        # قياس الارتفاع
-        ax.annotate(f'{height}m', xy=(helf*0.1, height/2), xytext=(helf*0.3, height/2), 
-                    textcoords='data', ha='center', fontsize=16, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.5", facecolor=colors['height'], alpha=0.8),
-                    arrowprops=dict(arrowstyle="<->", color=colors['height'], lw=2))
-        
-        # قياس الأوتار
-        ax.annotate(f'{beem:.3f}m', xy=(-helf/2, height/3), xytext=(-helf, height/2), 
-                    textcoords='data', ha='center', fontsize=14, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.4", facecolor=colors['left'], alpha=0.8),
-                    arrowprops=dict(arrowstyle="->", color=colors['left'], lw=2))
-        
-        ax.annotate(f'{beem:.3f}m', xy=(helf/2, height/3), xytext=(helf, height/2), 
-                    textcoords='data', ha='center', fontsize=14, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.4", facecolor=colors['right'], alpha=0.8),
-                    arrowprops=dict(arrowstyle="->", color=colors['right'], lw=2))
-        
-        if show_angles:
-            # إضافة الزوايا مع أقواس
-            angle_radius = min(helf, height) * 0.2
-            
-            # الزاوية اليسرى
-            theta_left = np.linspace(0, np.radians(angle), 30)
-            x_arc_left = -helf + angle_radius * np.cos(theta_left)
-            y_arc_left = angle_radius * np.sin(theta_left)
-            ax.plot(x_arc_left, y_arc_left, color=colors['angle'], linewidth=3)
-            
-            ax.text(-helf + angle_radius*1.5, angle_radius*0.8, f'{angle:.1f}°', 
-                    fontsize=16, color=colors['angle'], fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.5", facecolor="white", alpha=0.9))
-            
-            # الزاوية اليمنى
-            theta_right = np.linspace(np.radians(180-angle), np.radians(180), 30)
-            x_arc_right = helf + angle_radius * np.cos(theta_right)
-            y_arc_right = angle_radius * np.sin(theta_right)
-            ax.plot(x_arc_right, y_arc_right, color=colors['angle'], linewidth=3)
-            
-            ax.text(helf - angle_radius*1.5, angle_radius*0.8, f'{angle:.1f}°', 
-                    fontsize=16, color=colors['angle'], fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.5", facecolor="white", alpha=0.9))
-            
-            # زاوية القمة إذا كانت موجودة
-            if 'top_angle' in st.session_state and st.session_state.top_angle > 0:
-                top_angle = st.session_state.top_angle
-                theta_top = np.linspace(np.radians(180-angle), np.radians(180+angle), 30)
-                x_arc_top = angle_radius * np.cos(theta_top)
-                y_arc_top = height + angle_radius * np.sin(theta_top)
-                ax.plot(x_arc_top, y_arc_top, color='purple', linewidth=3)
-                
-                ax.text(0, height + angle_radius*1.5, f'{top_angle:.1f}°', 
-                        fontsize=16, color='purple', fontweight='bold', ha='center',
-                        bbox=dict(boxstyle="round,pad=0.5", facecolor="lavender", alpha=0.9))
-        
-        # إعداد المحاور والمظهر
-        margin = max(helf, height) * 0.3
-        ax.set_xlim([-helf - margin, helf + margin])
-        ax.set_ylim([-height * 0.4, height + margin])
-        
-        ax.set_aspect('equal')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.set_facecolor('#f8f9fa')
-        
-        # العنوان والتسميات
-        ax.set_title(f'🎯 {title}\n(القاعدة: {base}m, الارتفاع: {height}m)', 
-                     fontsize=18, fontweight='bold', pad=20)
-        ax.set_xlabel('المسافة الأفقية (متر)', fontsize=14, fontweight='bold')
-        ax.set_ylabel('المسافة الرأسية (متر)', fontsize=14, fontweight='bold')
-        
-        # وسيلة الإيضاح
-        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.1), 
-                  ncol=3, fontsize=12, framealpha=0.9)
-        
-        plt.tight_layout()
-        return fig
+# أزرار الحساب في التبويبات، لتسجيل سبب كل إعادة تشغيل
+CALC_KEYS = ('calc_hyp', 'calc_raft', 'calc_ang', 'calc_kamer', 'calc_sweep')
 
-    with tab1:
-        st.header("📐 حساب الوتر بنظرية فيثاغورس")
-        
-        col1, col2 = st.columns([1, 1.2])
+# أقصى عدد صفوف في الجدول وأقصى دقة لخريطة الحرارة المرسلة للمتصفح
+SWEEP_TABLE_ROWS = 1000
+SWEEP_HEATMAP_CELLS = 200
+
+@traced('tan.triangle_figure')
+def create_clear_triangle_figure(base, height, helf, beem, angle, title, show_angles=True, top_angle=0):
+    """إنشاء رسم مثلث واضح ومفصل"""
+    from drawing_backends import to_matplotlib
+
+    return to_matplotlib(triangle_drawing(base, height, helf, beem, angle, title, show_angles, top_angle))
+
+@st.cache_resource
+def _triangle_cache():
+    """ذاكرة الصور المشتركة بين إعادات التشغيل والجلسات، ومحفوظة على القرص"""
+    from figure_cache import FigureCache, shared_disk_cache
+
+    return FigureCache(max_bytes=TRIANGLE_CACHE_BYTES, disk=shared_disk_cache(), namespace='triangle')
+
+def render_triangle_image(base, height, helf, beem, angle, title, show_angles=True, top_angle=0):
+    """صورة PNG للمثلث من الذاكرة المؤقتة، وترسم فقط عند تغير الأبعاد
+
+    matplotlib وعمال الرسم يستوردون هنا فقط، فصيغة SVG لا تحملهم عند فتح الصفحة.
+    """
+    from render_pool import render_png
+
+    key = (base, height, helf, beem, angle, title, show_angles, top_angle)
+    return _triangle_cache().get_or_render(key, lambda: render_png('triangle', {
+        'base': base, 'height': height, 'helf': helf, 'beem': beem, 'angle': angle,
+        'title': title, 'show_angles': show_angles, 'top_angle': top_angle,
+    }))
+
+@traced('tan.triangle_svg')
+def render_triangle_svg(base, height, helf, beem, angle, title, show_angles=True, top_angle=0):
+    """نص SVG للمثلث من وصف الرسم مباشرة، دون matplotlib ولا ذاكرة مؤقتة"""
+    return to_svg(triangle_drawing(base, height, helf, beem, angle, title, show_angles, top_angle))
+
+def render_triangle(base, height, helf, beem, angle, title, show_angles=True, top_angle=0):
+    """رسم المثلث بالصيغة المختارة في الشريط الجانبي، جاهزاً لـ st.image"""
+    if st.session_state.get('tan_render_format', 'svg') == 'svg':
+        return render_triangle_svg(base, height, helf, beem, angle, title, show_angles, top_angle)
+    return render_triangle_image(base, height, helf, beem, angle, title, show_angles, top_angle)
+
+def _session_top_angle(store):
+    """زاوية القمة من آخر حساب في تبويب الزوايا، وتظهر في جميع الرسوم"""
+    result = store.get('ang_result')
+    return result.top_angle if result is not None else 0
+
+@st.fragment
+def _hypotenuse_tab(store):
+    """تبويب حساب الوتر: يعاد تشغيله وحده عند التفاعل معه دون بقية التبويبات"""
+    rerun = start_rerun('tan/hypotenuse')
+    
+    st.header("📐 حساب الوتر بنظرية فيثاغورس")
+    
+    col1, col2 = st.columns([1, 1.2])
+    
+    with col1:
+        st.subheader("🎯 إدخال البيانات")
         
-        with col1:
-            st.subheader("🎯 إدخال البيانات")
-            
-            # استخدام أعمدة للإدخال لمزيد من التنظيم
+        # الحقول داخل نموذج: تعديلها لا يعيد تشغيل الصفحة، والحساب عند الإرسال فقط
+        with st.form("hyp_form", border=False):
             col1a, col1b = st.columns(2)
             with col1a:
                 base_hyp_text = st.text_input("القاعدة (متر):", value="40", key="base_hyp_text")
             with col1b:
                 height_hyp_text = st.text_input("الارتفاع (متر):", value="2", key="height_hyp_text")
-            
-            if st.button("🧮 حساب الوتر", key="calc_hyp", use_container_width=True):
-                try:
-                    base_hyp = float(base_hyp_text)
-                    height_hyp = float(height_hyp_text)
-                    
-                    if base_hyp > 0 and height_hyp > 0:
-                        # الحسابات
-                        helf = base_hyp / 2
-                        beem = math.sqrt(helf**2 + height_hyp**2)
-                        angle = math.degrees(math.atan(height_hyp / helf))
-                        
-                        st.session_state.hypotenuse = beem
-                        st.session_state.angle_calc = angle
-                        st.session_state.helf_calc = helf
-                        
-                        st.subheader("📊 النتائج")
-                        st.success(f"""
-                        **🧮 نتائج حساب الوتر:**
-                        
-                        **📐 البيانات المدخلة:**
-                        - القاعدة: {base_hyp} متر
-                        - الارتفاع: {height_hyp} متر  
-                        
-                        **📏 النتائج المحسوبة:**
-                        - نصف القاعدة: {helf} متر
-                        - طول الوتر: {beem:.3f} متر
-                        - الزاوية: {angle:.2f}°
-
-                        **🔢 المعادلات المستخدمة:**
-                        - نصف القاعدة = القاعدة ÷ 2 = {base_hyp} ÷ 2 = {helf} متر
-                        - الوتر = √(نصف_القاعدة² + الارتفاع²) = √({helf}² + {height_hyp}²) = {beem:.3f} متر
-                        - الزاوية = tan⁻¹(الارتفاع ÷ نصف_القاعدة) = tan⁻¹({height_hyp} ÷ {helf}) = {angle:.2f}°
-                        """)
-                        
-                        st.session_state.base_hyp_value = base_hyp
-                        st.session_state.height_hyp_value = height_hyp
-                    else:
-                        st.error("❌ يجب أن تكون القيم أكبر من الصفر")
-                        
-                except ValueError:
-                    st.error("❌ يرجى إدخال قيم رقمية صحيحة")
+            submitted = st.form_submit_button("🧮 حساب الوتر", key="calc_hyp", use_container_width=True)
         
-        with col2:
-            st.subheader("🎨 الرسم التوضيحي")
-            if st.session_state.hypotenuse > 0:
-                base_hyp = st.session_state.base_hyp_value
-                height_hyp = st.session_state.height_hyp_value
-                helf = st.session_state.helf_calc
-                beem = st.session_state.hypotenuse
-                angle = st.session_state.angle_calc
+        if submitted:
+            try:
+                base_hyp = float(base_hyp_text)
+                height_hyp = float(height_hyp_text)
                 
-                fig = create_clear_triangle_figure(
-                    base_hyp, height_hyp, helf, beem, angle,
-                    "رسم توضيحي لحساب الوتر"
-                )
-                st.pyplot(fig)
-                
-                # معلومات إضافية تحت الرسم
-                st.info(f"""
-                **💡 ملاحظات تقنية:**
-                - هذا الرسم يوضح تطبيق نظرية فيثاغورس على المثلث القائم
-                - الزوايا محسوبة باستخدام الدوال المثلثية العكسية
-                - الدقة في الحسابات: ±0.001 متر للأطوال، ±0.01° للزوايا
-                """)
-            else:
-                st.info("""
-                **📝 تعليمات:**
-                - أدخل قيمة القاعدة والارتفاع في الحقول على اليسار
-                - اضغط على زر 'حساب الوتر' لرؤية النتائج والرسم التوضيحي
-                - الرسم سيوضح جميع القياسات والزوايا بشكل واضح
-                """)
+                if base_hyp > 0 and height_hyp > 0:
+                    # الحسابات
+                    result = calculate_hypotenuse(base_hyp, height_hyp)
+                    helf, beem, angle = result['helf'], result['beem'], result['angle']
+                    
+                    store.put('hyp_result', result)
+                    
+                    st.subheader("📊 النتائج")
+                    st.success(f"""
+                    **🧮 نتائج حساب الوتر:**
+                    
+                    **📐 البيانات المدخلة:**
+                    - القاعدة: {base_hyp} متر
+                    - الارتفاع: {height_hyp} متر  
+                    
+                    **📏 النتائج المحسوبة:**
+                    - نصف القاعدة: {helf} متر
+                    - طول الوتر: {beem:.3f} متر
+                    - الزاوية: {angle:.2f}°
 
-    with tab2:
-        st.header("🏗️ حساب الشتلة")
-        
-        col1, col2 = st.columns([1, 1.2])
-        
-        with col1:
-            st.subheader("🎯 إدخال البيانات")
+                    **🔢 المعادلات المستخدمة:**
+                    - نصف القاعدة = القاعدة ÷ 2 = {base_hyp} ÷ 2 = {helf} متر
+                    - الوتر = √(نصف_القاعدة² + الارتفاع²) = √({helf}² + {height_hyp}²) = {beem:.3f} متر
+                    - الزاوية = tan⁻¹(الارتفاع ÷ نصف_القاعدة) = tan⁻¹({height_hyp} ÷ {helf}) = {angle:.2f}°
+                    """)
+                else:
+                    st.error("❌ يجب أن تكون القيم أكبر من الصفر")
+                    
+            except ValueError:
+                st.error("❌ يرجى إدخال قيم رقمية صحيحة")
+    
+    with col2:
+        st.subheader("🎨 الرسم التوضيحي")
+        result = store.get('hyp_result')
+        if result is not None:
+            base_hyp, height_hyp = result.base, result.height
+            helf, beem, angle = result.helf, result.beem, result.angle
             
+            image = render_triangle(
+                base_hyp, height_hyp, helf, beem, angle,
+                "رسم توضيحي لحساب الوتر",
+                top_angle=_session_top_angle(store)
+            )
+            st.image(image, width="stretch")
+            
+            # معلومات إضافية تحت الرسم
+            st.info(f"""
+            **💡 ملاحظات تقنية:**
+            - هذا الرسم يوضح تطبيق نظرية فيثاغورس على المثلث القائم
+            - الزوايا محسوبة باستخدام الدوال المثلثية العكسية
+            - الدقة في الحسابات: ±0.001 متر للأطوال، ±0.01° للزوايا
+            """)
+        else:
+            st.info("""
+            **📝 تعليمات:**
+            - أدخل قيمة القاعدة والارتفاع في الحقول على اليسار
+            - اضغط على زر 'حساب الوتر' لرؤية النتائج والرسم التوضيحي
+            - الرسم سيوضح جميع القياسات والزوايا بشكل واضح
+            """)
+    
+    finish_rerun(rerun, triggered_by(('calc_hyp',)))
+
+@st.fragment
+def _rafter_tab(store):
+    """تبويب حساب الشتلة: يعاد تشغيله وحده عند التفاعل معه دون بقية التبويبات"""
+    rerun = start_rerun('tan/rafter')
+    
+    st.header("🏗️ حساب الشتلة")
+    
+    col1, col2 = st.columns([1, 1.2])
+    
+    with col1:
+        st.subheader("🎯 إدخال البيانات")
+        
+        with st.form("raft_form", border=False):
             col2a, col2b = st.columns(2)
             with col2a:
                 width_raft_text = st.text_input("عرض الجملون (متر):", value="40", key="width_raft_text")
             with col2b:
                 height_raft_cm_text = st.text_input("ارتفاع الجملون (سم):", value="200", key="height_raft_cm_text")
-            
-            if st.button("🧮 حساب الشتلة", key="calc_raft", use_container_width=True):
-                try:
-                    width_raft = float(width_raft_text)
-                    height_raft_cm = float(height_raft_cm_text)
-                    
-                    if width_raft > 0 and height_raft_cm > 0:
-                        height_raft_m = height_raft_cm / 100
-                        helf = width_raft / 2
-                        beem = math.sqrt(helf**2 + height_raft_m**2)
-                        angle = math.degrees(math.atan(height_raft_m / helf))
-                        
-                        st.session_state.rafter = beem
-                        st.session_state.rafter_angle = angle
-                        
-                        st.subheader("📊 النتائج")
-                        st.success(f"""
-                        **🏗️ نتائج حساب الشتلة:**
-                        
-                        **📐 البيانات المدخلة:**
-                        - عرض الجملون: {width_raft} متر
-                        - ارتفاع الجملون: {height_raft_cm} سم ({height_raft_m} متر)
-                        
-                        **📏 النتائج المحسوبة:**
-                        - نصف العرض: {helf} متر
-                        - طول الشتلة الواحدة: {beem:.3f} متر
-                        - الطول الكلي للشتلتين: {beem * 2:.3f} متر
-                        - زاوية الشتلة: {angle:.2f}°
-
-                        **🔢 المعادلات المستخدمة:**
-                        - نصف العرض = العرض ÷ 2 = {width_raft} ÷ 2 = {helf} متر
-                        - طول الشتلة = √(نصف_العرض² + الارتفاع²) = √({helf}² + {height_raft_m}²) = {beem:.3f} متر
-                        - الزاوية = tan⁻¹(الارتفاع ÷ نصف_العرض) = tan⁻¹({height_raft_m} ÷ {helf}) = {angle:.2f}°
-                        """)
-                        
-                        st.session_state.width_raft_value = width_raft
-                        st.session_state.height_raft_m_value = height_raft_m
-                        st.session_state.helf_raft_value = helf
-                        
-                    else:
-                        st.error("❌ يجب أن تكون القيم أكبر من الصفر")
-                        
-                except ValueError:
-                    st.error("❌ يرجى إدخال قيم رقمية صحيحة")
+            submitted = st.form_submit_button("🧮 حساب الشتلة", key="calc_raft", use_container_width=True)
         
-        with col2:
-            st.subheader("🎨 الرسم التوضيحي")
-            if st.session_state.rafter > 0:
-                width_raft = st.session_state.width_raft_value
-                height_raft_m = st.session_state.height_raft_m_value
-                helf = st.session_state.helf_raft_value
-                beem = st.session_state.rafter
-                angle = st.session_state.rafter_angle
-                
-                fig = create_clear_triangle_figure(
-                    width_raft, height_raft_m, helf, beem, angle,
-                    "رسم توضيحي للجملون والشتلات"
-                )
-                st.pyplot(fig)
+        if submitted:
+            try:
+                width_raft = float(width_raft_text)
+                height_raft_cm = float(height_raft_cm_text)
                 
-                st.info(f"""
-                **💡 معلومات تقنية عن الشتلات:**
-                - طول الشتلة الواحدة: {beem:.3f} متر
-                - الطول الإجمالي المطلوب: {beem * 2:.3f} متر
-                - زاوية القص المطلوبة: {angle:.2f}°
-                - نسبة الانحدار: {height_raft_m/helf*100:.1f}%
-                """)
+                if width_raft > 0 and height_raft_cm > 0:
+                    result = calculate_rafter(width_raft, height_raft_cm)
+                    height_raft_m = result['height_m']
+                    helf, beem, angle = result['helf'], result['beem'], result['angle']
+                    
+                    store.put('raft_result', result)
+                    
+                    st.subheader("📊 النتائج")
+                    st.success(f"""
+                    **🏗️ نتائج حساب الشتلة:**
+                    
+                    **📐 البيانات المدخلة:**
+                    - عرض الجملون: {width_raft} متر
+                    - ارتفاع الجملون: {height_raft_cm} سم ({height_raft_m} متر)
+                    
+                    **📏 النتائج المحسوبة:**
+                    - نصف العرض: {helf} متر
+                    - طول الشتلة الواحدة: {beem:.3f} متر
+                    - الطول الكلي للشتلتين: {beem * 2:.3f} متر
+                    - زاوية الشتلة: {angle:.2f}°
 
-    with tab3:
-        st.header("📏 حساب الزوايا")
-        
-        col1, col2 = st.columns([1, 1.2])
-        
-        with col1:
-            st.subheader("🎯 إدخال البيانات")
+                    **🔢 المعادلات المستخدمة:**
+                    - نصف العرض = العرض ÷ 2 = {width_raft} ÷ 2 = {helf} متر
+                    - طول الشتلة = √(نصف_العرض² + الارتفاع²) = √({helf}² + {height_raft_m}²) = {beem:.3f} متر
+                    - الزاوية = tan⁻¹(الارتفاع ÷ نصف_العرض) = tan⁻¹({height_raft_m} ÷ {helf}) = {angle:.2f}°
+                    """)
+                    
+                else:
+                    st.error("❌ يجب أن تكون القيم أكبر من الصفر")
+                    
+            except ValueError:
+                st.error("❌ يرجى إدخال قيم رقمية صحيحة")
+    
+    with col2:
+        st.subheader("🎨 الرسم التوضيحي")
+        result = store.get('raft_result')
+        if result is not None:
+            width_raft, height_raft_m = result.width, result.height_m
+            helf, beem, angle = result.helf, result.beem, result.angle
             
+            image = render_triangle(
+                width_raft, height_raft_m, helf, beem, angle,
+                "رسم توضيحي للجملون والشتلات",
+                top_angle=_session_top_angle(store)
+            )
+            st.image(image, width="stretch")
+            
+            st.info(f"""
+            **💡 معلومات تقنية عن الشتلات:**
+            - طول الشتلة الواحدة: {beem:.3f} متر
+            - الطول الإجمالي المطلوب: {beem * 2:.3f} متر
+            - زاوية القص المطلوبة: {angle:.2f}°
+            - نسبة الانحدار: {height_raft_m/helf*100:.1f}%
+            """)
+    
+    finish_rerun(rerun, triggered_by(('calc_raft',)))
+
+@st.fragment
+def _angles_tab(store):
+    """تبويب حساب الزوايا: يعاد تشغيله وحده عند التفاعل معه دون بقية التبويبات"""
+    rerun = start_rerun('tan/angles')
+    
+    st.header("📏 حساب الزوايا")
+    
+    col1, col2 = st.columns([1, 1.2])
+    
+    with col1:
+        st.subheader("🎯 إدخال البيانات")
+        
+        with st.form("ang_form", border=False):
             col3a, col3b = st.columns(2)
             with col3a:
                 base_ang_text = st.text_input("القاعدة (متر):", value="40", key="base_ang_text")
             with col3b:
                 height_ang_text = st.text_input("الارتفاع (متر):", value="2", key="height_ang_text")
-            
-            if st.button("🧮 حساب الزوايا", key="calc_ang", use_container_width=True):
-                try:
-                    base_ang = float(base_ang_text)
-                    height_ang = float(height_ang_text)
-                    
-                    if base_ang > 0 and height_ang > 0:
-                        helf = base_ang / 2
-                        angle = math.degrees(math.atan(height_ang / helf))
-                        top_angle = 180 - (2 * angle)
-                        
-                        st.session_state.angle = angle
-                        st.session_state.top_angle = top_angle
-                        st.session_state.helf_ang = helf
-                        
-                        st.subheader("📊 النتائج")
-                        st.success(f"""
-                        **📏 نتائج حساب الزوايا:**
-                        
-                        **📐 البيانات المدخلة:**
-                        - القاعدة: {base_ang} متر
-                        - الارتفاع: {height_ang} متر
-                        
-                        **📐 النتائج المحسوبة:**
-                        - نصف القاعدة: {helf} متر
-                        - زاوية القاعدة: {angle:.2f}°
-                        - زاوية القمة: {top_angle:.2f}°
-                        - زاوية قص الرأس: {top_angle / 2:.2f}°
-
-                        **🔢 المعادلات المستخدمة:**
-                        - نصف القاعدة = القاعدة ÷ 2 = {base_ang} ÷ 2 = {helf} متر
-                        - زاوية القاعدة = tan⁻¹(الارتفاع ÷ نصف_القاعدة) = tan⁻¹({height_ang} ÷ {helf}) = {angle:.2f}°
-                        - زاوية القمة = 180 - (2 × زاوية_القاعدة) = 180 - (2 × {angle:.2f}) = {top_angle:.2f}°
-                        - زاوية قص الرأس = زاوية_القمة ÷ 2 = {top_angle:.2f} ÷ 2 = {top_angle / 2:.2f}°
-                        """)
-                        
-                        st.session_state.base_ang_value = base_ang
-                        st.session_state.height_ang_value = height_ang
-                        
-                    else:
-                        st.error("❌ يجب أن تكون القيم أكبر من الصفر")
-                        
-                except ValueError:
-                    st.error("❌ يرجى إدخال قيم رقمية صحيحة")
+            submitted = st.form_submit_button("🧮 حساب الزوايا", key="calc_ang", use_container_width=True)
         
-        with col2:
-            st.subheader("🎨 الرسم التوضيحي")
-            if st.session_state.angle > 0:
-                base_ang = st.session_state.base_ang_value
-                height_ang = st.session_state.height_ang_value
-                helf = st.session_state.helf_ang
-                angle = st.session_state.angle
-                top_angle = st.session_state.top_angle
-                
-                fig = create_clear_triangle_figure(
-                    base_ang, height_ang, helf, st.session_state.hypotenuse, angle,
-                    "رسم توضيحي للزوايا"
-                )
-                st.pyplot(fig)
+        if submitted:
+            try:
+                base_ang = float(base_ang_text)
+                height_ang = float(height_ang_text)
                 
-                st.info(f"""
-                **💡 معلومات عن الزوايا:**
-                - زاوية القاعدة: {angle:.2f}° (تستخدم في قص الأطراف)
-                - زاوية القمة: {top_angle:.2f}° (الزاوية بين الشتلتين)
-                - زاوية قص الرأس: {top_angle / 2:.2f}° (لكل شتلة)
-                - مجموع زوايا المثلث: 180° (للتحقق: {angle:.2f} + {angle:.2f} + {top_angle:.2f} = 180°)
-                """)
+                if base_ang > 0 and height_ang > 0:
+                    result = calculate_angles(base_ang, height_ang)
+                    helf, angle, top_angle = result['helf'], result['angle'], result['top_angle']
+                    
+                    store.put('ang_result', result)
+                    
+                    st.subheader("📊 النتائج")
+                    st.success(f"""
+                    **📏 نتائج حساب الزوايا:**
+                    
+                    **📐 البيانات المدخلة:**
+                    - القاعدة: {base_ang} متر
+                    - الارتفاع: {height_ang} متر
+                    
+                    **📐 النتائج المحسوبة:**
+                    - نصف القاعدة: {helf} متر
+                    - زاوية القاعدة: {angle:.2f}°
+                    - زاوية القمة: {top_angle:.2f}°
+                    - زاوية قص الرأس: {top_angle / 2:.2f}°
 
-    with tab4:
-        st.header("📊 حساب الكمر")
-        
-        col1, col2 = st.columns([1, 1.2])
-        
-        with col1:
-            st.subheader("🎯 إدخال بيانات الكمر")
+                    **🔢 المعادلات المستخدمة:**
+                    - نصف القاعدة = القاعدة ÷ 2 = {base_ang} ÷ 2 = {helf} متر
+                    - زاوية القاعدة = tan⁻¹(الارتفاع ÷ نصف_القاعدة) = tan⁻¹({height_ang} ÷ {helf}) = {angle:.2f}°
+                    - زاوية القمة = 180 - (2 × زاوية_القاعدة) = 180 - (2 × {angle:.2f}) = {top_angle:.2f}°
+                    - زاوية قص الرأس = زاوية_القمة ÷ 2 = {top_angle:.2f} ÷ 2 = {top_angle / 2:.2f}°
+                    """)
+                    
+                else:
+                    st.error("❌ يجب أن تكون القيم أكبر من الصفر")
+                    
+            except ValueError:
+                st.error("❌ يرجى إدخال قيم رقمية صحيحة")
+    
+    with col2:
+        st.subheader("🎨 الرسم التوضيحي")
+        result = store.get('ang_result')
+        if result is not None:
+            base_ang, height_ang = result.base, result.height
+            helf, angle, top_angle = result.helf, result.angle, result.top_angle
+            # الوتر المرسوم يأتي من تبويب حساب الوتر كما كان سابقاً
+            hyp_result = store.get('hyp_result')
             
+            image = render_triangle(
+                base_ang, height_ang, helf, hyp_result.beem if hyp_result is not None else 0, angle,
+                "رسم توضيحي للزوايا",
+                top_angle=_session_top_angle(store)
+            )
+            st.image(image, width="stretch")
+            
+            st.info(f"""
+            **💡 معلومات عن الزوايا:**
+            - زاوية القاعدة: {angle:.2f}° (تستخدم في قص الأطراف)
+            - زاوية القمة: {top_angle:.2f}° (الزاوية بين الشتلتين)
+            - زاوية قص الرأس: {top_angle / 2:.2f}° (لكل شتلة)
+            - مجموع زوايا المثلث: 180° (للتحقق: {angle:.2f} + {angle:.2f} + {top_angle:.2f} = 180°)
+            """)
+    
+    finish_rerun(rerun, triggered_by(('calc_ang',)))
+
+@st.fragment
+def _kamer_tab(store):
+    """تبويب حساب الكمر: يعاد تشغيله وحده عند التفاعل معه دون بقية التبويبات"""
+    rerun = start_rerun('tan/kamer')
+    
+    st.header("📊 حساب الكمر")
+    
+    col1, col2 = st.columns([1, 1.2])
+    
+    with col1:
+        st.subheader("🎯 إدخال بيانات الكمر")
+        
+        with st.form("kamer_form", border=False):
             col4a, col4b = st.columns(2)
             with col4a:
                 kamer_width_text = st.text_input("عرض الكمر (متر):", value="40", key="kamer_width_text")
             with col4b:
                 kamer_height_text = st.text_input("ارتفاع الكمر (متر):", value="2", key="kamer_height_text")
-            
-            if st.button("🧮 حساب الكمر", key="calc_kamer", use_container_width=True):
-                try:
-                    kamer_width = float(kamer_width_text)
-                    kamer_height = float(kamer_height_text)
-                    
-                    if kamer_width > 0 and kamer_height > 0:
-                        helf = kamer_width / 2
-                        beem = math.sqrt(helf**2 + kamer_height**2)
-                        angle = math.degrees(math.atan(kamer_height / helf))
-                        
-                        st.subheader("📊 نتائج حساب الكمر")
-                        st.success(f"""
-                        **📊 نتائج حساب الكمر:**
-                        
-                        **📐 البيانات المدخلة:**
-                        - عرض الكمر: {kamer_width} متر
-                        - ارتفاع الكمر: {kamer_height} متر
-                        
-                        **📏 النتائج المحسوبة:**
-                        - نصف العرض: {helf} متر
-                        - طول الكمر: {beem:.3f} متر
-                        - الطول الإجمالي: {beem * 2:.3f} متر
-                        - زاوية الكمر: {angle:.2f}°
-
-                        **🔢 المعادلات المستخدمة:**
-                        - نصف العرض = العرض ÷ 2 = {kamer_width} ÷ 2 = {helf} متر
-                        - طول الكمر = √(نصف_العرض² + الارتفاع²) = √({helf}² + {kamer_height}²) = {beem:.3f} متر
-                        - الزاوية = tan⁻¹(الارتفاع ÷ نصف_العرض) = tan⁻¹({kamer_height} ÷ {helf}) = {angle:.2f}°
-                        """)
-                        
-                        st.session_state.kamer_width = kamer_width
-                        st.session_state.kamer_height = kamer_height
-                        st.session_state.kamer_beem = beem
-                        st.session_state.kamer_angle = angle
-                        st.session_state.kamer_helf = helf
-                        
-                    else:
-                        st.error("❌ يجب أن تكون القيم أكبر من الصفر")
-                        
-                except ValueError:
-                    st.error("❌ يرجى إدخال قيم رقمية صحيحة")
+            submitted = st.form_submit_button("🧮 حساب الكمر", key="calc_kamer", use_container_width=True)
         
-        with col2:
-            st.subheader("🎨 الرسم التوضيحي للكمر")
-            if 'kamer_width' in st.session_state:
-                kamer_width = st.session_state.kamer_width
-                kamer_height = st.session_state.kamer_height
-                helf = st.session_state.kamer_helf
-                beem = st.session_state.kamer_beem
-                angle = st.session_state.kamer_angle
-                
-                fig = create_clear_triangle_figure(
-                    kamer_width, kamer_height, helf, beem, angle,
-                    "رسم توضيحي للكمر"
-                )
-                st.pyplot(fig)
+        if submitted:
+            try:
+                kamer_width = float(kamer_width_text)
+                kamer_height = float(kamer_height_text)
                 
-                st.info(f"""
-                **💡 معلومات تقنية عن الكمر:**
-                - طول كل جزء مائل: {beem:.3f} متر
-                - الطول الإجمالي للمواد: {beem * 2:.3f} متر
-                - زاوية التثبيت: {angle:.2f}°
-                - مساحة السطح: {kamer_width * beem:.2f} متر مربع
-                """)
+                if kamer_width > 0 and kamer_height > 0:
+                    result = calculate_kamer(kamer_width, kamer_height)
+                    helf, beem, angle = result['helf'], result['beem'], result['angle']
+                    
+                    st.subheader("📊 نتائج حساب الكمر")
+                    st.success(f"""
+                    **📊 نتائج حساب الكمر:**
+                    
+                    **📐 البيانات المدخلة:**
+                    - عرض الكمر: {kamer_width} متر
+                    - ارتفاع الكمر: {kamer_height} متر
+                    
+                    **📏 النتائج المحسوبة:**
+                    - نصف العرض: {helf} متر
+                    - طول الكمر: {beem:.3f} متر
+                    - الطول الإجمالي: {beem * 2:.3f} متر
+                    - زاوية الكمر: {angle:.2f}°
+
+                    **🔢 المعادلات المستخدمة:**
+                    - نصف العرض = العرض ÷ 2 = {kamer_width} ÷ 2 = {helf} متر
+                    - طول الكمر = √(نصف_العرض² + الارتفاع²) = √({helf}² + {kamer_height}²) = {beem:.3f} متر
+                    - الزاوية = tan⁻¹(الارتفاع ÷ نصف_العرض) = tan⁻¹({kamer_height} ÷ {helf}) = {angle:.2f}°
+                    """)
+                    
+                    store.put('kamer_result', result)
+                    
+                else:
+                    st.error("❌ يجب أن تكون القيم أكبر من الصفر")
+                    
+            except ValueError:
+                st.error("❌ يرجى إدخال قيم رقمية صحيحة")
+    
+    with col2:
+        st.subheader("🎨 الرسم التوضيحي للكمر")
+        result = store.get('kamer_result')
+        if result is not None:
+            kamer_width, kamer_height = result.width, result.height
+            helf, beem, angle = result.helf, result.beem, result.angle
+            
+            image = render_triangle(
+                kamer_width, kamer_height, helf, beem, angle,
+                "رسم توضيحي للكمر",
+                top_angle=_session_top_angle(store)
+            )
+            st.image(image, width="stretch")
+            
+            st.info(f"""
+            **💡 معلومات تقنية عن الكمر:**
+            - طول كل جزء مائل: {beem:.3f} متر
+            - الطول الإجمالي للمواد: {beem * 2:.3f} متر
+            - زاوية التثبيت: {angle:.2f}°
+            - مساحة السطح: {kamer_width * beem:.2f} متر مربع
+            """)
+    
+    finish_rerun(rerun, triggered_by(('calc_kamer',)))
+
+@st.fragment
+def _sweep_tab(store):
+    """تبويب مسح التصاميم: يعاد تشغيله وحده عند التفاعل معه دون بقية التبويبات"""
+    rerun = start_rerun('tan/sweep')
+    
+    st.header("🔁 مسح تصاميم الجملون")
+    st.caption("حساب جميع تركيبات العرض والارتفاع دفعة واحدة بدلاً من تجربتها واحدة تلو الأخرى")
+    
+    with st.form("sweep_form"):
+        col5a, col5b, col5c = st.columns(3)
+        with col5a:
+            sweep_width_min = st.number_input("أقل عرض (متر):", min_value=0.1, value=10.0, key="sweep_width_min")
+            sweep_width_max = st.number_input("أكبر عرض (متر):", min_value=0.1, value=60.0, key="sweep_width_max")
+            sweep_width_steps = st.number_input("عدد قيم العرض:", min_value=1, max_value=2000, value=51, key="sweep_width_steps")
+        with col5b:
+            sweep_unit = st.radio("وحدة الارتفاع:", ["m", "cm"], horizontal=True, key="sweep_unit",
+                                  format_func=lambda v: {'m': 'متر', 'cm': 'سنتيمتر'}[v])
+            sweep_height_min = st.number_input("أقل ارتفاع:", min_value=0.01, value=1.0, key="sweep_height_min")
+            sweep_height_max = st.number_input("أكبر ارتفاع:", min_value=0.01, value=6.0, key="sweep_height_max")
+        with col5c:
+            sweep_height_steps = st.number_input("عدد قيم الارتفاع:", min_value=1, max_value=2000, value=51, key="sweep_height_steps")
+        submitted = st.form_submit_button("🧮 حساب المسح", key="calc_sweep", use_container_width=True)
+    
+    # الترتيب خارج النموذج فيطبق فوراً على نتائج المسح الحالية
+    col5f, col5g = st.columns(2)
+    with col5f:
+        sweep_metric = st.selectbox("الترتيب وخريطة الحرارة حسب:", list(SWEEP_LABELS)[3:],
+                                    format_func=SWEEP_LABELS.get, key="sweep_metric")
+    with col5g:
+        sweep_descending = st.checkbox("ترتيب تنازلي", value=False, key="sweep_descending")
+    
+    if submitted:
+        if sweep_width_min > sweep_width_max or sweep_height_min > sweep_height_max:
+            st.error("❌ يجب أن تكون القيمة الصغرى أقل من أو تساوي الكبرى")
+        else:
+            # نحفظ حدود المسح فقط، فإعادة الحساب أرخص من إبقاء ملايين القيم في الجلسة
+            store.put('sweep_params', (
+                sweep_width_min, sweep_width_max, int(sweep_width_steps),
+                sweep_height_min, sweep_height_max, int(sweep_height_steps), sweep_unit,
+            ))
+    
+    sweep_params = store.get('sweep_params')
+    if sweep_params is not None:
+        width_min, width_max, width_steps, height_min, height_max, height_steps, unit = sweep_params
+        widths = np.linspace(width_min, width_max, width_steps)
+        heights = np.linspace(height_min, height_max, height_steps)
+        
+        start = time.perf_counter()
+        sweep = gable_sweep(widths, heights, unit)
+        table = sweep_table(sweep, sweep_metric, sweep_descending, SWEEP_TABLE_ROWS)
+        elapsed = time.perf_counter() - start
+        
+        st.success(f"✅ تم حساب {widths.size * heights.size:,} تركيبة في {elapsed * 1000:.1f} ms")
+        
+        col5d, col5e = st.columns([1, 1.2])
+        with col5d:
+            st.subheader(f"📋 أفضل {len(table['beem']):,} تركيبة")
+            st.dataframe({SWEEP_LABELS[name]: values for name, values in table.items()},
+                         use_container_width=True, hide_index=True)
+        with col5e:
+            st.subheader(f"🌡️ {SWEEP_LABELS[sweep_metric]}")
+            # تخفيف الشبكة الكبيرة قبل إرسالها للمتصفح
+            width_stride = max(1, widths.size // SWEEP_HEATMAP_CELLS)
+            height_stride = max(1, heights.size // SWEEP_HEATMAP_CELLS)
+            import plotly.graph_objects as go
+
+            fig = go.Figure(go.Heatmap(
+                x=sweep['height'][0, ::height_stride],
+                y=widths[::width_stride],
+                z=sweep[sweep_metric][::width_stride, ::height_stride],
+                colorscale='Viridis',
+                colorbar=dict(title=SWEEP_LABELS[sweep_metric])
+            ))
+            fig.update_layout(
+                xaxis_title='الارتفاع (م)', yaxis_title='العرض (م)',
+                height=500, margin=dict(l=40, r=20, t=30, b=40)
+            )
+            with trace('tan.sweep_heatmap_plotly'):
+                st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("""
+        **📝 تعليمات:**
+        - حدد مدى العرض ومدى الارتفاع وعدد القيم في كل منهما
+        - اضغط على زر 'حساب المسح' لحساب جميع التركيبات دفعة واحدة
+        - رتب الجدول حسب أي عمود، وتوضح خريطة الحرارة القيمة المختارة على الشبكة كاملة
+        """)
+    
+    finish_rerun(rerun, triggered_by(('calc_sweep',)))
+
+def tan_main():
+    """الدالة الرئيسية لتطبيق حاسبة الجملون"""
+    
+    rerun = start_rerun('tan')
+    
+    # إعداد صفحة Streamlit
+    st.set_page_config(page_title="حاسبة الجملون", page_icon="🏗️", layout="wide")
+
+    # تحسين إعدادات matplotlib للأفضل وضوحاً
+    matplotlib.rcParams['figure.figsize'] = [12, 9]
+    matplotlib.rcParams['font.size'] = 12
+    matplotlib.rcParams['font.weight'] = 'bold'
+    matplotlib.rcParams['axes.titlesize'] = 16
+    matplotlib.rcParams['axes.titleweight'] = 'bold'
+    matplotlib.rcParams['axes.labelsize'] = 14
+
+    # العنوان الرئيسي
+    st.title("🏗️ حاسبة الجملون - أنظمة متعددة")
+
+    # إنشاء التبويبات
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📐 حساب الوتر", "🏗️ حساب الشتلة", "📏 حساب الزوايا", "📊 حساب الكمر", "🔁 مسح التصاميم"])
+
+    # سجل نتيجة واحد لكل تبويب في مخزن الجلسة المحدود الحجم
+    store = session_store()
+
+    # كل تبويب جزء مستقل: الضغط على زر الحساب فيه يعيد تشغيله وحده ويرسم رسمه فقط
+    with tab1:
+        _hypotenuse_tab(store)
+
+    with tab2:
+        _rafter_tab(store)
+
+    with tab3:
+        _angles_tab(store)
+
+    with tab4:
+        _kamer_tab(store)
+
+    with tab5:
+        _sweep_tab(store)
 
     # الشريط الجانبي
     with st.sidebar:
@@ -500,6 +576,16 @@ def tan_main():
         st.subheader("🎨 إعدادات الرسم")
         show_grid = st.checkbox("إظهار الشبكة", value=True)
         show_angles = st.checkbox("إظهار الزوايا", value=True)
+        st.radio("صيغة الرسم", list(RENDER_FORMATS), format_func=RENDER_FORMATS.get,
+                 key="tan_render_format", horizontal=True,
+                 help="SVG يرسم فوراً بحجم صغير، و PNG يرسم بـ matplotlib ويحفظ في ذاكرة الرسوم")
+        
+        cache_stats = _triangle_cache().stats()
+        st.caption(f"ذاكرة الرسوم: {cache_stats['items']} صورة، "
+                   f"{cache_stats['bytes'] / 1024 / 1024:.1f} MB، "
+                   f"إصابات {cache_stats['hits']} / إخفاقات {cache_stats['misses']}")
+        
+        show_session_report(store)
         
         st.header("🧹 تنظيف")
         if st.button("مسح جميع الحقول", use_container_width=True):
@@ -518,6 +604,9 @@ def tan_main():
 
     # تشغيل التطبيق
     st.success("✅ تم تحميل الآلة الحاسبة بنجاح! اختر تبويباً للبدء.")
+    
+    with st.sidebar:
+        show_rerun_report(finish_rerun(rerun, triggered_by(CALC_KEYS)))
 
 if __name__ == "__main__":
     tan_main()
\ No newline at end of file
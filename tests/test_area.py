@@ -0,0 +1,92 @@
+"""مطابقة محرك المساحات الدفعي والمتدفق مع scipy.integrate
+
+تغطي تصحيح سمبسون للعدد الزوجي من النقاط، وإزاحات الأراضي المسطحة في
+calculate_batch، ونقل الذيل بين دفعات StreamingAreaAccumulator.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy.integrate import simpson, trapezoid
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.area import (
+    LandAreaCalculator,
+    StreamingAreaAccumulator,
+    iter_survey_chunks,
+    pack_parcels,
+    simpson_area,
+    stream_survey_areas,
+)
+
+COUNTS = (1, 2, 3, 4, 5)
+CHUNK_SIZES = (1, 2, 3, 4, 7, 1000)
+
+
+def make_land(n, seed=0):
+    """نقاط بتباعد غير منتظم حتى تظهر أخطاء أوزان سمبسون"""
+    rng = np.random.default_rng(seed + n)
+    return np.cumsum(rng.uniform(0.3, 3.0, n)), rng.uniform(5.0, 30.0, n)
+
+
+@pytest.mark.parametrize('n', COUNTS)
+def test_simpson_area_matches_scipy(n):
+    x, y = make_land(n)
+    assert simpson_area(x, y) == pytest.approx(simpson(y, x=x), rel=1e-12, abs=1e-12)
+
+
+def test_calculate_batch_matches_scipy_per_parcel():
+    # كل الأعداد مع تكرارها في ترتيب مختلط حتى تتجاور أراضٍ زوجية وفردية
+    parcels = [make_land(n, seed) for seed, n in enumerate((2, 5, 3, 4, 2, 4, 5, 3, 9, 10))]
+    areas = LandAreaCalculator.calculate_batch(*pack_parcels(parcels))
+    for i, (x, y) in enumerate(parcels):
+        assert areas['طريقة سمبسون'][i] == pytest.approx(simpson(y, x=x), rel=1e-12)
+        assert areas['طريقة شبه المنحرف'][i] == pytest.approx(trapezoid(y, x=x), rel=1e-12)
+        assert areas['طريقة التكامل'][i] == pytest.approx(trapezoid(y, x=x), rel=1e-12)
+
+
+def test_calculate_batch_rejects_single_point_parcel():
+    with pytest.raises(ValueError):
+        LandAreaCalculator.calculate_batch(*pack_parcels([make_land(3), make_land(1)]))
+
+
+@pytest.mark.parametrize('n', COUNTS + (10, 11))
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_streaming_matches_scipy(n, chunk_size):
+    x, y = make_land(n)
+    accumulator = StreamingAreaAccumulator()
+    for start in range(0, n, chunk_size):
+        accumulator.update(x[start:start + chunk_size], y[start:start + chunk_size])
+    areas = accumulator.result()
+    assert accumulator.count == n
+    assert areas['طريقة سمبسون'] == pytest.approx(simpson(y, x=x), rel=1e-12, abs=1e-12)
+    assert areas['طريقة شبه المنحرف'] == pytest.approx(trapezoid(y, x=x), rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize('fmt', ('csv', 'npy', 'raw'))
+@pytest.mark.parametrize('chunk_size', (1, 3, 1000))
+def test_survey_files_match_scipy(tmp_path, fmt, chunk_size):
+    x, y = make_land(11)
+    path = tmp_path / f'survey.{fmt}'
+    pairs = np.column_stack((x, y))
+    if fmt == 'csv':
+        np.savetxt(path, pairs, delimiter=',', header='length,width', comments='', fmt='%.17g')
+    elif fmt == 'npy':
+        np.save(path, pairs)
+    else:
+        pairs.astype('<f8').tofile(path)
+    areas = stream_survey_areas(str(path), chunk_size=chunk_size, fmt=fmt).result()
+    assert areas['طريقة سمبسون'] == pytest.approx(simpson(y, x=x), rel=1e-12)
+
+
+@pytest.mark.parametrize('fmt', ('csv', 'npy', 'raw'))
+def test_empty_survey_file_has_no_chunks(tmp_path, fmt):
+    path = tmp_path / f'empty.{fmt}'
+    if fmt == 'npy':
+        np.save(path, np.empty((0, 2)))
+    else:
+        path.write_bytes(b'')
+    assert list(iter_survey_chunks(str(path), fmt=fmt)) == []
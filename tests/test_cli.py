@@ -0,0 +1,88 @@
+"""تشغيل مهام الحسابات من سطر الأوامر"""
+import csv
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from scipy.integrate import simpson
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(ROOT)
+
+from calc_core.cli import main, run_jobs
+from calc_core.area import calculate_land_areas
+from calc_core.gable import calculate_hypotenuse
+
+JOBS = [
+    {'type': 'hypotenuse', 'base': 40, 'height': 2},
+    {'type': 'area', 'lengths': [0, 13, 15, 20], 'widths': [10, 10, 9, 9]},
+    {'type': 'area', 'lengths': '0;5;9', 'widths': '4;6;5', 'interpolation': 'cubic'},
+    {'type': 'area', 'lengths': [0, 2, 3, 7, 8], 'widths': [1, 3, 2, 4, 2]},
+    {'type': 'prism', 'base': 10, 'height': 7, 'depth': 12},
+]
+
+
+def write_jsonl(path, jobs):
+    path.write_text(''.join(json.dumps(job) + '\n' for job in jobs), encoding='utf-8')
+    return str(path)
+
+
+def test_results_keep_job_order_with_batched_areas():
+    results = run_jobs(JOBS)
+    assert [record['job'] for record in results] == list(range(len(JOBS)))
+    assert [record['type'] for record in results] == [job['type'] for job in JOBS]
+    assert results[0]['result']['beem'] == pytest.approx(calculate_hypotenuse(40.0, 2.0).beem)
+    # مهام المساحة الخطية تحسب دفعة واحدة وتعود إلى مواضعها
+    for i in (1, 3):
+        lengths, widths = JOBS[i]['lengths'], JOBS[i]['widths']
+        assert results[i]['result']['طريقة سمبسون'] == pytest.approx(simpson(widths, x=lengths))
+    cubic = calculate_land_areas([0.0, 5.0, 9.0], [4.0, 6.0, 5.0], 'auto', 'cubic')
+    assert results[2]['result'] == pytest.approx(cubic)
+
+
+def test_errors_are_reported_per_job():
+    results = run_jobs([
+        {'type': 'hypotenuse', 'base': 3},
+        {'type': 'area', 'lengths': [0, 1], 'widths': [1]},
+        {'type': 'unknown'},
+        {'type': 'kamer', 'width': 8, 'height': 2},
+    ])
+    assert [('error' in record) for record in results] == [True, True, True, False]
+    assert 'height' in results[0]['error']
+
+
+def test_exit_code(tmp_path):
+    good = write_jsonl(tmp_path / 'good.jsonl', JOBS)
+    bad = write_jsonl(tmp_path / 'bad.jsonl', [{'type': 'rafter', 'width': 'x', 'height_cm': 10}])
+    output = tmp_path / 'out.jsonl'
+    assert main([good, '-o', str(output)]) == 0
+    assert len(output.read_text(encoding='utf-8').splitlines()) == len(JOBS)
+    assert main([good, bad, '-o', str(output)]) == 1
+    last = json.loads(output.read_text(encoding='utf-8').splitlines()[-1])
+    assert last['job'] == len(JOBS) and 'error' in last
+
+
+def test_csv_input_and_output(tmp_path):
+    source = tmp_path / 'jobs.csv'
+    source.write_text('type,base,height,width,height_cm\n'
+                      'hypotenuse,40,2,,\n'
+                      'rafter,,,8,150\n', encoding='utf-8')
+    output = tmp_path / 'out.csv'
+    assert main([str(source), '-f', 'csv', '-o', str(output)]) == 0
+    with open(output, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['type'] for row in rows] == ['hypotenuse', 'rafter']
+    assert float(rows[0]['beem']) == pytest.approx(calculate_hypotenuse(40.0, 2.0).beem)
+
+
+def test_module_entry_point(tmp_path):
+    bad = write_jsonl(tmp_path / 'bad.jsonl', JOBS[:1] + [{'type': 'prism', 'base': 1}])
+    completed = subprocess.run([sys.executable, '-m', 'calc_core', bad], cwd=ROOT,
+                               capture_output=True, text=True, encoding='utf-8')
+    assert completed.returncode == 1
+    records = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert 'result' in records[0] and 'error' in records[1]
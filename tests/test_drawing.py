@@ -0,0 +1,101 @@
+"""وصف الرسم التصريحي: البصمة والمقارنة والحدود وواجهات الرسم"""
+import os
+import pickle
+import subprocess
+import sys
+import warnings
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(ROOT)
+
+from calc_core.area import land_drawing
+from calc_core.drawing import (
+    Arc,
+    Drawing,
+    Label,
+    Markers,
+    Path,
+    as_points,
+    diff_drawings,
+    drawing_bounds,
+    drawing_fingerprint,
+)
+from calc_core.gable import calculate_hypotenuse, triangle_drawing
+from calc_core.prism import calculate_prism_geometry, prism_drawing
+
+
+def triangle(height=2.0, **options):
+    result = calculate_hypotenuse(8.0, height)
+    return triangle_drawing(8.0, height, result.helf, result.beem, result.angle, 'مثلث', **options)
+
+
+def test_spec_is_built_from_primitives():
+    drawing = triangle(top_angle=120.0)
+    kinds = {type(item) for item in drawing.elements}
+    assert {Path, Markers, Label, Arc} <= kinds
+    assert drawing.dims == 2 and drawing.equal
+    assert prism_drawing(calculate_prism_geometry(8.0, 3.0, 10.0)).dims == 3
+
+
+def test_pickle_round_trip():
+    drawing = triangle()
+    assert pickle.loads(pickle.dumps(drawing)) == drawing
+
+
+def test_fingerprint_follows_content():
+    assert drawing_fingerprint(triangle()) == drawing_fingerprint(triangle())
+    assert drawing_fingerprint(triangle()) != drawing_fingerprint(triangle(height=2.5))
+    assert drawing_fingerprint(triangle()) != drawing_fingerprint(triangle(show_angles=False))
+
+
+def test_fingerprint_is_stable_across_processes():
+    script = ("from calc_core.gable import calculate_hypotenuse, triangle_drawing;"
+              "from calc_core.drawing import drawing_fingerprint;"
+              "r = calculate_hypotenuse(8.0, 2.0);"
+              "print(drawing_fingerprint(triangle_drawing(8.0, 2.0, r.helf, r.beem, r.angle, 'مثلث')))")
+    output = subprocess.check_output([sys.executable, '-c', script], cwd=ROOT,
+                                     env={**os.environ, 'PYTHONHASHSEED': '123'}, text=True)
+    assert output.strip() == drawing_fingerprint(triangle())
+
+
+def test_diff_drawings():
+    old = land_drawing([0, 13, 15, 20], [10, 10, 9, 9], {'a': 1.0})
+    assert diff_drawings(old, old) == []
+    moved = land_drawing([0, 13, 15, 20], [10, 11, 9, 9], {'a': 1.0})
+    changed = [index for index, _, _ in diff_drawings(old, moved)]
+    # الحدود والمساحة وتسمية النقطة الثانية فقط
+    assert changed == [0, 1, 3]
+    longer = land_drawing([0, 13, 15, 20, 25], [10, 10, 9, 9, 8], {'a': 1.0})
+    *_, (index, before, after) = diff_drawings(old, longer)
+    assert index == len(longer.elements) - 1 and before is None and after is not None
+    assert diff_drawings(longer, old)[-1][2] is None
+
+
+def test_bounds():
+    drawing = Drawing((
+        Path(as_points([[0, 0], [4, 1]]), 'black'),
+        Arc((10.0, 0.0), 2.0, 0.0, 90.0, 'red'),
+        Label((0.5, 0.5), 'نص خارج البيانات', coords='axes'),
+        Label((-3.0, 7.0), 'نص'),
+    ))
+    assert drawing_bounds(drawing) == ((-3.0, 12.0), (-2.0, 7.0))
+    assert drawing_bounds(Drawing(())) == ((0.0, 1.0), (0.0, 1.0))
+
+
+def test_backends_render_the_same_spec():
+    from drawing_backends import BACKENDS, render_drawing, to_plotly
+
+    drawing = triangle()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        assert render_drawing(drawing, 'png').startswith(b'\x89PNG')
+    assert render_drawing(drawing, 'svg').startswith('<svg')
+    fig = to_plotly(prism_drawing(calculate_prism_geometry(8.0, 3.0, 10.0)))
+    assert {trace.type for trace in fig.data} >= {'mesh3d', 'scatter3d'}
+    assert set(BACKENDS) == {'matplotlib', 'png', 'plotly', 'svg'}
+    with pytest.raises(ValueError):
+        render_drawing(drawing, 'pdf')
@@ -0,0 +1,35 @@
+"""ذاكرة الصور الدائمة على القرص"""
+import os
+import sys
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import figure_cache
+from figure_cache import DiskRenderCache
+
+
+def test_overwrite_keeps_byte_count(tmp_path):
+    cache = DiskRenderCache(str(tmp_path), max_bytes=1000)
+    cache.put(('triangle', 1), b'x' * 300)
+    cache.put(('triangle', 1), b'y' * 200)
+    assert cache.stats()['bytes'] == 200
+    assert cache.get(('triangle', 1)) == b'y' * 200
+    # القيمة نفسها مرات كثيرة لا تسبب حذفاً مبكراً
+    cache.put(('triangle', 2), b'z' * 200)
+    for _ in range(10):
+        cache.put(('triangle', 2), b'z' * 200)
+    assert cache.stats()['bytes'] == 400
+    assert cache.get(('triangle', 1)) == b'y' * 200
+
+
+def test_render_version_changes_the_path(tmp_path, monkeypatch):
+    cache = DiskRenderCache(str(tmp_path))
+    cache.put(('land', 1), b'old')
+    monkeypatch.setattr(figure_cache, 'RENDER_CACHE_VERSION', 'next')
+    assert cache.get(('land', 1)) is None
+
+
+def test_equal_numbers_share_a_file(tmp_path):
+    cache = DiskRenderCache(str(tmp_path))
+    assert cache.path_for(('prism3d', 40)) == cache.path_for(('prism3d', 40.0))
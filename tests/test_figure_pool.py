@@ -0,0 +1,44 @@
+"""مخزون رسومات matplotlib"""
+import gc
+import os
+import sys
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figure_pool import FigurePool
+
+
+def test_release_reuses_figure():
+    pool = FigurePool()
+    fig = pool.acquire((4, 3))
+    assert pool.stats()['in_use'] == 1
+    pool.release(fig)
+    assert pool.acquire((4, 3)) is fig
+    assert pool.stats()['reused'] == 1
+
+
+def test_closing_releases_after_error():
+    pool = FigurePool()
+    try:
+        with pool.closing(pool.acquire((4, 3))):
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    stats = pool.stats()
+    assert stats['in_use'] == 0 and stats['idle'] == 1
+
+
+def test_unreleased_figure_leaves_the_count():
+    pool = FigurePool()
+    fig = pool.acquire((4, 3))
+    assert pool.stats()['in_use'] == 1
+    del fig
+    gc.collect()
+    assert pool.stats()['in_use'] == 0
+
+
+def test_foreign_figure_is_not_pooled():
+    pool = FigurePool()
+    pool.release(FigurePool().acquire((4, 3)))
+    assert pool.stats()['idle'] == 0
@@ -0,0 +1,65 @@
+"""مسح الجملون عرض × ارتفاع مقابل الحسابات المفردة"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.gable import SWEEP_COLUMNS, calculate_kamer, calculate_rafter, gable_sweep, sweep_table
+
+WIDTHS = np.array([4.0, 7.5, 12.0])
+HEIGHTS = np.array([0.5, 1.25, 2.0, 3.0])
+
+
+def test_sweep_matches_scalar_calls():
+    sweep = gable_sweep(WIDTHS, HEIGHTS)
+    assert sweep['beem'].shape == (WIDTHS.size, HEIGHTS.size)
+    for i, width in enumerate(WIDTHS):
+        for j, height in enumerate(HEIGHTS):
+            kamer = calculate_kamer(width, height)
+            rafter = calculate_rafter(width, height * 100)
+            assert sweep['width'][i, j] == width and sweep['height'][i, j] == height
+            for name in ('helf', 'beem', 'total_length', 'angle', 'surface_area'):
+                assert sweep[name][i, j] == pytest.approx(kamer[name], rel=1e-12)
+            assert sweep['slope_percent'][i, j] == pytest.approx(rafter.slope_percent, rel=1e-12)
+            assert sweep['top_angle'][i, j] == pytest.approx(180 - 2 * kamer.angle, rel=1e-12)
+
+
+def test_height_in_centimetres():
+    in_cm = gable_sweep(WIDTHS, HEIGHTS * 100, height_unit='cm')
+    in_m = gable_sweep(WIDTHS, HEIGHTS)
+    for name in SWEEP_COLUMNS:
+        np.testing.assert_allclose(in_cm[name], in_m[name], rtol=1e-12)
+
+
+@pytest.mark.parametrize('widths, heights, unit', (
+    ([4.0, 0.0], [1.0], 'm'),
+    ([4.0], [-1.0], 'm'),
+    ([4.0], [1.0], 'ft'),
+))
+def test_invalid_inputs(widths, heights, unit):
+    with pytest.raises(ValueError):
+        gable_sweep(widths, heights, height_unit=unit)
+
+
+@pytest.mark.parametrize('descending', (False, True))
+@pytest.mark.parametrize('limit', (None, 1, 5, 12, 100))
+def test_table_sorted_and_limited(descending, limit):
+    sweep = gable_sweep(WIDTHS, HEIGHTS)
+    table = sweep_table(sweep, 'surface_area', descending, limit)
+    expected = np.sort(sweep['surface_area'].ravel())
+    if descending:
+        expected = expected[::-1]
+    expected = expected[:limit]
+    np.testing.assert_array_equal(table['surface_area'], expected)
+    # صفوف الجدول متسقة: كل صف يطابق الحساب المفرد لعرضه وارتفاعه
+    for width, height, beem in zip(table['width'], table['height'], table['beem']):
+        assert beem == pytest.approx(calculate_kamer(width, height).beem, rel=1e-12)
+
+
+def test_table_rejects_unknown_column():
+    with pytest.raises(ValueError):
+        sweep_table(gable_sweep(WIDTHS, HEIGHTS), 'volume')
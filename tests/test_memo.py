@@ -0,0 +1,69 @@
+"""حدود ذاكرة النتائج المشتركة ومفاتيحها"""
+import os
+import sys
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.memo import memoize, normalize_key
+
+
+def test_bool_and_float_keys_differ():
+    assert normalize_key(True) != normalize_key(1.0)
+    assert normalize_key([False, 0.0]) != normalize_key([0.0, 0.0])
+    # الأعداد الصحيحة والعشرية تبقى مفتاحاً واحداً
+    assert normalize_key(10) == normalize_key(10.0)
+
+
+def test_byte_budget_evicts_oldest():
+    @memoize(max_bytes=4096)
+    def padded(n):
+        return [float(n)] * 50
+
+    for n in range(100):
+        padded(n)
+    stats = padded.cache.stats()
+    assert 0 < stats['bytes'] <= 4096
+    assert stats['size'] < 100
+    # أحدث نتيجة ما زالت محفوظة
+    padded(99)
+    assert padded.cache.stats()['hits'] == 1
+
+
+def test_large_inputs_skip_the_cache():
+    calls = []
+
+    @memoize(max_input_items=100)
+    def total(values):
+        calls.append(1)
+        return sum(values)
+
+    values = list(range(1000))
+    assert total(values) == total(values) == sum(values)
+    assert len(calls) == 2
+    stats = total.cache.stats()
+    assert stats['size'] == 0 and stats['bypassed'] == 2
+
+
+def test_nested_results_are_not_shared():
+    @memoize()
+    def report(n):
+        return {'areas': {'trapezoid': float(n)}, 'points': [n]}
+
+    first = report(3)
+    first['areas']['trapezoid'] = -1.0
+    first['points'].append(4)
+    assert report(3) == {'areas': {'trapezoid': 3.0}, 'points': [3]}
+
+
+def test_records_are_copied():
+    from calc_core.gable import calculate_hypotenuse
+
+    result = calculate_hypotenuse(40.0, 2.0)
+    result.beem = 0.0
+    assert calculate_hypotenuse(40.0, 2.0).beem > 0
+
+
+def test_keys_round_below_key_decimals():
+    assert normalize_key(0.1 + 0.2) == normalize_key(0.3)
+    assert normalize_key(1.0) != normalize_key(1.0 + 1e-6)
@@ -0,0 +1,54 @@
+"""حساب المناشير دفعة واحدة مقابل الحساب المفرد"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.prism import PRISM_DTYPE, calculate_prism_batch, calculate_prism_geometry, prism_batch_totals
+
+PRISMS = [(10.0, 7.0, 12.0), (3.5, 1.2, 0.8), (40.0, 2.0, 25.0)]
+
+
+@pytest.mark.parametrize('columns', ('arrays', 'structured', 'dict'))
+def test_batch_matches_scalar(columns):
+    base, height, depth = (np.array(column) for column in zip(*PRISMS))
+    if columns == 'arrays':
+        batch = calculate_prism_batch(base, height, depth)
+    elif columns == 'structured':
+        batch = calculate_prism_batch(np.array(PRISMS, dtype=PRISM_DTYPE))
+    else:
+        batch = calculate_prism_batch({'base': base, 'height': height, 'depth': depth})
+    for i, dimensions in enumerate(PRISMS):
+        single = calculate_prism_geometry(*dimensions)
+        for name, value in single.items():
+            assert batch[name][i] == pytest.approx(value, rel=1e-12)
+
+
+def test_scalars_broadcast():
+    batch = calculate_prism_batch([2.0, 4.0], 3.0, 5.0)
+    assert batch['volume'].tolist() == [15.0, 30.0]
+
+
+@pytest.mark.parametrize('height, depth', ((3.0, None), (None, 5.0)))
+def test_height_and_depth_go_together(height, depth):
+    with pytest.raises(ValueError, match='معاً'):
+        calculate_prism_batch([2.0, 4.0], height, depth)
+
+
+def test_non_positive_rejected():
+    with pytest.raises(ValueError):
+        calculate_prism_batch([2.0, 0.0], 3.0, 5.0)
+
+
+def test_totals():
+    base, height, depth = (np.array(column) for column in zip(*PRISMS))
+    totals = prism_batch_totals(calculate_prism_batch(base, height, depth))
+    singles = [calculate_prism_geometry(*dimensions) for dimensions in PRISMS]
+    assert totals['count'] == len(PRISMS)
+    assert totals['volume'] == pytest.approx(sum(r['volume'] for r in singles))
+    assert totals['hypotenuse_face_area'] == pytest.approx(
+        sum(r['hypotenuse'] * r['depth'] for r in singles))
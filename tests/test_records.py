@@ -0,0 +1,73 @@
+"""سجلات النتائج: واجهة القاموس والتسلسل بـ pickle"""
+import os
+import pickle
+import sys
+
+import pytest
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.gable import calculate_hypotenuse, calculate_rafter
+from calc_core.prism import calculate_prism_geometry
+from calc_core.records import HypotenuseResult, KamerResult, PrismResult, ResultRecord
+
+RECORDS = [
+    calculate_hypotenuse(40.0, 2.0),
+    calculate_rafter(8.0, 150.0),
+    calculate_prism_geometry(10.0, 7.0, 12.0),
+]
+
+
+@pytest.mark.parametrize('record', RECORDS, ids=lambda r: type(r).__name__)
+def test_pickle_round_trip(record):
+    restored = pickle.loads(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+    assert type(restored) is type(record)
+    assert restored == record
+    assert hash(restored) == hash(record)
+
+
+def test_pickle_stores_values_only():
+    record = calculate_prism_geometry(10.0, 7.0, 12.0)
+    as_dict = pickle.dumps(record.as_dict(), protocol=pickle.HIGHEST_PROTOCOL)
+    assert len(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)) < len(as_dict)
+    assert b'space_diagonal' not in pickle.dumps(record)
+
+
+def test_dict_like_api():
+    record = HypotenuseResult(base=40.0, height=2.0, helf=20.0, beem=20.1, angle=5.7)
+    assert record['beem'] == record.beem == 20.1
+    assert 'helf' in record and 'depth' not in record
+    assert list(record) == list(record.keys()) == list(HypotenuseResult.__slots__)
+    assert len(record) == 5
+    assert record.get('angle') == 5.7 and record.get('depth', 0) == 0
+    assert dict(record.items()) == record.as_dict() == {
+        'base': 40.0, 'height': 2.0, 'helf': 20.0, 'beem': 20.1, 'angle': 5.7}
+    # keys و __getitem__ تكفيان لفك السجل كقاموس
+    assert {**record} == record.as_dict()
+    with pytest.raises(KeyError):
+        record['depth']
+
+
+def test_positional_and_keyword_construction():
+    positional = HypotenuseResult(40.0, 2.0, 20.0, 20.1, 5.7)
+    assert positional == HypotenuseResult(40.0, 2.0, helf=20.0, beem=20.1, angle=5.7)
+    assert positional != KamerResult(40.0, 2.0, 20.0, 20.1, 40.2, 5.7, 804.0)
+
+
+@pytest.mark.parametrize('args, kwargs', (
+    ((1.0,) * 6, {}),
+    ((), {'base': 1.0}),
+    ((1.0, 2.0, 3.0, 4.0, 5.0), {'depth': 1.0}),
+))
+def test_construction_errors(args, kwargs):
+    with pytest.raises(TypeError):
+        HypotenuseResult(*args, **kwargs)
+
+
+def test_records_have_no_instance_dict():
+    record = calculate_prism_geometry(10.0, 7.0, 12.0)
+    assert isinstance(record, (PrismResult, ResultRecord))
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(AttributeError):
+        record.colour = 'red'
@@ -0,0 +1,51 @@
+"""عمال الرسم: وحدات خالية من Streamlit واستبدال المجموعة المعطلة"""
+import os
+import sys
+import warnings
+
+import pytest
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import render_pool
+from render_pool import RenderPool, render_local
+
+TRIANGLE = {'base': 8.0, 'height': 2.0, 'helf': 4.0, 'beem': 20 ** 0.5, 'angle': 26.57, 'title': 'مثلث'}
+
+
+def loaded_pages():
+    return sorted(name for name in ('streamlit', 'tan', 'insrf', 'dimshnal') if name in sys.modules)
+
+
+def crash():
+    os._exit(1)
+
+
+@pytest.fixture
+def pool():
+    # تحذيرات الخطوط أثناء الرسم داخل العملية فقط، وتعود المرشحات بعد الاختبار
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        pool = RenderPool(workers=1, queue_size=1)
+        yield pool
+        pool.shutdown()
+
+
+def test_workers_do_not_import_pages(pool):
+    assert pool.render('triangle', TRIANGLE) == render_local('triangle', TRIANGLE)
+    assert pool._get_executor().submit(loaded_pages).result() == []
+
+
+def test_broken_pool_is_replaced_on_submit(pool):
+    with pytest.raises(render_pool.concurrent.futures.process.BrokenProcessPool):
+        pool._get_executor().submit(crash).result()
+    assert pool.render('triangle', TRIANGLE)
+    assert pool.stats()['failures'] == 1
+
+
+def test_render_png_falls_back_to_local(pool, monkeypatch):
+    monkeypatch.setattr(render_pool, 'shared_render_pool', lambda: pool)
+    monkeypatch.setattr(pool, '_submit', lambda kind, spec: pool._get_executor().submit(crash))
+    assert render_pool.render_png('triangle', TRIANGLE) == render_local('triangle', TRIANGLE)
+    assert pool.stats()['failures'] == 1
@@ -0,0 +1,96 @@
+"""كاتب SVG: الناتج XML صالح بالأبعاد والعناصر المتوقعة"""
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+
+# إضافة مجلد المشروع للوحدات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calc_core.area import land_drawing
+from calc_core.drawing import Area, Callout, Drawing, Label, Markers, Path, as_points
+from calc_core.gable import calculate_hypotenuse, triangle_drawing
+from calc_core.prism import calculate_prism_geometry, prism_drawing
+from calc_core.svg import SVG_DPI, SVG_MARGINS, to_svg
+
+NS = '{http://www.w3.org/2000/svg}'
+
+
+def parse(drawing, **options):
+    return ET.fromstring(to_svg(drawing, **options))
+
+
+def tags(root):
+    return [element.tag[len(NS):] for element in root.iter()]
+
+
+def texts(root):
+    return [element.text for element in root.iter(NS + 'text')]
+
+
+def triangle():
+    result = calculate_hypotenuse(8.0, 2.0)
+    return triangle_drawing(8.0, 2.0, result.helf, result.beem, result.angle, 'مثلث', top_angle=120.0)
+
+
+@pytest.mark.parametrize('drawing', [
+    triangle(),
+    land_drawing([0, 13, 15, 20], [10, 10, 9, 9], {'a': 1.0}),
+    prism_drawing(calculate_prism_geometry(8.0, 3.0, 10.0)),
+], ids=['triangle', 'land', 'prism'])
+def test_output_is_valid_svg(drawing):
+    root = parse(drawing)
+    assert root.tag == NS + 'svg'
+    assert float(root.get('width')) == drawing.size[0] * SVG_DPI
+    assert float(root.get('height')) == drawing.size[1] * SVG_DPI
+    assert {'defs', 'g', 'text'} <= set(tags(root))
+
+
+def test_elements():
+    drawing = Drawing((
+        Path(as_points([[0, 0], [4, 1], [6, 3]]), 'blue', marker_size=4.0, label='خط'),
+        Markers(as_points([[1, 1], [2, 2]]), 'red'),
+        Area(as_points([[0, 0], [2, 0], [2, 2]]), 'green', alpha=0.5),
+        Callout((1.0, 1.0), (3.0, 2.0), 'سهم', 'orange'),
+    ), legend='best')
+    root = parse(drawing)
+    plot = root.find(NS + 'g')
+    assert len(plot.findall(NS + 'polyline')) == 1
+    assert len(plot.findall(NS + 'polygon')) == 1
+    # ثلاث دوائر على الخط ونقطتان
+    assert len(plot.findall(NS + 'circle')) == 5
+    assert plot.find(NS + 'line').get('marker-end') == 'url(#arrow)'
+    # مفتاح الرسم للخط المسمى فقط
+    assert texts(root).count('\u202bخط\u202c') == 1
+
+
+def test_rtl_lines_are_embedded():
+    drawing = Drawing((Label((0.0, 0.0), 'مساحة\nArea 5'),), title='أرض', grid=False)
+    lines = texts(parse(drawing))
+    assert '\u202bمساحة\u202c' in lines and 'Area 5' in lines
+    assert '\u202bأرض\u202c' in lines
+
+
+def test_text_and_colors_are_escaped():
+    drawing = Drawing((
+        Label((0.0, 0.0), 'a < b & c'),
+        Path(as_points([[0, 0], [1, 1]]), '"><x'),
+    ), grid=False)
+    root = parse(drawing)
+    assert 'a < b & c' in texts(root)
+    assert root.find(NS + 'g').find(NS + 'polyline').get('stroke') == '"><x'
+
+
+def test_grid_ticks():
+    drawing = Drawing((Path(as_points([[0, 0], [10, 10]]), 'black'),), xlim=(0.0, 10.0), ylim=(0.0, 10.0))
+    lines = texts(parse(drawing))
+    assert {'0', '2', '4', '6', '8', '10'} <= set(lines)
+    assert not texts(parse(Drawing(drawing.elements, grid=False)))
+
+
+def test_projection_follows_view_angles():
+    drawing = prism_drawing(calculate_prism_geometry(8.0, 3.0, 10.0))
+    assert to_svg(drawing) != to_svg(drawing, elev=10.0, azim=30.0)
+    # المحاور بعد الإسقاط بلا تدريج
+    assert not any(text.replace('.', '').isdigit() for text in texts(parse(drawing)) if text)